@@ -0,0 +1,40 @@
+# course/management/commands/rebuild_course_statistics.py
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django_tenants.utils import schema_context
+
+from course.models import Course, CourseStatistics
+from course.services import refresh_course_statistics
+from helpers.cache import bump_model_version
+from tenant.models import Client
+
+
+class Command(BaseCommand):
+    help = "Recomputes the per-course statistics shown by the course endpoints."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "-s",
+            "--schema",
+            dest="schemas",
+            action="append",
+            help="Only rebuild this schema (repeatable). Defaults to every tenant.",
+        )
+
+    def handle(self, *args, **options):
+        schemas = options["schemas"] or list(
+            Client.objects.provisioned()
+            .order_by("schema_name")
+            .values_list("schema_name", flat=True)
+        )
+        for schema_name in schemas:
+            with schema_context(schema_name):
+                with transaction.atomic():
+                    CourseStatistics.objects.all().delete()
+                    count = refresh_course_statistics(
+                        Course.objects.values_list("pk", flat=True)
+                    )
+                # The rows were replaced without signals; drop cached course
+                # lists built from the old counts.
+                bump_model_version(CourseStatistics)
+            self.stdout.write(f"{schema_name}: {count} course(s)")
@@ -0,0 +1,72 @@
+# Generated by Django 5.2.5 on 2026-10-18 15:18
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def build_course_statistics(apps, schema_editor):
+    # Mirrors course.services.refresh_course_statistics with the historical
+    # models, so later model changes cannot break this migration.
+    Course = apps.get_model("course", "Course")
+    CourseClass = apps.get_model("course", "CourseClass")
+    CourseStatistics = apps.get_model("course", "CourseStatistics")
+    StudentStatus = apps.get_model("student", "StudentStatus")
+
+    def count_per_course(queryset, field):
+        counts = (
+            queryset.filter(course=OuterRef("pk"))
+            .order_by()
+            .values("course")
+            .annotate(total=Count(field, distinct=True))
+            .values("total")
+        )
+        return Coalesce(Subquery(counts), 0)
+
+    rows = Course.objects.values_list(
+        "pk",
+        count_per_course(CourseClass.objects.filter(is_obsolete=False), "pk"),
+        count_per_course(CourseClass.objects.all(), "term"),
+        count_per_course(
+            StudentStatus.objects.filter(status__in=["active", "enquired"]), "pk"
+        ),
+    )
+    CourseStatistics.objects.bulk_create(
+        [
+            CourseStatistics(
+                course_id=pk,
+                classes_count=classes_count,
+                terms_count=terms_count,
+                enrolled_count=enrolled_count,
+            )
+            for pk, classes_count, terms_count, enrolled_count in rows.iterator()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course', '0005_alter_course_options_alter_courseclass_options_and_more'),
+        ('student', '0012_studentimport'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CourseStatistics',
+            fields=[
+                ('course', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='statistics', serialize=False, to='course.course')),
+                ('classes_count', models.PositiveIntegerField(default=0)),
+                ('terms_count', models.PositiveIntegerField(default=0)),
+                ('enrolled_count', models.PositiveIntegerField(default=0)),
+                ('refreshed_on', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Course Statistics',
+                'verbose_name_plural': 'Course Statistics',
+            },
+        ),
+        migrations.RunPython(build_course_statistics, migrations.RunPython.noop),
+    ]
@@ -171,3 +171,27 @@ class CourseInstructor(BaseModel):
 
     def __str__(self):
         return f"{self.instructor} -> {self.course_class}"
+
+
+class CourseStatistics(models.Model):
+    """
+    Denormalized per-course counts shown by CourseSerializer. Refreshed for
+    the affected courses whenever a CourseClass or StudentStatus changes
+    (see course/signals.py); `manage.py rebuild_course_statistics` rebuilds
+    them from scratch.
+    """
+
+    course = models.OneToOneField(
+        Course, on_delete=models.CASCADE, primary_key=True, related_name="statistics"
+    )
+    classes_count = models.PositiveIntegerField(default=0)
+    terms_count = models.PositiveIntegerField(default=0)
+    enrolled_count = models.PositiveIntegerField(default=0)
+    refreshed_on = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Course Statistics"
+        verbose_name_plural = "Course Statistics"
+
+    def __str__(self):
+        return f"Statistics for {self.course_id}"
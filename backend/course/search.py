@@ -0,0 +1,9 @@
+# course/search.py
+from course.models import Course, CourseClass, Term
+from helpers.search import search_registry
+
+search_registry.register(Term, ["name"])
+search_registry.register(Course, ["code", "name", "description"])
+search_registry.register(
+    CourseClass, ["code", "course__code", "course__name", "term__name"]
+)
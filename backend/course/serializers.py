@@ -5,7 +5,7 @@ from rest_framework import serializers
 from .models import Term, Course, CourseClass, CourseInstructor
 from employee.models import Employee
 from helpers.serializers import BaseModelSerializer
-from student.models import StudentStatus
+from student.choices import EnrollmentStatus
 
 
 class InstructorSerializer(BaseModelSerializer):
@@ -60,14 +60,11 @@ class TermCreateUpdateSerializer(BaseModelSerializer):
 class CourseSerializer(BaseModelSerializer):
     """
     Handles serialization for Course model for GET requests.
-    Exposes classes_count/terms_count/enrolled_count when the instance
-    has been annotated by the view (detail endpoint). Otherwise returns None.
+    Exposes classes_count/terms_count/enrolled_count from CourseStatistics
+    when the view select_related() it, so nested uses (e.g. inside
+    CourseClassSerializer) neither show the counts nor query for them.
     """
 
-    classes_count = serializers.IntegerField(read_only=True, required=False)
-    terms_count = serializers.IntegerField(read_only=True, required=False)
-    enrolled_count = serializers.IntegerField(read_only=True, required=False)
-
     class Meta:
         model = Course
         fields = [
@@ -76,26 +73,18 @@ class CourseSerializer(BaseModelSerializer):
             "code",
             "description",
             "created_on",
-            "classes_count",
-            "terms_count",
-            "enrolled_count",
         ]
         read_only_fields = fields
 
+    statistics_fields = ["classes_count", "terms_count", "enrolled_count"]
+
     def to_representation(self, instance):
-        """
-        Remove count fields if not present (e.g. in list endpoint).
-        """
         rep = super().to_representation(instance)
-
-        # Drop counts only if they weren’t annotated on the queryset
-        if not hasattr(instance, "classes_count"):
-            rep.pop("classes_count", None)
-        if not hasattr(instance, "terms_count"):
-            rep.pop("terms_count", None)
-        if not hasattr(instance, "enrolled_count"):
-            rep.pop("enrolled_count", None)
-
+        if Course.statistics.is_cached(instance):
+            # None when the course has no statistics row yet.
+            statistics = getattr(instance, "statistics", None)
+            for field in self.statistics_fields:
+                rep[field] = getattr(statistics, field, 0)
         return rep
 
 
@@ -233,15 +222,14 @@ class CourseInstructorUnassignSerializer(serializers.Serializer):
         return value
 
 
-class EnrolledStudentSerializer(serializers.ModelSerializer):
-    student = serializers.SerializerMethodField()
-
-    class Meta:
-        model = StudentStatus
-        fields = ["idx", "student", "status", "comment"]
-        read_only_fields = fields
-
-    def get_student(self, obj):
-        from student.serializers import StudentSerializer
+class CourseClassEnrollBatchSerializer(serializers.Serializer):
+    """Validates the payload for enrolling many students in a class at once."""
 
-        return StudentSerializer(obj.student).data
+    student_idxs = serializers.ListField(
+        child=serializers.CharField(max_length=20), allow_empty=False, max_length=1000
+    )
+    status = serializers.ChoiceField(
+        choices=[EnrollmentStatus.ACTIVE, EnrollmentStatus.ENQUIRED],
+        default=EnrollmentStatus.ACTIVE,
+    )
+    comment = serializers.CharField(required=False, allow_blank=True, default="")
@@ -1,14 +1,18 @@
 # course/services.py
 import datetime
-from django.db import IntegrityError
+from django.db import IntegrityError, connection, transaction
 from django.shortcuts import get_object_or_404
-from django.db.models import Q
+from django.db.models import Count, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce, Now
 
-from course.models import Term, Course, CourseClass, CourseInstructor
+from course.models import Term, Course, CourseClass, CourseInstructor, CourseStatistics
 from employee.models import Employee
 
+from helpers.cache import bump_model_version_on_commit
 from helpers.constants import Role as ROLE
 from helpers.exceptions import VimsException
+from student.choices import EnrollmentStatus
+from student.models import StudentStatus
 
 
 def create_term(*, name: str, start_date: str, end_date: str) -> Term:
@@ -142,3 +146,73 @@ def unassign_instructor_from_class(
     assignment.exit_date = datetime.date.today()
     assignment.save()
     return assignment
+
+
+def _count_per_course(queryset, field):
+    # Correlated COUNT so the three counts never multiply each other's joins.
+    counts = (
+        queryset.filter(course=OuterRef("pk"))
+        .order_by()
+        .values("course")
+        .annotate(total=Count(field, distinct=True))
+        .values("total")
+    )
+    return Coalesce(Subquery(counts), 0)
+
+
+def refresh_course_statistics(course_ids) -> int:
+    """
+    Recomputes the CourseStatistics rows of the given courses with one
+    INSERT ... SELECT ... ON CONFLICT DO UPDATE. Returns how many courses
+    were refreshed.
+
+    The course rows are locked first (FOR NO KEY UPDATE, which does not
+    block inserting enrollments) until the transaction commits, so
+    concurrent refreshes of one course take turns and each counts what the
+    previous one committed.
+    """
+    course_ids = sorted(
+        {course_id for course_id in course_ids if course_id is not None}
+    )
+    if not course_ids:
+        return 0
+
+    enrollments = StudentStatus.objects.filter(
+        status__in=[EnrollmentStatus.ACTIVE, EnrollmentStatus.ENQUIRED]
+    )
+    rows = (
+        Course.objects.filter(pk__in=course_ids)
+        .order_by()
+        .values_list(
+            "pk",
+            _count_per_course(CourseClass.objects.filter(is_obsolete=False), "pk"),
+            _count_per_course(CourseClass.objects.all(), "term"),
+            _count_per_course(enrollments, "pk"),
+            Now(),
+        )
+    )
+    select_sql, params = rows.query.sql_with_params()
+
+    opts = CourseStatistics._meta
+    quote = connection.ops.quote_name
+    fields = ["course", "classes_count", "terms_count", "enrolled_count", "refreshed_on"]
+    columns = [quote(opts.get_field(name).column) for name in fields]
+    updates = ", ".join(f"{column} = EXCLUDED.{column}" for column in columns[1:])
+
+    with transaction.atomic():
+        list(
+            Course.objects.select_for_update(no_key=True)
+            .filter(pk__in=course_ids)
+            .order_by("pk")
+            .values_list("pk", flat=True)
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {quote(opts.db_table)} ({', '.join(columns)})"
+                f" {select_sql} ON CONFLICT ({columns[0]}) DO UPDATE SET {updates}",
+                params,
+            )
+            refreshed = cursor.rowcount
+    # The upsert sends no signals; cached course lists depend on the counts.
+    bump_model_version_on_commit(CourseStatistics)
+    return refreshed
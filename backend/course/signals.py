@@ -0,0 +1,46 @@
+# course/signals.py
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from course.models import Course, CourseClass
+from course.services import refresh_course_statistics
+from helpers.models import post_bulk_create, post_bulk_update
+from student.models import StudentStatus
+
+
+@receiver(pre_save, sender=CourseClass)
+@receiver(pre_save, sender=StudentStatus)
+def remember_previous_course(sender, instance, raw=False, **kwargs):
+    # A row moved to another course has to refresh the old course too.
+    if raw or instance.pk is None:
+        return
+    instance._previous_course_id = (
+        sender._base_manager.filter(pk=instance.pk)
+        .values_list("course_id", flat=True)
+        .first()
+    )
+
+
+@receiver(post_save, sender=CourseClass)
+@receiver(post_save, sender=StudentStatus)
+@receiver(post_delete, sender=CourseClass)
+@receiver(post_delete, sender=StudentStatus)
+def update_course_statistics(sender, instance, raw=False, origin=None, **kwargs):
+    # Nothing to refresh while the course itself is being deleted.
+    deleting_course = isinstance(origin, Course) or (
+        isinstance(origin, QuerySet) and origin.model is Course
+    )
+    if raw or deleting_course:
+        return
+    refresh_course_statistics(
+        [instance.course_id, getattr(instance, "_previous_course_id", None)]
+    )
+
+
+@receiver(post_bulk_create, sender=CourseClass)
+@receiver(post_bulk_create, sender=StudentStatus)
+@receiver(post_bulk_update, sender=CourseClass)
+@receiver(post_bulk_update, sender=StudentStatus)
+def update_course_statistics_in_bulk(sender, objs, **kwargs):
+    refresh_course_statistics(obj.course_id for obj in objs)
@@ -1,3 +1,61 @@
-from django.test import TestCase
+import datetime
 
-# Create your tests here.
+from django_tenants.test.cases import TenantTestCase
+
+from course.models import Course, CourseClass, CourseStatistics, Term
+from helpers.tests.query_budgets import QueryBudgetMixin
+from student.choices import EnrollmentStatus
+from student.models import Student, StudentStatus
+
+
+class CourseQueryBudgetTests(QueryBudgetMixin, TenantTestCase):
+    def test_queries_do_not_grow_with_rows(self):
+        self.assert_query_budgets("course")
+
+
+class CourseStatisticsTests(TenantTestCase):
+    def setUp(self):
+        self.course = Course.objects.create(name="Course 1", code="C001")
+        self.course_class = self._add_class(1)
+        self.student = Student.objects.create(
+            family_name="Doe",
+            first_name="Jane",
+            dob=datetime.date(2010, 1, 1),
+            email="jane@example.com",
+        )
+
+    def _add_class(self, n, **kwargs):
+        term = Term.objects.create(
+            name=f"Term {n}",
+            start_date=datetime.date(2000 + n, 1, 1),
+            end_date=datetime.date(2000 + n, 6, 30),
+        )
+        return CourseClass.objects.create(
+            course=self.course, term=term, code=f"C001-{n:02}", **kwargs
+        )
+
+    def statistics(self):
+        return CourseStatistics.objects.values_list(
+            "classes_count", "terms_count", "enrolled_count"
+        ).get(course=self.course)
+
+    def test_counts_follow_classes_and_enrollments(self):
+        self.assertEqual(self.statistics(), (1, 1, 0))
+
+        enrollment = StudentStatus.objects.create(
+            student=self.student,
+            course_class=self.course_class,
+            course=self.course,
+            term=self.course_class.term,
+            status=EnrollmentStatus.ACTIVE,
+        )
+        self.assertEqual(self.statistics(), (1, 1, 1))
+
+        enrollment.status = EnrollmentStatus.CLOSED
+        enrollment.save()
+        self.assertEqual(self.statistics(), (1, 1, 0))
+
+    def test_terms_of_obsolete_classes_still_count(self):
+        self._add_class(2, is_obsolete=True)
+
+        self.assertEqual(self.statistics(), (1, 2, 0))
@@ -1,16 +1,24 @@
 # course/views.py
+from collections import Counter
+
 from django.utils import timezone
-from django.db.models import Prefetch, Q, Count
-from django.shortcuts import get_object_or_404
+from django.db.models import Prefetch, Q
 
-from rest_framework import generics, viewsets, status, filters
+from rest_framework import generics, viewsets, status
 from rest_framework.decorators import action
 
-
-from course.models import Term, Course, CourseClass, CourseInstructor
+from course.models import (
+    Term,
+    Course,
+    CourseClass,
+    CourseInstructor,
+    CourseStatistics,
+)
 from employee.models import Employee
+from user.models import User
 
-from student.models import StudentStatus, EnrollmentStatus
+from student.models import Custodian, StudentStatus, EnrollmentStatus
+from student.serializers import EnrolledStudentSerializer
 
 from course.serializers import (
     TermSerializer,
@@ -23,14 +31,20 @@ from course.serializers import (
     CourseInstructorSerializer,
     CourseInstructorAssignSerializer,
     CourseInstructorUnassignSerializer,
-    EnrolledStudentSerializer,
+    CourseClassEnrollBatchSerializer,
 )
 
 from helpers.api import BaseAPIMixin
-from helpers.permissions import CoursePermission
+from helpers.exceptions import VimsException
+from helpers.exports import export_response
+from helpers.cache import cache_response
+from helpers.filters import IndexedSearchFilter
+from helpers.policy import PolicyPermission
 from helpers.constants import Role as ROLE
 from helpers.utils import soft_delete_instance
 
+from student.services import enroll_students_in_course_class
+
 from .services import (
     create_term,
     update_term,
@@ -41,12 +55,41 @@ from .services import (
 )
 
 
+# Columns EnrolledStudentSerializer reads, so the roster skips the rest.
+ROSTER_COLUMNS = [
+    "idx",
+    "status",
+    "comment",
+    "created_on",
+    "student__idx",
+    "student__family_name",
+    "student__first_name",
+    "student__dob",
+    "student__photo",
+    "student__email",
+    "student__phone",
+    "student__gender",
+]
+ROSTER_CUSTODIAN_COLUMNS = ["idx", "student_id", "name", "relation", "phone", "email"]
+ROSTER_EXPORT_COLUMNS = [
+    ("Student IDX", "student__idx"),
+    ("Family Name", "student__family_name"),
+    ("First Name", "student__first_name"),
+    ("Date of Birth", "student__dob"),
+    ("Email", "student__email"),
+    ("Phone", "student__phone"),
+    ("Gender", "student__gender"),
+    ("Status", "status"),
+    ("Comment", "comment"),
+]
+
+
 class BaseModelViewSet(BaseAPIMixin, viewsets.ModelViewSet):
     """
     A base viewset that includes our custom API responses and soft delete.
     """
 
-    permission_classes = [CoursePermission]
+    permission_classes = [PolicyPermission("course")]
 
     def destroy(self, request, *args, **kwargs):
         return self.api_error_response(
@@ -66,8 +109,11 @@ class TermViewSet(BaseModelViewSet):
     """
 
     queryset = Term.objects.filter(is_obsolete=False)
-    filter_backends = [filters.SearchFilter]
-    search_fields = ["name"]
+    filter_backends = [IndexedSearchFilter]
+
+    @cache_response(models=[Term])
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
 
     def get_serializer_class(self):
         if self.action in ["create", "update", "partial_update"]:
@@ -93,40 +139,12 @@ class CourseViewSet(BaseModelViewSet):
     Manages Courses.
     """
 
-    queryset = Course.objects.filter(is_obsolete=False)
-    filter_backends = [filters.SearchFilter]
-    search_fields = ["code", "name", "description"]
+    queryset = Course.objects.filter(is_obsolete=False).select_related("statistics")
+    filter_backends = [IndexedSearchFilter]
 
-    def retrieve(self, request, *args, **kwargs):
-        """
-        Return a single course with aggregated counts.
-        Counts are only calculated for the detail endpoint.
-        """
-        lookup_field = self.lookup_field
-        lookup_value = kwargs.get(lookup_field)
-
-        qs = self.filter_queryset(self.get_queryset())
-
-        try:
-            active_key = EnrollmentStatus.ACTIVE
-            enquired_key = EnrollmentStatus.ENQUIRED
-            enrollment_filter = Q(student_statuses__status=active_key) | Q(
-                student_statuses__status=enquired_key
-            )
-        except Exception:
-            enrollment_filter = Q(student_statuses__status__in=["active", "enquired"])
-
-        qs = qs.filter(**{lookup_field: lookup_value}).annotate(
-            classes_count=Count(
-                "classes", filter=Q(classes__is_obsolete=False), distinct=True
-            ),
-            terms_count=Count("classes__term", distinct=True),
-            enrolled_count=Count("student_statuses", filter=enrollment_filter),
-        )
-
-        instance = get_object_or_404(qs)
-        serializer = self.get_serializer(instance)
-        return self.api_success_response(serializer.data)
+    @cache_response(models=[Course, CourseClass, StudentStatus, CourseStatistics])
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
 
     def get_serializer_class(self):
         if self.action in ["create", "update", "partial_update"]:
@@ -139,8 +157,7 @@ class CourseClassViewSet(BaseModelViewSet):
     Manages Course Classes and their instructor assignments.
     """
 
-    filter_backends = [filters.SearchFilter]
-    search_fields = ["code", "course__code", "course__name", "term__name"]
+    filter_backends = [IndexedSearchFilter]
 
     def get_queryset(self):
         # treating exit_date==NULL or exit_date >= today as active
@@ -169,6 +186,8 @@ class CourseClassViewSet(BaseModelViewSet):
             return CourseInstructorAssignSerializer
         if self.action == "unassign_instructor":
             return CourseInstructorUnassignSerializer
+        if self.action == "enroll_batch":
+            return CourseClassEnrollBatchSerializer
         return CourseClassSerializer
 
     def create(self, request, *args, **kwargs):
@@ -215,19 +234,90 @@ class CourseClassViewSet(BaseModelViewSet):
         response_serializer = CourseInstructorSerializer(instance)
         return self.api_success_response(response_serializer.data)
 
+    @action(detail=True, methods=["post"], url_path="enroll-batch")
+    def enroll_batch(self, request, *args, **kwargs):
+        """
+        Enrolls a list of students in this class and reports the outcome
+        for each of them.
+        """
+        course_class = self.get_object()
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        results = enroll_students_in_course_class(
+            course_class=course_class, **serializer.validated_data
+        )
+        return self.api_success_response(
+            {
+                "results": results,
+                "summary": Counter(result["outcome"] for result in results),
+            }
+        )
+
+    def filter_by_status(self, enrollments):
+        statuses = self.request.query_params.get("status")
+        if not statuses:
+            return enrollments
+        statuses = [value.strip().lower() for value in statuses.split(",")]
+        invalid = set(statuses) - set(EnrollmentStatus.values)
+        if invalid:
+            raise VimsException(f"Unknown status: {', '.join(sorted(invalid))}.")
+        return enrollments.filter(status__in=statuses)
+
     @action(detail=True, methods=["get"], url_path="enrolled-students")
     def enrolled_students(self, request, *args, **kwargs):
+        """
+        Paginated class roster, optionally filtered with ?status=active
+        (comma-separated for several). Runs the same three queries (count,
+        page, custodians) whatever the size of the class.
+        """
         course_class = self.get_object()
-        enrollments = StudentStatus.objects.filter(
-            course_class=course_class
-        ).select_related("student")
-        serializer = EnrolledStudentSerializer(enrollments, many=True)
-        return self.api_success_response(serializer.data, status=status.HTTP_200_OK)
+        enrollments = (
+            StudentStatus.objects.filter(course_class=course_class)
+            .select_related("student")
+            .only(*ROSTER_COLUMNS)
+            .prefetch_related(
+                Prefetch(
+                    "student__custodians",
+                    queryset=Custodian.objects.only(
+                        *ROSTER_CUSTODIAN_COLUMNS
+                    ).order_by("name"),
+                )
+            )
+        )
+        enrollments = self.filter_by_status(enrollments)
+
+        page = self.paginate_queryset(enrollments)
+        serializer = EnrolledStudentSerializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    @action(
+        detail=True,
+        methods=["get"],
+        url_path="enrolled-students/export",
+        permission_classes=[PolicyPermission("course", "export")],
+    )
+    def export_roster(self, request, *args, **kwargs):
+        """
+        Streams the class roster (honouring ?status=) as ?file_format=csv|xlsx.
+        """
+        course_class = self.get_object()
+        enrollments = self.filter_by_status(
+            StudentStatus.objects.filter(course_class=course_class).order_by(
+                "student__family_name", "student__first_name"
+            )
+        )
+        return export_response(
+            request, enrollments, ROSTER_EXPORT_COLUMNS, f"roster-{course_class.code}"
+        )
 
 
 class InstructorListAPIView(BaseAPIMixin, generics.ListAPIView):
-    permission_classes = [CoursePermission]
+    permission_classes = [PolicyPermission("course")]
     serializer_class = InstructorSerializer
     queryset = Employee.objects.select_related("user").filter(
         is_obsolete=False, user__role=ROLE.INSTRUCTOR.value, user__is_active=True
     )
+
+    @cache_response(models=[Employee, User])
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
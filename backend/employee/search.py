@@ -0,0 +1,5 @@
+# employee/search.py
+from employee.models import Employee
+from helpers.search import search_registry
+
+search_registry.register(Employee, ["code", "first_name", "family_name", "user__email"])
@@ -11,13 +11,14 @@ from django.contrib.auth.tokens import PasswordResetTokenGenerator
 from employee.models import Employee, EmployeeFamily, CareerStep
 from user.models import User
 from user.serializers import UserSerializer
-from user.mailers import send_employee_invite
+from jobs.services import enqueue
 
 from helpers.constants import (
     TENANT_SCHEMA_ROLES_VALUES,
     Role as ROLE,
 )
 from helpers.models import Gender
+from helpers.policy import bit, has
 
 from user.tokens import invite_token_generator
 
@@ -171,8 +172,11 @@ class EmployeeSerializer(serializers.ModelSerializer):
                     f"{scheme}://{full_host}/activate?uid={uidb64}&token={token}"
                 )
 
-                # Fire the email (console backend locally) for now
-                send_employee_invite(user, employee, activation_url)
+                # Sent by the job worker once this transaction commits
+                enqueue(
+                    "user.send_employee_invite",
+                    {"employee_idx": employee.idx, "activation_url": activation_url},
+                )
 
                 return employee
 
@@ -194,7 +198,7 @@ class EmployeeSerializer(serializers.ModelSerializer):
         user = getattr(request, "user", None)
 
         allowed = {"first_name", "family_name", "photo"}
-        if user and (user.is_director() or user.is_tenant_admin()):
+        if user and has(user, bit("employee", "edit")):
             allowed |= {"code"}
 
         disallowed = set(validated_data.keys()) - allowed
@@ -1,3 +1,8 @@
-from django.test import TestCase
+from django_tenants.test.cases import TenantTestCase
 
-# Create your tests here.
+from helpers.tests.query_budgets import QueryBudgetMixin
+
+
+class EmployeeQueryBudgetTests(QueryBudgetMixin, TenantTestCase):
+    def test_queries_do_not_grow_with_rows(self):
+        self.assert_query_budgets("employee")
@@ -1,12 +1,13 @@
 # vims_project/backend/employee/views.py
-from rest_framework import viewsets, permissions, filters
+from rest_framework import viewsets
 from rest_framework.exceptions import PermissionDenied
+from rest_framework.response import Response
 from django.shortcuts import get_object_or_404
 
 # from django_filters.rest_framework import DjangoFilterBackend
 # from rest_framework import filters
-from helpers.permissions import HasAnyRole
-from helpers.constants import Role as ROLE
+from helpers.filters import IndexedSearchFilter
+from helpers.policy import PolicyPermission, bit, has
 from employee.models import Employee, EmployeeFamily, CareerStep
 from employee.serializers import (
     EmployeeSerializer,
@@ -14,44 +15,46 @@ from employee.serializers import (
     EmployeeCareerStepSerializer,
 )
 
+# Checked per request, so looked up once here
+EMPLOYEE_VIEW_ALL = bit("employee", "view_all")
+EMPLOYEE_EDIT = bit("employee", "edit")
+
 
 class EmployeeViewSet(viewsets.ModelViewSet):
-    queryset = Employee.objects.select_related("user").all()
+    # EmployeeSerializer nests user, family and career
+    queryset = Employee.objects.select_related("user").prefetch_related(
+        "family", "career"
+    )
     serializer_class = EmployeeSerializer
     # filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     # filterset_fields = ["code", "first_name", "family_name", "user__role"]
     # ordering_fields = ["code", "first_name", "family_name", "created_at"]
-    filter_backends = [filters.SearchFilter]
-    search_fields = ["code", "first_name", "family_name", "user__email"]
+    filter_backends = [IndexedSearchFilter]
     lookup_field = "idx"
+    permission_classes = [PolicyPermission("employee")]
 
     def get_queryset(self):
         user = self.request.user
-        if user.is_director() or user.is_tenant_admin():
+        if has(user, EMPLOYEE_VIEW_ALL):
             return self.queryset
         # Employees see only themselves
-        return self.queryset.filter(user=user)
+        return self.queryset.filter(user__idx=user.idx)
 
-    def get_permissions(self):
-        # Global IsAuthenticated is already set in settings; here we add *extra* when needed
-        if self.action in ["create", "update", "partial_update"]:
-            allowed_roles = [ROLE.DIRECTOR.value, ROLE.TENANT_ADMIN.value]
-            return [permissions.IsAuthenticated(), HasAnyRole(roles=allowed_roles)]
-        if self.action in ["destroy"]:
-            raise PermissionDenied("Deleting employees is not allowed.")
-        return [permissions.IsAuthenticated()]
+    def destroy(self, request, *args, **kwargs):
+        raise PermissionDenied("Deleting employees is not allowed.")
 
     def retrieve(self, request, *args, **kwargs):
         obj = self.get_object()
         user = request.user
-        if (user.is_director() or user.is_tenant_admin()) or (obj.user_id == user.id):
-            return super().retrieve(request, *args, **kwargs)
+        if has(user, EMPLOYEE_VIEW_ALL) or obj.user.idx == user.idx:
+            return Response(self.get_serializer(obj).data)
         raise PermissionDenied("You can only view your own profile.")
 
 
 class EmployeeFamilyViewSet(viewsets.ModelViewSet):
     serializer_class = EmployeeFamilySerializer
     lookup_field = "idx"
+    permission_classes = [PolicyPermission("employee", "view")]
 
     def get_queryset(self):
         # nested route: /employees/{employee_idx}/family/
@@ -59,13 +62,15 @@ class EmployeeFamilyViewSet(viewsets.ModelViewSet):
         return EmployeeFamily.objects.filter(employee__idx=employee_idx)
 
     def _get_employee(self):
-        return get_object_or_404(Employee, idx=self.kwargs["employee_idx"])
+        return get_object_or_404(
+            Employee.objects.select_related("user"), idx=self.kwargs["employee_idx"]
+        )
 
     def _assert_can_mutate(self, employee):
         user = self.request.user
-        if user.is_director() or user.is_tenant_admin():
+        if has(user, EMPLOYEE_EDIT):
             return
-        if employee.user_id != user.id:
+        if employee.user.idx != user.idx:
             raise PermissionDenied("You can only manage your own family records.")
 
     def perform_create(self, serializer):
@@ -87,6 +92,7 @@ class EmployeeFamilyViewSet(viewsets.ModelViewSet):
 class EmployeeCareerStepViewSet(viewsets.ModelViewSet):
     serializer_class = EmployeeCareerStepSerializer
     lookup_field = "idx"
+    permission_classes = [PolicyPermission("employee", "view")]
 
     def get_queryset(self):
         employee_idx = self.kwargs["employee_idx"]
@@ -99,13 +105,15 @@ class EmployeeCareerStepViewSet(viewsets.ModelViewSet):
         return context
 
     def _get_employee(self):
-        return get_object_or_404(Employee, idx=self.kwargs["employee_idx"])
+        return get_object_or_404(
+            Employee.objects.select_related("user"), idx=self.kwargs["employee_idx"]
+        )
 
     def _assert_can_mutate(self, employee):
         u = self.request.user
-        if u.is_director() or u.is_tenant_admin():
+        if has(u, EMPLOYEE_EDIT):
             return
-        if employee.user_id != u.id:
+        if employee.user.idx != u.idx:
             raise PermissionDenied("You can only manage your own career records.")
 
     def perform_create(self, serializer):
@@ -0,0 +1,15 @@
+# enrollment/search.py
+from helpers.search import search_registry
+from student.models import StudentStatus
+
+# EnrollmentViewSet lists StudentStatus rows.
+search_registry.register(
+    StudentStatus,
+    [
+        "student__first_name",
+        "student__family_name",
+        "course_class__code",
+        "course_class__course__name",
+        "status",
+    ],
+)
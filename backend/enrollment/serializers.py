@@ -2,28 +2,27 @@
 from rest_framework import serializers
 from student.models import StudentStatus, Student
 from course.models import CourseClass
-from helpers.serializers import BaseModelSerializer
+from course.serializers import CourseClassSerializer
+from helpers.serializers import BaseModelSerializer, ExpandableFieldsMixin
+from student.serializers import StudentListSerializer
 
 
-class EnrollmentSerializer(BaseModelSerializer):
-    student = serializers.SerializerMethodField()
-    course_class = serializers.SerializerMethodField()
+class EnrollmentSerializer(ExpandableFieldsMixin, BaseModelSerializer):
+    """
+    Enrollment with its student and course class nested. Pair it with
+    EnrollmentViewSet.get_queryset(), which loads both (and the class's
+    active instructors) up front; ?expand= limits what gets nested.
+    """
+
+    student = StudentListSerializer(read_only=True)
+    course_class = CourseClassSerializer(read_only=True)
     status = serializers.CharField(source="get_status_display")
 
     class Meta:
         model = StudentStatus
         fields = ["idx", "student", "course_class", "status", "comment", "created_on"]
         read_only_fields = fields
-
-    def get_student(self, obj):
-        from student.serializers import StudentListSerializer
-
-        return StudentListSerializer(obj.student, context=self.context).data
-
-    def get_course_class(self, obj):
-        from course.serializers import CourseClassSerializer
-
-        return CourseClassSerializer(obj.course_class, context=self.context).data
+        expandable_fields = ["student", "course_class"]
 
 
 class EnrollmentCreateSerializer(serializers.Serializer):
@@ -1,6 +1,10 @@
 # enrollment/views.py
+from django.db.models import Prefetch, Q
+from django.utils import timezone
 from rest_framework.viewsets import ModelViewSet
-from rest_framework import status, filters
+from rest_framework import status
+from rest_framework.decorators import action
+from course.models import CourseInstructor
 from student.models import StudentStatus
 from .serializers import (
     EnrollmentSerializer,
@@ -9,21 +13,55 @@ from .serializers import (
 )
 from .services import create_enrollment, update_enrollment, close_enrollment
 from helpers.api import BaseAPIMixin
+from helpers.exports import export_response
+from helpers.filters import IndexedSearchFilter
+from helpers.policy import PolicyPermission
+
+ENROLLMENT_EXPORT_COLUMNS = [
+    ("IDX", "idx"),
+    ("Student IDX", "student__idx"),
+    ("Family Name", "student__family_name"),
+    ("First Name", "student__first_name"),
+    ("Course Code", "course__code"),
+    ("Course", "course__name"),
+    ("Class", "course_class__code"),
+    ("Term", "term__name"),
+    ("Status", "status"),
+    ("Comment", "comment"),
+    ("Created On", "created_on"),
+]
 
 
 class EnrollmentViewSet(BaseAPIMixin, ModelViewSet):
-    queryset = StudentStatus.objects.select_related(
-        "student", "course_class__course", "course_class__term"
-    ).all()
+    permission_classes = [PolicyPermission("enrollment")]
+    queryset = StudentStatus.objects.all()
     lookup_field = "idx"
-    filter_backends = [filters.SearchFilter]
-    search_fields = [
-        "student__first_name",
-        "student__family_name",
-        "course_class__code",
-        "course_class__course__name",
-        "status",
-    ]
+    filter_backends = [IndexedSearchFilter]
+
+    def get_queryset(self):
+        """
+        Loads exactly what EnrollmentSerializer nests for this request, so a
+        page of enrollments costs the same few queries whatever its size.
+        """
+        queryset = super().get_queryset()
+        expanded = EnrollmentSerializer.expanded_fields(self.request)
+        # A collapsed student or course_class still renders its idx.
+        related = ["student"]
+        if "course_class" in expanded:
+            today = timezone.now().date()
+            related += ["course_class__course", "course_class__term"]
+            queryset = queryset.prefetch_related(
+                Prefetch(
+                    "course_class__assignments",
+                    queryset=CourseInstructor.objects.filter(
+                        Q(exit_date__isnull=True) | Q(exit_date__gt=today)
+                    ).select_related("instructor__user"),
+                    to_attr="active_assignments",
+                )
+            )
+        else:
+            related.append("course_class")
+        return queryset.select_related(*related)
 
     def get_serializer_class(self):
         if self.action == "create":
@@ -36,7 +74,9 @@ class EnrollmentViewSet(BaseAPIMixin, ModelViewSet):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         enrollment = create_enrollment(**serializer.validated_data)
-        response = EnrollmentSerializer(enrollment).data
+        response = EnrollmentSerializer(
+            enrollment, context=self.get_serializer_context()
+        ).data
         return self.api_success_response(response, status=status.HTTP_201_CREATED)
 
     def partial_update(self, request, *args, **kwargs):
@@ -44,7 +84,25 @@ class EnrollmentViewSet(BaseAPIMixin, ModelViewSet):
         serializer = self.get_serializer(enrollment, data=request.data, partial=True)
         serializer.is_valid(raise_exception=True)
         enrollment = update_enrollment(enrollment, **serializer.validated_data)
-        return self.api_success_response(EnrollmentSerializer(enrollment).data)
+        response = EnrollmentSerializer(
+            enrollment, context=self.get_serializer_context()
+        ).data
+        return self.api_success_response(response)
+
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path="export",
+        permission_classes=[PolicyPermission("enrollment", "export")],
+    )
+    def export(self, request, *args, **kwargs):
+        """
+        Streams every enrollment (honouring ?search=) as ?file_format=csv|xlsx.
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        return export_response(
+            request, queryset, ENROLLMENT_EXPORT_COLUMNS, "enrollments"
+        )
 
     def destroy(self, request, *args, **kwargs):
         return self.api_error_response(
@@ -14,7 +14,7 @@ fi
 # Apply database migrations
 echo "Applying database migrations..."
 python manage.py migrate --shared --noinput
-python manage.py migrate --tenant --noinput
+python manage.py migrate_tenants --noinput
 
 # Start the Django development server
 echo "Starting Django server..."
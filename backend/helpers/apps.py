@@ -1,6 +1,15 @@
 from django.apps import AppConfig
+from django.utils.module_loading import autodiscover_modules
 
 
 class HelpersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'helpers'
+
+    def ready(self):
+        from helpers.signals import connect_signals
+
+        # Register every app's searchable models (<app>/search.py), then
+        # hook cache invalidation and search indexing up to them.
+        autodiscover_modules("search")
+        connect_signals()
@@ -0,0 +1,139 @@
+# helpers/cache.py
+"""
+Tenant-namespaced caching helpers.
+
+Every key goes through django_tenants.cache.make_key (the CACHES
+KEY_FUNCTION), so entries are always prefixed with connection.schema_name and
+one tenant can never read another tenant's data. On top of that each model
+has a version number in the cache: saving or deleting any row bumps it once
+the transaction commits (see helpers/signals.py), which orphans every entry
+that was built from that model.
+"""
+import functools
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django_tenants.utils import schema_context
+from rest_framework.response import Response
+
+
+# Backends whose entries live in one process only.
+LOCAL_CACHE_BACKENDS = {
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+}
+
+
+def cache_is_shared(alias="default"):
+    """
+    Whether every worker process sees the same cache entries, i.e. the
+    backend is not per-process (see REDIS_URL).
+    """
+    return settings.CACHES[alias]["BACKEND"] not in LOCAL_CACHE_BACKENDS
+
+
+def _version_key(model):
+    return f"model-version:{model._meta.label_lower}"
+
+
+def get_model_versions(models):
+    """
+    Returns the current cache version of each model, starting unseen
+    models at 1.
+    """
+    keys = [_version_key(model) for model in models]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, 1, timeout=None)
+            versions[key] = cache.get(key, 1)
+    return tuple(versions[key] for key in keys)
+
+
+def bump_model_version(model):
+    """
+    Invalidates every cached entry that depends on `model` in the current
+    tenant.
+    """
+    key = _version_key(model)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 1, timeout=None)
+        cache.incr(key)
+
+
+def bump_model_version_on_commit(model):
+    """
+    bump_model_version() once the current transaction commits (right away
+    outside one). Bumping inside the transaction would let a concurrent
+    request cache the old rows again under the new version.
+    """
+    schema_name = connection.schema_name
+
+    def bump():
+        # Keys are namespaced by the schema the connection is set to, which
+        # may have changed by the time the transaction commits.
+        if connection.schema_name == schema_name:
+            bump_model_version(model)
+        else:
+            with schema_context(schema_name):
+                bump_model_version(model)
+
+    transaction.on_commit(bump)
+
+
+def make_cache_key(prefix, models, *parts):
+    versions = get_model_versions(models)
+    labels = ",".join(
+        f"{model._meta.label_lower}={version}"
+        for model, version in zip(models, versions)
+    )
+    digest = hashlib.md5("|".join(str(p) for p in parts).encode()).hexdigest()
+    return f"{prefix}:{labels}:{digest}"
+
+
+def cached_queryset(key, queryset, models=None, timeout=None):
+    """
+    Evaluates `queryset` once and serves the resulting list from the cache
+    until `timeout` expires or any of `models` (default: the queryset's
+    model) changes.
+    """
+    models = list(models or [queryset.model])
+    cache_key = make_cache_key("qs", models, key, str(queryset.query))
+    return cache.get_or_set(cache_key, lambda: list(queryset), timeout)
+
+
+def cache_response(models, timeout=None, per_user=False):
+    """
+    Caches the data of successful GET responses of a view method, keyed by
+    the full request path (query string included) and invalidated when any
+    of `models` changes. Use per_user=True when the response is scoped to
+    request.user.
+    """
+
+    def decorator(view_method):
+        @functools.wraps(view_method)
+        def wrapper(self, request, *args, **kwargs):
+            if request.method != "GET":
+                return view_method(self, request, *args, **kwargs)
+
+            parts = [request.get_full_path()]
+            if per_user:
+                parts.append(getattr(request.user, "idx", ""))
+            cache_key = make_cache_key("view", models, *parts)
+
+            cached = cache.get(cache_key)
+            if cached is not None:
+                return Response(cached)
+
+            response = view_method(self, request, *args, **kwargs)
+            if response.status_code == 200:
+                cache.set(cache_key, response.data, timeout)
+            return response
+
+        return wrapper
+
+    return decorator
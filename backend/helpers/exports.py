@@ -0,0 +1,111 @@
+# helpers/exports.py
+"""
+Whole-table CSV/XLSX exports.
+
+Rows are read with values_list().iterator(), which uses a server-side cursor
+on Postgres, so no model instances or serializers are built and memory stays
+flat however large the table is. CSV is streamed to the client as it is
+read. XLSX cannot be written incrementally to a socket, so it is built with
+openpyxl's write-only workbook in a temporary file and then streamed from
+there.
+"""
+import csv
+import datetime
+import tempfile
+
+from django.http import FileResponse, StreamingHttpResponse
+from django.utils import timezone
+
+from helpers.exceptions import VimsException
+
+FETCH_SIZE = 2000
+FORMATS = ("csv", "xlsx")
+XLSX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+# Leading characters that make spreadsheet apps read a cell as a formula.
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+class Echo:
+    """A file-like object whose write() just returns the value, for csv.writer."""
+
+    def write(self, value):
+        return value
+
+
+def _text_cell(value):
+    """Quotes user-entered text that would otherwise run as a formula."""
+    if value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def _csv_cell(value):
+    if value is None:
+        return ""
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    if isinstance(value, str):
+        return _text_cell(value)
+    return value
+
+
+def _xlsx_cell(value):
+    # Excel has no time zones; write datetimes in the local time zone.
+    if isinstance(value, datetime.datetime) and timezone.is_aware(value):
+        return timezone.make_naive(value)
+    if isinstance(value, str):
+        return _text_cell(value)
+    return value
+
+
+def csv_response(headers, rows, filename):
+    writer = csv.writer(Echo())
+
+    def stream():
+        yield writer.writerow(headers)
+        for row in rows:
+            yield writer.writerow([_csv_cell(value) for value in row])
+
+    response = StreamingHttpResponse(stream(), content_type="text/csv")
+    response["Content-Disposition"] = f'attachment; filename="{filename}.csv"'
+    return response
+
+
+def xlsx_response(headers, rows, filename):
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(title=filename[:31])
+    sheet.append(headers)
+    for row in rows:
+        sheet.append([_xlsx_cell(value) for value in row])
+
+    output = tempfile.TemporaryFile()
+    workbook.save(output)
+    output.seek(0)
+    return FileResponse(
+        output,
+        as_attachment=True,
+        filename=f"{filename}.xlsx",
+        content_type=XLSX_CONTENT_TYPE,
+    )
+
+
+def export_response(request, queryset, columns, filename):
+    """
+    Exports `queryset` as ?file_format=csv (default) or xlsx. `columns` is a
+    list of (header, lookup path) pairs, e.g. ("Course", "course__name").
+    """
+    file_format = request.query_params.get("file_format", "csv")
+    if file_format not in FORMATS:
+        raise VimsException("file_format must be 'csv' or 'xlsx'.")
+
+    headers = [header for header, _ in columns]
+    rows = (
+        queryset.prefetch_related(None)
+        .values_list(*[path for _, path in columns])
+        .iterator(chunk_size=FETCH_SIZE)
+    )
+    if file_format == "xlsx":
+        return xlsx_response(headers, rows, filename)
+    return csv_response(headers, rows, filename)
@@ -20,25 +20,32 @@ class IDXField(models.CharField):
         _uuid = ShortUUID(alphabet=self.alphabet).random(length=self.length)
         return f"{_prefix}{_year}{_uuid}".upper()
 
+    def build_prefix(self, model):
+        """
+        Returns the "<tenant>-<model>" prefix for idx values of `model`
+        in the schema the connection is currently set to.
+        """
+        model_prefix = IDXPrefix.get(model._meta.db_table)
+
+        tenant_prefix = "0"
+        if connection.schema_name != "public":
+            from tenant.models import Client
+            from tenant.resolver import tenant_resolver
+
+            # Resolved from connection.tenant or a per-schema cache, so
+            # inserts do not query the public Client table every time.
+            try:
+                tenant_prefix = str(tenant_resolver.tenant_id_for(connection))
+            except Client.DoesNotExist:
+                raise ValueError(
+                    f"Client with schema '{connection.schema_name}' does not exist."
+                )
+        return f"{tenant_prefix}-{model_prefix}"
+
     def pre_save(self, instance, add):
         value = super().pre_save(instance, add)
         if not value:
-            _table_name = instance._meta.db_table
-            model_prefix = IDXPrefix.get(_table_name)
-
-            tenant_prefix = "0"
-            if connection.schema_name != "public":
-                from tenant.models import Client
-
-                try:
-                    client = Client.objects.get(schema_name=connection.schema_name)
-                    tenant_prefix = str(client.id)
-                except Client.DoesNotExist:
-                    raise ValueError(
-                        f"Client with schema '{connection.schema_name}' does not exist."
-                    )
-            full_prefix = f"{tenant_prefix}-{model_prefix}"
-            value = self._generate_uuid(full_prefix)
+            value = self._generate_uuid(self.build_prefix(type(instance)))
         setattr(instance, self.attname, value)
         return value
 
@@ -0,0 +1,26 @@
+# helpers/filters.py
+from rest_framework import filters
+
+from helpers.models import SearchDocument
+from helpers.search import normalize, search_registry
+
+
+class IndexedSearchFilter(filters.SearchFilter):
+    """
+    Matches ?search= terms against the model's SearchDocument rows, so a
+    search over related fields is one trigram index lookup rather than
+    ILIKE scans across joined tables. Models that are not registered with
+    search_registry fall back to DRF's SearchFilter and view.search_fields.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        if not terms or not search_registry.is_registered(queryset.model):
+            return super().filter_queryset(request, queryset, view)
+
+        documents = SearchDocument.objects.filter(
+            model_label=queryset.model._meta.label_lower
+        )
+        for term in terms:
+            documents = documents.filter(document__contains=normalize(term))
+        return queryset.filter(pk__in=documents.values("object_id"))
@@ -5,6 +5,7 @@ from enum import Enum, unique
 class IDXPrefix(Enum):
     tenant_client = "CL"
     tenant_domain = "DO"
+    tenant_tenantuseremail = "UE"
 
     user_user = "US"
 
@@ -22,6 +23,9 @@ class IDXPrefix(Enum):
     student_student = "ST"
     student_studentstatus = "SS"
     student_custodian = "SC"
+    student_studentimport = "SI"
+
+    jobs_job = "JB"
 
 
     @classmethod
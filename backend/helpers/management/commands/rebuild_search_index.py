@@ -0,0 +1,32 @@
+# helpers/management/commands/rebuild_search_index.py
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django_tenants.utils import schema_context
+
+from helpers.search import rebuild_documents, search_registry
+from tenant.models import Client
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the search documents behind IndexedSearchFilter in tenant schemas."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "-s",
+            "--schema",
+            dest="schemas",
+            action="append",
+            help="Only rebuild this schema (repeatable). Defaults to every tenant.",
+        )
+
+    def handle(self, *args, **options):
+        schemas = options["schemas"] or list(
+            Client.objects.provisioned()
+            .order_by("schema_name")
+            .values_list("schema_name", flat=True)
+        )
+        for schema_name in schemas:
+            with schema_context(schema_name), transaction.atomic():
+                for label in search_registry.labels():
+                    rebuild_documents(label)
+            self.stdout.write(f"{schema_name}: rebuilt {len(search_registry.labels())} model(s)")
@@ -0,0 +1,179 @@
+# helpers/metrics.py
+"""
+In-process request metrics.
+
+RequestMetricsMiddleware observes every request into the histograms of
+`request_metrics`, labelled with the tenant schema and the resolved view
+name, and tenant/views.metrics serves them in the Prometheus text format.
+Each worker process keeps its own numbers; Prometheus aggregates them
+across the instances it scrapes.
+"""
+import threading
+import time
+
+BUCKETS = {
+    "seconds": (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+    "queries": (1, 2, 5, 10, 20, 50, 100, 200),
+    "bytes": (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304),
+}
+
+# name: (help, bucket unit)
+REQUEST_HISTOGRAMS = {
+    "vims_request_duration_seconds": ("Wall time spent handling a request.", "seconds"),
+    "vims_request_db_duration_seconds": (
+        "Time a request spent waiting on database queries.",
+        "seconds",
+    ),
+    "vims_request_queries": ("Database queries run by a request.", "queries"),
+    "vims_response_size_bytes": ("Size of the response body.", "bytes"),
+}
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_labels(labels):
+    if not labels:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in labels)
+    return "{" + pairs + "}"
+
+
+class Histogram:
+    """Bucket counts, sum and count of the values observed for one label set."""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0
+        self.count = 0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.sum += value
+        self.count += 1
+
+    def render(self, name, labels):
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            bucket_labels = labels + (("le", bound),)
+            lines.append(f"{name}_bucket{format_labels(bucket_labels)} {cumulative}")
+        lines.append(f'{name}_bucket{format_labels(labels + (("le", "+Inf"),))} {self.count}')
+        lines.append(f"{name}_sum{format_labels(labels)} {self.sum}")
+        lines.append(f"{name}_count{format_labels(labels)} {self.count}")
+        return lines
+
+
+class RequestMetrics:
+    """The REQUEST_HISTOGRAMS of this process, per (schema, view)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = {}
+
+    def observe(self, schema, view, duration, db_duration, queries, size=None):
+        values = {
+            "vims_request_duration_seconds": duration,
+            "vims_request_db_duration_seconds": db_duration,
+            "vims_request_queries": queries,
+            "vims_response_size_bytes": size,
+        }
+        labels = (("schema", schema), ("view", view))
+        with self._lock:
+            for name, value in values.items():
+                if value is None:
+                    continue
+                histogram = self._histograms.get((name, labels))
+                if histogram is None:
+                    unit = REQUEST_HISTOGRAMS[name][1]
+                    histogram = self._histograms[(name, labels)] = Histogram(
+                        BUCKETS[unit]
+                    )
+                histogram.observe(value)
+
+    def render(self):
+        lines = []
+        with self._lock:
+            for name, (help_text, _) in REQUEST_HISTOGRAMS.items():
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} histogram")
+                for (metric, labels), histogram in sorted(self._histograms.items()):
+                    if metric == name:
+                        lines.extend(histogram.render(name, labels))
+        return lines
+
+    def clear(self):
+        with self._lock:
+            self._histograms.clear()
+
+
+request_metrics = RequestMetrics()
+
+
+class Counter:
+    """A counter per label set, e.g. throttled requests per (schema, scope)."""
+
+    def __init__(self, name, help_text, label_names):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def inc(self, *label_values):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for label_values, value in sorted(self._values.items()):
+                labels = tuple(zip(self.label_names, label_values))
+                lines.append(f"{self.name}{format_labels(labels)} {value}")
+        return lines
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+
+throttled_requests = Counter(
+    "vims_throttled_requests_total",
+    "Requests rejected by a throttle before reaching the view.",
+    ("schema", "scope", "bucket"),
+)
+
+
+class QueryTimer:
+    """A connection.execute_wrapper() that counts and times queries."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+
+
+def response_size(response):
+    """Body size in bytes, or None for a stream of unknown length."""
+    if response.streaming:
+        length = response.get("Content-Length")
+        return int(length) if length else None
+    return len(response.content)
+
+
+def render_metric(name, help_text, metric_type, value):
+    """Lines for a single unlabelled counter or gauge."""
+    return [f"# HELP {name} {help_text}", f"# TYPE {name} {metric_type}", f"{name} {value}"]
@@ -0,0 +1,70 @@
+# helpers/middleware.py
+import logging
+import time
+
+from django.conf import settings
+from django.db import connection
+from django_tenants.middleware.main import TenantMainMiddleware
+
+from helpers.metrics import QueryTimer, request_metrics, response_size
+from tenant.resolver import tenant_resolver
+
+logger = logging.getLogger(__name__)
+
+
+class CachedTenantMainMiddleware(TenantMainMiddleware):
+    """
+    Drop-in replacement for TenantMainMiddleware that resolves the tenant
+    through the in-process TenantResolver cache instead of querying the
+    Domain/Client tables on every request.
+    """
+
+    def get_tenant(self, domain_model, hostname):
+        return tenant_resolver.resolve(domain_model, hostname)
+
+
+class RequestMetricsMiddleware:
+    """
+    Records wall time, database time, query count and response size of
+    every request into helpers.metrics.request_metrics, labelled with the
+    tenant schema and view name, and logs requests slower than
+    SLOW_REQUEST_THRESHOLD_MS. Goes right after the tenant middleware so
+    the schema is set. Queries a streaming response runs while it is sent
+    are not counted.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timer = QueryTimer()
+        start = time.perf_counter()
+        with connection.execute_wrapper(timer):
+            response = self.get_response(request)
+        duration = time.perf_counter() - start
+
+        match = getattr(request, "resolver_match", None)
+        view = match.view_name if match else "<unresolved>"
+        schema = connection.schema_name
+        request_metrics.observe(
+            schema,
+            view,
+            duration=duration,
+            db_duration=timer.duration,
+            queries=timer.count,
+            size=response_size(response),
+        )
+
+        threshold = settings.SLOW_REQUEST_THRESHOLD_MS
+        if threshold and duration * 1000 >= threshold:
+            logger.warning(
+                "Slow request: %s %s (%s, %s) took %.0f ms, %s queries in %.0f ms",
+                request.method,
+                request.path,
+                schema,
+                view,
+                duration * 1000,
+                timer.count,
+                timer.duration * 1000,
+            )
+        return response
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.5 on 2026-10-18 15:12
+
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+def build_search_documents(apps, schema_editor):
+    from helpers.search import rebuild_documents, search_registry
+
+    for label in search_registry.labels():
+        rebuild_documents(label, apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('helpers', '0003_delete_term'),
+        ('course', '0005_alter_course_options_alter_courseclass_options_and_more'),
+        ('employee', '0004_alter_employee_photo'),
+        ('student', '0011_student_search_indexes'),
+        ('user', '0002_alter_user_role'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            "CREATE EXTENSION IF NOT EXISTS pg_trgm WITH SCHEMA public;",
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model_label', models.CharField(max_length=100)),
+                ('object_id', models.BigIntegerField()),
+                ('document', models.TextField(blank=True)),
+            ],
+            options={
+                'indexes': [django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass('document', name='gin_trgm_ops'), name='search_document_trgm')],
+                'constraints': [models.UniqueConstraint(fields=('model_label', 'object_id'), name='unique_search_document')],
+            },
+        ),
+        migrations.RunPython(build_search_documents, migrations.RunPython.noop),
+    ]
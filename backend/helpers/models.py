@@ -1,6 +1,92 @@
-from django.db import models
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.db import models, transaction
+from django.dispatch import Signal
+from django.utils import timezone
 from helpers.fields import IDXField
 
+# Sent by bulk_create_with_idx() with sender=<model> and objs=<created objects>,
+# and by bulk_update() with objs and fields=<updated field names>, since
+# Django's bulk methods do not send post_save.
+post_bulk_create = Signal()
+post_bulk_update = Signal()
+
+
+class BaseModelQuerySet(models.QuerySet):
+    def bulk_create_with_idx(self, objs, batch_size=1000, **kwargs):
+        """
+        bulk_create() for BaseModel subclasses.
+
+        idx values are allocated up front, one collision-check query per
+        batch, so a duplicate idx can never abort a large insert halfway.
+        Rows are inserted in chunks of `batch_size` inside one transaction.
+        """
+        objs = list(objs)
+        if not objs:
+            return objs
+
+        field = self.model._meta.get_field("idx")
+        prefix = field.build_prefix(self.model)
+
+        created = []
+        with transaction.atomic(using=self.db, savepoint=False):
+            for start in range(0, len(objs), batch_size):
+                batch = objs[start : start + batch_size]
+                self._allocate_idx(field, prefix, batch)
+                created.extend(self.bulk_create(batch, batch_size=batch_size, **kwargs))
+        post_bulk_create.send(sender=self.model, objs=created)
+        return created
+
+    def bulk_update(self, objs, fields, batch_size=None):
+        """
+        bulk_update() that keeps modified_on current and sends
+        post_bulk_update, so caches and search documents follow.
+        """
+        objs = list(objs)
+        if not objs:
+            return 0
+        fields = list(fields)
+        if "modified_on" not in fields:
+            now = timezone.now()
+            for obj in objs:
+                obj.modified_on = now
+            fields.append("modified_on")
+        rows = super().bulk_update(objs, fields, batch_size=batch_size)
+        post_bulk_update.send(sender=self.model, objs=objs, fields=fields)
+        return rows
+
+    def _allocate_idx(self, field, prefix, objs):
+        """
+        Fills in idx for every object that does not have one yet, retrying
+        values that clash with each other or with rows already stored.
+        """
+        taken = {obj.idx for obj in objs if obj.idx}
+        pending = [obj for obj in objs if not obj.idx]
+
+        while pending:
+            candidates = {}
+            for obj in pending:
+                value = field._generate_uuid(prefix)
+                while value in taken or value in candidates:
+                    value = field._generate_uuid(prefix)
+                candidates[value] = obj
+
+            existing = set(
+                self.model._base_manager.using(self.db)
+                .filter(idx__in=list(candidates))
+                .values_list("idx", flat=True)
+            )
+
+            pending = []
+            for value, obj in candidates.items():
+                if value in existing:
+                    pending.append(obj)
+                else:
+                    obj.idx = value
+                    taken.add(value)
+
+
+BaseModelManager = models.Manager.from_queryset(BaseModelQuerySet)
+
 
 class BaseModel(models.Model):
     """
@@ -14,6 +100,8 @@ class BaseModel(models.Model):
     is_obsolete = models.BooleanField(default=False)
     meta = models.JSONField(default=dict, blank=True)
 
+    objects = BaseModelManager()
+
     class Meta:
         abstract = True
         ordering = ["-created_on"]
@@ -22,4 +110,27 @@ class BaseModel(models.Model):
 class Gender(models.TextChoices):
     MALE = "male", "Male"
     FEMALE = "female", "Female"
-    OTHERS = "others", "Others"
\ No newline at end of file
+    OTHERS = "others", "Others"
+
+
+class SearchDocument(models.Model):
+    """
+    Flattened, lowercased search text of one object (see helpers/search.py).
+    """
+
+    model_label = models.CharField(max_length=100)
+    object_id = models.BigIntegerField()
+    document = models.TextField(blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["model_label", "object_id"], name="unique_search_document"
+            )
+        ]
+        indexes = [
+            GinIndex(
+                OpClass("document", name="gin_trgm_ops"),
+                name="search_document_trgm",
+            )
+        ]
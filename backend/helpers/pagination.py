@@ -1,13 +1,93 @@
 # /helpers/pagination.py
-from rest_framework.pagination import PageNumberPagination
+import json
+
+from django.db import connections
+from rest_framework.pagination import CursorPagination, PageNumberPagination
 from helpers.api import BaseAPIMixin
 
 
+def estimate_count(queryset):
+    """
+    Returns the planner's row estimate for `queryset` instead of running a
+    COUNT(*). Cheap on large tables, but only approximately right.
+    """
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        [plan] = cursor.fetchone()
+    # One JSON array holding the statement's plan: [{"Plan": {...}}]. The
+    # driver usually decodes it already.
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class VIMSCursorPagination(CursorPagination):
+    """
+    Keyset pagination over BaseModel's indexed created_on column.
+
+    Every page costs the same no matter how deep it is, because there is no
+    OFFSET scan and no COUNT(*). total_records is only filled in when the
+    client asks for it with ?count=exact or ?count=estimate.
+    """
+
+    page_size = 5
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    ordering = ("-created_on", "-idx")
+    count_query_param = "count"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.total_records = None
+        count_mode = request.query_params.get(self.count_query_param)
+        if count_mode == "exact":
+            self.total_records = queryset.count()
+        elif count_mode == "estimate":
+            self.total_records = estimate_count(queryset)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        api = BaseAPIMixin()
+        response = {
+            "total_pages": None,
+            "current_page": None,
+            "page_size": self.page_size,
+            "total_records": self.total_records,
+            "next_page_url": self.get_next_link(),
+            "previous_page_url": self.get_previous_link(),
+            "data": data,
+        }
+        return api.api_success_response(response)
+
+
 class VIMSPagination(PageNumberPagination):
+    """
+    Page-number pagination by default. Clients switch a request to cursor
+    pagination with ?pagination=cursor; the cursor links it returns carry
+    the switch along.
+    """
+
     page_size = 5
     page_size_query_param = "page_size"
+    pagination_query_param = "pagination"
+
+    def uses_cursor(self, request):
+        return (
+            request.query_params.get(self.pagination_query_param) == "cursor"
+            or VIMSCursorPagination.cursor_query_param in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_paginator = None
+        if self.uses_cursor(request):
+            self.cursor_paginator = VIMSCursorPagination()
+            return self.cursor_paginator.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
 
     def get_paginated_response(self, data):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+
         api = BaseAPIMixin()
         response = {
             "total_pages": self.page.paginator.num_pages,
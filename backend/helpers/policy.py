@@ -0,0 +1,127 @@
+# helpers/policy.py
+"""
+Role policy: which role may do what to which resource.
+
+POLICY is the single table behind the API permission checks
+(PolicyPermission), queryset scoping (has()) and the ui_permissions that
+MyAPIView sends to the frontend. At import it is compiled into one bit per
+"resource:action" and one bitmask per role, so a check is a dict lookup
+and an AND.
+"""
+import hashlib
+
+from rest_framework.permissions import BasePermission
+
+from helpers.constants import Role as ROLE
+
+DIRECTOR = ROLE.DIRECTOR.value
+TENANT_ADMIN = ROLE.TENANT_ADMIN.value
+ACCOUNTANT = ROLE.ACCOUNTANT.value
+INSTRUCTOR = ROLE.INSTRUCTOR.value
+# Not a login role yet; only its UI permissions are used.
+STUDENT = "student"
+
+STAFF = (DIRECTOR, TENANT_ADMIN, ACCOUNTANT, INSTRUCTOR)
+ADMINS = (DIRECTOR, TENANT_ADMIN)
+
+# (resource, action): roles
+POLICY = {
+    ("dashboard", "view"): STAFF + (STUDENT,),
+    ("employee", "view"): STAFF,
+    ("employee", "view_all"): ADMINS,  # others only see their own profile
+    ("employee", "detail:view"): ADMINS,
+    ("employee", "create"): ADMINS,
+    ("employee", "edit"): ADMINS,  # others only edit their own records
+    # No ("employee", "delete"): employees are never deleted (see EmployeeViewSet).
+    ("student", "view"): STAFF,
+    ("student", "create"): STAFF,
+    ("student", "edit"): STAFF,
+    ("student", "delete"): (DIRECTOR,),
+    ("student", "export"): ADMINS,
+    # Custodians are managed by any staff member, deletes included.
+    ("custodian", "view"): STAFF,
+    ("custodian", "create"): STAFF,
+    ("custodian", "edit"): STAFF,
+    ("custodian", "delete"): STAFF,
+    ("course", "view"): STAFF + (STUDENT,),
+    ("course", "create"): ADMINS + (INSTRUCTOR,),
+    ("course", "edit"): ADMINS + (INSTRUCTOR,),
+    ("course", "export"): ADMINS,
+    ("enrollment", "view"): STAFF,
+    ("enrollment", "create"): STAFF,
+    ("enrollment", "edit"): STAFF,
+    ("enrollment", "export"): ADMINS,
+    ("finance", "view"): (DIRECTOR, ACCOUNTANT),
+    ("user", "create"): (DIRECTOR,),
+}
+
+# The action an HTTP method needs unless a PolicyPermission names one.
+METHOD_ACTIONS = {
+    "GET": "view",
+    "HEAD": "view",
+    "OPTIONS": "view",
+    "POST": "create",
+    "PUT": "edit",
+    "PATCH": "edit",
+    "DELETE": "delete",
+}
+
+
+def _compile(policy):
+    bits, masks, names = {}, {}, {}
+    for index, ((resource, action), roles) in enumerate(policy.items()):
+        bits[(resource, action)] = 1 << index
+        for role in roles:
+            masks[role] = masks.get(role, 0) | bits[(resource, action)]
+            names.setdefault(role, []).append(f"{resource}:{action}")
+    return bits, masks, {role: tuple(granted) for role, granted in names.items()}
+
+
+BITS, ROLE_MASKS, UI_PERMISSIONS = _compile(POLICY)
+
+# Changes whenever POLICY does, e.g. for ETags of responses carrying
+# ui_permissions.
+POLICY_VERSION = hashlib.md5(repr(sorted(POLICY.items())).encode()).hexdigest()[:12]
+
+
+def bit(resource, action):
+    """The bit of one policy entry. Raises KeyError for entries not in POLICY."""
+    return BITS[(resource, action)]
+
+
+def has(user, required):
+    """Whether `user`'s role holds the policy bit `required` (see bit())."""
+    return bool(ROLE_MASKS.get(getattr(user, "role", None), 0) & required)
+
+
+def ui_permissions(role):
+    return UI_PERMISSIONS.get(role, ())
+
+
+class PolicyPermission(BasePermission):
+    """
+    Allows a request when the user's role holds (resource, action) in
+    POLICY. Without an explicit action it is taken from the HTTP method;
+    methods whose action is not in POLICY are denied.
+
+    Used as an instance (permission_classes = [PolicyPermission("course")]):
+    DRF "instantiates" it by calling it, which returns the same object, so
+    checking a request allocates nothing.
+    """
+
+    def __init__(self, resource, action=None):
+        self.resource = resource
+        if action is not None:
+            required = bit(resource, action)
+            self.required = {method: required for method in METHOD_ACTIONS}
+        else:
+            self.required = {
+                method: BITS.get((resource, method_action), 0)
+                for method, method_action in METHOD_ACTIONS.items()
+            }
+
+    def __call__(self):
+        return self
+
+    def has_permission(self, request, view):
+        return has(request.user, self.required.get(request.method, 0))
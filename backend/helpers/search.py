@@ -0,0 +1,142 @@
+# helpers/search.py
+"""
+Denormalized search documents.
+
+A model registers the field paths it is searched on (related paths such as
+"student__first_name" included). Their values are flattened into one
+lowercased SearchDocument row per object, which IndexedSearchFilter matches
+with a single trigram index lookup instead of ILIKE scans across joins.
+Documents are refreshed when the object, or any related object its paths
+pass through, is saved (see helpers/signals.py).
+"""
+from collections import defaultdict
+
+from django.apps import apps as django_apps
+
+CHUNK_SIZE = 2000
+
+
+def normalize(value):
+    return " ".join(str(value).split()).lower()
+
+
+class SearchRegistry:
+    def __init__(self):
+        # model label -> field paths
+        self._fields = {}
+        # related model label -> [(model label, path prefix, watched fields)]
+        self._dependents = defaultdict(list)
+
+    def register(self, model, fields):
+        label = model._meta.label_lower
+        self._fields[label] = list(fields)
+
+        prefixes = defaultdict(set)
+        for path in fields:
+            parts = path.split("__")
+            current = model
+            for depth, part in enumerate(parts[:-1], start=1):
+                current = current._meta.get_field(part).related_model
+                prefix = "__".join(parts[:depth])
+                prefixes[(current._meta.label_lower, prefix)].add(parts[depth])
+
+        for (related_label, prefix), watched in prefixes.items():
+            self._dependents[related_label].append((label, prefix, watched))
+
+    def is_registered(self, model):
+        return model._meta.label_lower in self._fields
+
+    def labels(self):
+        return list(self._fields)
+
+    def fields_for(self, label):
+        return self._fields[label]
+
+    def dependents_of(self, model):
+        return self._dependents.get(model._meta.label_lower, [])
+
+
+search_registry = SearchRegistry()
+
+
+def _touches(fields, update_fields):
+    return update_fields is None or bool(set(fields) & set(update_fields))
+
+
+def refresh_documents(label, pks, apps=django_apps):
+    """
+    Rebuilds the documents of the `label` objects with primary keys `pks`.
+    """
+    model = apps.get_model(label)
+    SearchDocument = apps.get_model("helpers", "SearchDocument")
+    fields = search_registry.fields_for(label)
+
+    pks = list(pks)
+    for start in range(0, len(pks), CHUNK_SIZE):
+        chunk = pks[start : start + CHUNK_SIZE]
+        values = defaultdict(list)
+        rows = model._base_manager.filter(pk__in=chunk).values_list("pk", *fields)
+        for pk, *row in rows:
+            values[pk].extend(normalize(v) for v in row if v not in (None, ""))
+
+        SearchDocument.objects.bulk_create(
+            [
+                SearchDocument(
+                    model_label=label, object_id=pk, document=" ".join(parts)
+                )
+                for pk, parts in values.items()
+            ],
+            update_conflicts=True,
+            unique_fields=["model_label", "object_id"],
+            update_fields=["document"],
+        )
+
+
+def rebuild_documents(label, apps=django_apps):
+    """
+    Drops and rebuilds every document of `label` in the current schema.
+    """
+    model = apps.get_model(label)
+    SearchDocument = apps.get_model("helpers", "SearchDocument")
+    SearchDocument.objects.filter(model_label=label).delete()
+    refresh_documents(
+        label, model._base_manager.values_list("pk", flat=True).iterator(), apps
+    )
+
+
+def on_save(model, instance, update_fields=None):
+    label = model._meta.label_lower
+    if search_registry.is_registered(model):
+        own_fields = {p.split("__")[0] for p in search_registry.fields_for(label)}
+        if _touches(own_fields, update_fields):
+            refresh_documents(label, [instance.pk])
+
+    for dependent, prefix, watched in search_registry.dependents_of(model):
+        if _touches(watched, update_fields):
+            dependent_model = django_apps.get_model(dependent)
+            pks = dependent_model._base_manager.filter(
+                **{prefix: instance.pk}
+            ).values_list("pk", flat=True)
+            refresh_documents(dependent, pks)
+
+
+def on_bulk_create(model, objs):
+    label = model._meta.label_lower
+    if search_registry.is_registered(model):
+        refresh_documents(label, [obj.pk for obj in objs if obj.pk is not None])
+
+
+def on_bulk_update(model, objs, fields):
+    label = model._meta.label_lower
+    if search_registry.is_registered(model):
+        own_fields = {p.split("__")[0] for p in search_registry.fields_for(label)}
+        if _touches(own_fields, fields):
+            refresh_documents(label, [obj.pk for obj in objs])
+
+
+def on_delete(model, instance):
+    from helpers.models import SearchDocument
+
+    label = model._meta.label_lower
+    if search_registry.is_registered(model):
+        SearchDocument.objects.filter(model_label=label, object_id=instance.pk).delete()
@@ -10,3 +10,32 @@ class BaseModelSerializer(serializers.ModelSerializer):
             "created_on": {"read_only": True},
             "idx": {"read_only": True},
         }
+
+
+class ExpandableFieldsMixin:
+    """
+    Lets clients pick which nested objects to expand with ?expand=a,b.
+
+    Fields named in Meta.expandable_fields are expanded by default. Once
+    ?expand= is given, the ones it does not name collapse to their idx, and
+    views can use expanded_fields() to skip loading them at all.
+    """
+
+    expand_query_param = "expand"
+
+    @classmethod
+    def expanded_fields(cls, request):
+        expandable = set(cls.Meta.expandable_fields)
+        if request is None or cls.expand_query_param not in request.query_params:
+            return expandable
+        requested = request.query_params[cls.expand_query_param].split(",")
+        return expandable & {name.strip() for name in requested}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        expanded = self.expanded_fields(self.context.get("request"))
+        for name in self.Meta.expandable_fields:
+            if name not in expanded:
+                self.fields[name] = serializers.SlugRelatedField(
+                    slug_field="idx", read_only=True
+                )
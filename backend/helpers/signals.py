@@ -0,0 +1,58 @@
+# helpers/signals.py
+from django.apps import apps
+from django.db import connection
+from django.db.models.signals import post_save, post_delete
+from django_tenants.utils import get_public_schema_name
+
+from helpers import search
+from helpers.cache import bump_model_version_on_commit
+from helpers.models import BaseModel, post_bulk_create, post_bulk_update
+
+
+def invalidate_model_cache(sender, **kwargs):
+    bump_model_version_on_commit(sender)
+
+
+def _in_tenant_schema():
+    # Search documents only exist in tenant schemas (helpers is a tenant app).
+    return connection.schema_name != get_public_schema_name()
+
+
+def update_search_documents(sender, instance, update_fields=None, raw=False, **kwargs):
+    if not raw and _in_tenant_schema():
+        search.on_save(sender, instance, update_fields)
+
+
+def add_search_documents(sender, objs, **kwargs):
+    if _in_tenant_schema():
+        search.on_bulk_create(sender, objs)
+
+
+def update_search_documents_in_bulk(sender, objs, fields, **kwargs):
+    if _in_tenant_schema():
+        search.on_bulk_update(sender, objs, fields)
+
+
+def delete_search_document(sender, instance, **kwargs):
+    if _in_tenant_schema():
+        search.on_delete(sender, instance)
+
+
+def connect_signals():
+    """
+    Connects the receivers per model rather than globally, so saves and
+    deletes of models nobody caches or searches (SearchDocument itself
+    included) never reach them.
+    """
+    registry = search.search_registry
+    for model in apps.get_models():
+        if issubclass(model, BaseModel):
+            for signal in (post_save, post_delete, post_bulk_create, post_bulk_update):
+                signal.connect(invalidate_model_cache, sender=model)
+
+        if registry.is_registered(model):
+            post_delete.connect(delete_search_document, sender=model)
+            post_bulk_create.connect(add_search_documents, sender=model)
+            post_bulk_update.connect(update_search_documents_in_bulk, sender=model)
+        if registry.is_registered(model) or registry.dependents_of(model):
+            post_save.connect(update_search_documents, sender=model)
@@ -0,0 +1,283 @@
+# helpers/tests/query_budgets.py
+"""
+Query-count budgets for the tenant API.
+
+QUERY_BUDGETS lists every read endpoint of the course, student, enrollment
+and employee routers with the most queries one request may run.
+QueryBudgetMixin calls each of them against a TenantFixture, grows the
+fixture and calls them again: a request must run the same number of queries
+either way (no N+1 over the rows it renders) and stay within its budget.
+
+Requests send the director's access token and authenticate the way they do
+in production, from the token claims and a shared cache.
+"""
+import datetime
+from operator import attrgetter
+from unittest import mock
+from urllib.parse import parse_qsl
+
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from course.models import Course, CourseClass, CourseInstructor, Term
+from employee.models import CareerStep, Employee, EmployeeFamily
+from helpers.constants import Role as ROLE
+from student.choices import EnrollmentStatus
+from student.models import Custodian, Student, StudentImport, StudentStatus
+from user.models import User
+from user.serializers import TenantTokenObtainPairSerializer
+
+# Rows of each kind TenantFixture starts with, and how many more it adds
+# before the second measurement. Both stay within one page.
+FIXTURE_ROWS = 5
+GROWTH_ROWS = 5
+PAGE_SIZE = 100
+
+# url name: (max queries, URL kwargs as TenantFixture attribute paths).
+# A name may carry a query string ("enrollment-list?expand=student") to
+# budget a variant of the same endpoint.
+QUERY_BUDGETS = {
+    "course": {
+        "terms-list": (2, {}),
+        "terms-detail": (1, {"idx": "term.idx"}),
+        "courses-list": (2, {}),
+        "courses-detail": (1, {"idx": "course.idx"}),
+        "course-classes-list": (3, {}),
+        "course-classes-detail": (2, {"idx": "course_class.idx"}),
+        "course-classes-enrolled-students": (5, {"idx": "course_class.idx"}),
+        "course-classes-export-roster": (3, {"idx": "course_class.idx"}),
+        "instructor-list": (2, {}),
+    },
+    "student": {
+        "student-list": (2, {}),
+        "student-detail": (2, {"idx": "student.idx"}),
+        "student-enrollments": (3, {"idx": "student.idx"}),
+        "student-custodians": (2, {"idx": "student.idx"}),
+        "student-export": (1, {}),
+        "custodian-list": (2, {}),
+        "custodian-detail": (1, {"idx": "custodian.idx"}),
+        "student-import-list": (2, {}),
+        "student-import-detail": (1, {"idx": "student_import.idx"}),
+    },
+    "enrollment": {
+        "enrollment-list": (3, {}),
+        "enrollment-list?expand=course_class": (3, {}),
+        "enrollment-list?expand=student": (2, {}),
+        "enrollment-list?expand=": (2, {}),
+        "enrollment-detail": (2, {"idx": "enrollment.idx"}),
+        "enrollment-detail?expand=course_class": (2, {"idx": "enrollment.idx"}),
+        "enrollment-detail?expand=student": (1, {"idx": "enrollment.idx"}),
+        "enrollment-export": (1, {}),
+    },
+    "employee": {
+        "employees-list": (4, {}),
+        "employees-detail": (3, {"idx": "employee.idx"}),
+        "employee-family-list": (2, {"employee_idx": "employee.idx"}),
+        "employee-family-detail": (
+            1,
+            {"employee_idx": "employee.idx", "idx": "family.idx"},
+        ),
+        "employee-career-list": (3, {"employee_idx": "employee.idx"}),
+        "employee-career-detail": (
+            2,
+            {"employee_idx": "employee.idx", "idx": "career_step.idx"},
+        ),
+    },
+}
+
+
+class TenantFixture:
+    """
+    A small but complete institute in the current tenant schema. The first
+    object of each kind (self.term, self.student, ...) is what detail
+    endpoints are called with; grow() adds rows both alongside it and to
+    its nested lists (custodians, enrollments, instructors, family, career).
+    """
+
+    def __init__(self):
+        self.serial = 0
+        self.director = User.objects.create_user(
+            email="director@example.com", role=ROLE.DIRECTOR.value
+        )
+        self.term, self.course, self.course_class = self._add_class()
+        self.employee = self._add_instructor(self.course_class)
+        self.student, self.enrollment = self._add_student(self.course_class)
+        self.custodian = self._add_custodian(self.student)
+        self.family = self._add_family(self.employee)
+        self.career_step = self._add_career_step(self.employee)
+        self.student_import = self._add_student_import()
+
+    def _next(self):
+        self.serial += 1
+        return self.serial
+
+    def _add_class(self):
+        n = self._next()
+        term = Term.objects.create(
+            name=f"Term {n}",
+            start_date=datetime.date(2000 + n, 1, 1),
+            end_date=datetime.date(2000 + n, 6, 30),
+        )
+        course = Course.objects.create(name=f"Course {n}", code=f"C{n:03}")
+        course_class = CourseClass.objects.create(
+            course=course, term=term, code=f"C{n:03}-01"
+        )
+        return term, course, course_class
+
+    def _add_instructor(self, course_class):
+        n = self._next()
+        user = User.objects.create_user(
+            email=f"instructor{n}@example.com", role=ROLE.INSTRUCTOR.value
+        )
+        employee = Employee.objects.create(
+            user=user, code=f"E{n:03}", first_name="Instructor", family_name=str(n)
+        )
+        CourseInstructor.objects.create(course_class=course_class, instructor=employee)
+        return employee
+
+    def _add_student(self, course_class):
+        n = self._next()
+        student = Student.objects.create(
+            family_name=f"Student {n}",
+            first_name="Test",
+            dob=datetime.date(2010, 1, 1),
+            email=f"student{n}@example.com",
+        )
+        enrollment = StudentStatus.objects.create(
+            student=student,
+            course_class=course_class,
+            course=course_class.course,
+            term=course_class.term,
+            status=EnrollmentStatus.ACTIVE,
+        )
+        return student, enrollment
+
+    def _add_custodian(self, student):
+        n = self._next()
+        return Custodian.objects.create(
+            student=student, name=f"Custodian {n}", relation="Parent"
+        )
+
+    def _add_family(self, employee):
+        n = self._next()
+        return EmployeeFamily.objects.create(
+            employee=employee, name=f"Relative {n}", relation="Sibling"
+        )
+
+    def _add_career_step(self, employee):
+        n = self._next()
+        return CareerStep.objects.create(
+            employee=employee,
+            start_date=datetime.date(2000 + n, 1, 1),
+            end_date=datetime.date(2000 + n, 12, 31),
+            function="Instructor",
+            salary=1000,
+        )
+
+    def _add_student_import(self):
+        return StudentImport.objects.create(
+            file=f"student_imports/students-{self._next()}.csv",
+            created_by=self.director,
+        )
+
+    def grow(self, rows):
+        for _ in range(rows):
+            term, course, course_class = self._add_class()
+            employee = self._add_instructor(course_class)
+            CourseInstructor.objects.create(
+                course_class=self.course_class, instructor=employee
+            )
+            student, _ = self._add_student(course_class)
+            StudentStatus.objects.create(
+                student=student,
+                course_class=self.course_class,
+                course=self.course,
+                term=self.term,
+                status=EnrollmentStatus.ACTIVE,
+            )
+            StudentStatus.objects.create(
+                student=self.student,
+                course_class=course_class,
+                course=course,
+                term=term,
+                status=EnrollmentStatus.ACTIVE,
+            )
+            self._add_custodian(student)
+            self._add_custodian(self.student)
+            self._add_family(self.employee)
+            self._add_career_step(self.employee)
+            self._add_student_import()
+
+
+class QueryBudgetMixin:
+    """
+    For TenantTestCase subclasses: builds a TenantFixture in setUp() and
+    provides assert_query_budgets() for one QUERY_BUDGETS section.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.fixture = TenantFixture()
+        self.fixture.grow(FIXTURE_ROWS - 1)
+        # Production runs with a shared cache, where the token claims are
+        # trusted without loading the User row.
+        patcher = mock.patch("user.authentication.cache_is_shared", return_value=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        token = TenantTokenObtainPairSerializer.get_token(self.fixture.director)
+        self.api_client = APIClient(HTTP_HOST=self.domain.domain)
+        self.api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {token.access_token}")
+
+    def get(self, url, params=None):
+        response = self.api_client.get(url, {"page_size": PAGE_SIZE, **(params or {})})
+        if response.streaming:
+            # Exports only run their query while the body is read.
+            b"".join(response.streaming_content)
+        self.assertEqual(response.status_code, 200, url)
+        return response
+
+    def count_queries(self, url, params=None):
+        # The first request fills the tenant resolver; the response cache
+        # is emptied so the measured request reaches the database.
+        self.get(url, params)
+        cache.clear()
+        with CaptureQueriesContext(connection) as context:
+            self.get(url, params)
+        return len(context)
+
+    def _resolve(self, name, kwargs):
+        url_name, _, query = name.partition("?")
+        url = reverse(
+            url_name,
+            kwargs={
+                kwarg: attrgetter(path)(self.fixture) for kwarg, path in kwargs.items()
+            },
+        )
+        return url, dict(parse_qsl(query, keep_blank_values=True))
+
+    def assert_query_budgets(self, section):
+        urls = {
+            name: self._resolve(name, kwargs)
+            for name, (_, kwargs) in QUERY_BUDGETS[section].items()
+        }
+        before = {
+            name: self.count_queries(url, params) for name, (url, params) in urls.items()
+        }
+        self.fixture.grow(GROWTH_ROWS)
+
+        for name, (url, params) in urls.items():
+            budget = QUERY_BUDGETS[section][name][0]
+            after = self.count_queries(url, params)
+            with self.subTest(endpoint=name):
+                self.assertEqual(
+                    after,
+                    before[name],
+                    f"{url} ran {before[name]} queries with {FIXTURE_ROWS} rows "
+                    f"and {after} with {FIXTURE_ROWS + GROWTH_ROWS}.",
+                )
+                self.assertLessEqual(
+                    after, budget, f"{url} ran {after} queries, budget is {budget}."
+                )
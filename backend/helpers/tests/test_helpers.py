@@ -0,0 +1,231 @@
+import csv
+import io
+from types import SimpleNamespace
+
+from django.db import connection
+from django.test import SimpleTestCase
+from django.urls import reverse
+from django_tenants.test.cases import TenantTestCase
+from django_tenants.utils import schema_context
+from rest_framework.test import APIClient
+
+from helpers.cache import get_model_versions
+from helpers.constants import Role as ROLE
+from helpers.exports import csv_response, xlsx_response
+from helpers.metrics import Histogram, QueryTimer, RequestMetrics, format_labels
+from helpers.pagination import estimate_count
+from helpers.policy import (
+    ACCOUNTANT,
+    DIRECTOR,
+    INSTRUCTOR,
+    PolicyPermission,
+    bit,
+    has,
+    ui_permissions,
+)
+from student.models import Custodian, Student
+from tenant.resolver import tenant_resolver
+from user.models import User
+
+
+class IDXPrefixQueryCountTests(TenantTestCase):
+    """
+    Generating an idx must not cost a public-schema Client lookup per insert.
+    """
+
+    ROWS = 50
+
+    def setUp(self):
+        tenant_resolver.clear()
+        # Custodian has no search document or statistics hooks, so each
+        # create() is exactly one INSERT.
+        self.student = Student.objects.create(
+            family_name="Doe", first_name="Jane", dob="2010-01-01", email="jane@example.com"
+        )
+        tenant_resolver.clear()
+
+    def _create_custodians(self, count):
+        for i in range(count):
+            Custodian.objects.create(
+                student=self.student, name=f"Custodian {i}", relation="Parent"
+            )
+
+    def test_prefix_comes_from_connection_tenant(self):
+        # TenantTestCase activates the tenant with set_tenant(), so only the
+        # INSERT statements themselves should hit the database.
+        with self.assertNumQueries(self.ROWS):
+            self._create_custodians(self.ROWS)
+
+        custodian = Custodian.objects.first()
+        self.assertTrue(custodian.idx.startswith(f"{self.tenant.id}-SC"))
+
+    def test_prefix_is_looked_up_once_per_schema(self):
+        # schema_context() only attaches a FakeTenant, so the Client id is
+        # queried once and then served from the resolver cache.
+        with schema_context(self.tenant.schema_name):
+            with self.assertNumQueries(self.ROWS + 1):
+                self._create_custodians(self.ROWS)
+
+        self.assertEqual(tenant_resolver.tenant_id_for(connection), self.tenant.id)
+
+
+class ModelVersionTests(TenantTestCase):
+    def test_version_is_bumped_once_the_write_commits(self):
+        student = Student.objects.create(
+            family_name="Doe", first_name="Jane", dob="2010-01-01", email="jane@example.com"
+        )
+        [before] = get_model_versions([Custodian])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Custodian.objects.create(student=student, name="Custodian", relation="Parent")
+            # Readers must keep caching under the old version until then.
+            self.assertEqual(get_model_versions([Custodian]), (before,))
+
+        self.assertEqual(get_model_versions([Custodian]), (before + 1,))
+
+
+class CursorPaginationCountTests(TenantTestCase):
+    def setUp(self):
+        for n in range(3):
+            Student.objects.create(
+                family_name=f"Student {n}",
+                first_name="Test",
+                dob="2010-01-01",
+                email=f"student{n}@example.com",
+            )
+        director = User.objects.create_user(
+            email="director@example.com", role=ROLE.DIRECTOR.value
+        )
+        self.api_client = APIClient(HTTP_HOST=self.domain.domain)
+        self.api_client.force_authenticate(director)
+
+    def test_estimate_count_reads_the_plan(self):
+        with self.assertNumQueries(1):
+            estimate = estimate_count(Student.objects.filter(is_obsolete=False))
+        self.assertIsInstance(estimate, int)
+        self.assertGreaterEqual(estimate, 0)
+
+    def page(self, **params):
+        response = self.api_client.get(
+            reverse("student-list"), {"pagination": "cursor", **params}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["data"]), 3)
+        return response.data
+
+    def test_counts_only_on_request(self):
+        self.assertIsNone(self.page()["total_records"])
+        self.assertEqual(self.page(count="exact")["total_records"], 3)
+
+    def test_estimated_count(self):
+        self.assertIsInstance(self.page(count="estimate")["total_records"], int)
+
+
+class ExportFormulaInjectionTests(SimpleTestCase):
+    ROWS = [("=HYPERLINK(\"http://x\")", "+1", "-2", "@SUM(A1)", "Jane", 3)]
+    EXPECTED = ["'=HYPERLINK(\"http://x\")", "'+1", "'-2", "'@SUM(A1)", "Jane", 3]
+
+    def test_csv_quotes_formula_cells(self):
+        response = csv_response(["a", "b", "c", "d", "e", "f"], self.ROWS, "test")
+        content = b"".join(response.streaming_content).decode()
+        row = next(csv.reader(io.StringIO(content.splitlines()[1])))
+        self.assertEqual(row, [str(value) for value in self.EXPECTED])
+
+    def test_xlsx_quotes_formula_cells(self):
+        from openpyxl import load_workbook
+
+        response = xlsx_response(["a", "b", "c", "d", "e", "f"], self.ROWS, "test")
+        workbook = load_workbook(io.BytesIO(b"".join(response.streaming_content)))
+        values = [cell.value for cell in workbook.active[2]]
+        self.assertEqual(values, self.EXPECTED)
+
+
+class MetricsTests(SimpleTestCase):
+    def test_histogram_renders_cumulative_buckets(self):
+        histogram = Histogram((1, 5))
+        for value in (0.5, 3, 3, 10):
+            histogram.observe(value)
+
+        lines = histogram.render("m", (("view", "v"),))
+
+        self.assertEqual(
+            lines,
+            [
+                'm_bucket{view="v",le="1"} 1',
+                'm_bucket{view="v",le="5"} 3',
+                'm_bucket{view="v",le="+Inf"} 4',
+                'm_sum{view="v"} 16.5',
+                'm_count{view="v"} 4',
+            ],
+        )
+
+    def test_request_metrics_are_labelled_per_schema_and_view(self):
+        metrics = RequestMetrics()
+        metrics.observe("t1", "students-list", duration=0.2, db_duration=0.1, queries=3)
+        metrics.observe("t2", "students-list", duration=0.2, db_duration=0.1, queries=3)
+
+        text = "\n".join(metrics.render())
+
+        self.assertIn('vims_request_queries_count{schema="t1",view="students-list"} 1', text)
+        self.assertIn('vims_request_queries_count{schema="t2",view="students-list"} 1', text)
+        # No size was given, so no response size series exists.
+        self.assertNotIn("vims_response_size_bytes_count", text)
+
+        metrics.clear()
+        self.assertNotIn("_count{", "\n".join(metrics.render()))
+
+    def test_label_values_are_escaped(self):
+        self.assertEqual(format_labels((("view", 'a"b\\c'),)), '{view="a\\"b\\\\c"}')
+
+    def test_query_timer_counts_and_times_queries(self):
+        timer = QueryTimer()
+        execute = lambda sql, params, many, context: "result"  # noqa: E731
+
+        self.assertEqual(timer(execute, "SELECT 1", (), False, {}), "result")
+        timer(execute, "SELECT 2", (), False, {})
+
+        self.assertEqual(timer.count, 2)
+        self.assertGreaterEqual(timer.duration, 0)
+
+
+class PolicyTests(SimpleTestCase):
+    def allows(self, permission, role, method):
+        request = SimpleNamespace(user=SimpleNamespace(role=role), method=method)
+        return permission().has_permission(request, view=None)
+
+    def test_method_actions(self):
+        course = PolicyPermission("course")
+        self.assertTrue(self.allows(course, INSTRUCTOR, "GET"))
+        self.assertTrue(self.allows(course, INSTRUCTOR, "PATCH"))
+        self.assertFalse(self.allows(course, ACCOUNTANT, "POST"))
+        # There is no course:delete entry, so nobody may delete.
+        self.assertFalse(self.allows(course, DIRECTOR, "DELETE"))
+        self.assertFalse(self.allows(course, DIRECTOR, "TRACE"))
+
+    def test_fixed_action_ignores_the_method(self):
+        export = PolicyPermission("student", "export")
+        self.assertTrue(self.allows(export, DIRECTOR, "GET"))
+        self.assertFalse(self.allows(export, INSTRUCTOR, "GET"))
+
+    def test_unknown_action_is_rejected_at_declaration(self):
+        with self.assertRaises(KeyError):
+            PolicyPermission("course", "launch")
+
+    def test_users_without_a_role_hold_nothing(self):
+        self.assertFalse(has(SimpleNamespace(), bit("dashboard", "view")))
+        self.assertFalse(has(SimpleNamespace(role="nobody"), bit("dashboard", "view")))
+
+    def test_custodians_stay_editable_by_all_staff(self):
+        custodian = PolicyPermission("custodian")
+        for method in ("GET", "POST", "PUT", "DELETE"):
+            self.assertTrue(self.allows(custodian, INSTRUCTOR, method), method)
+
+    def test_ui_permissions_follow_the_table(self):
+        self.assertIn("finance:view", ui_permissions(ACCOUNTANT))
+        self.assertNotIn("finance:view", ui_permissions(INSTRUCTOR))
+        self.assertEqual(ui_permissions("nobody"), ())
+
+    def test_employees_cannot_be_deleted(self):
+        # EmployeeViewSet.destroy always refuses, so the UI must not offer it.
+        self.assertFalse(self.allows(PolicyPermission("employee"), DIRECTOR, "DELETE"))
+        self.assertNotIn("employee:delete", ui_permissions(DIRECTOR))
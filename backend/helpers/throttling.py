@@ -0,0 +1,61 @@
+# helpers/throttling.py
+"""
+Token-bucket throttling on the shared Django cache.
+
+A bucket holds up to `capacity` tokens and refills completely in `period`
+seconds; every request takes one token. The state is a single cache entry
+per key ((tokens, timestamp), expiring once the bucket would be full
+again), so it is shared by all workers when the cache is Redis and costs
+one get and at most one set per bucket. Concurrent requests can each take
+the last token; the buckets are a brake, not an exact limit. Cache keys
+are namespaced by tenant schema through the cache KEY_FUNCTION.
+"""
+import time
+
+from django.core.cache import cache
+from django.db import connection
+from rest_framework.throttling import BaseThrottle
+
+from helpers.metrics import throttled_requests
+
+
+def take_token(key, capacity, period, now=None):
+    """
+    Takes a token from bucket `key`. Returns 0 if one was available,
+    otherwise the seconds until the next one.
+    """
+    now = time.time() if now is None else now
+    refill_rate = capacity / period
+    tokens, updated_at = cache.get(key, (capacity, now))
+    tokens = min(capacity, tokens + (now - updated_at) * refill_rate)
+    if tokens < 1:
+        return (1 - tokens) / refill_rate
+    cache.set(key, (tokens - 1, now), timeout=period)
+    return 0
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Base DRF throttle: get_buckets() returns (name, key, (capacity, period))
+    for every bucket a request has to take a token from. Rejections are
+    counted in helpers.metrics.throttled_requests per schema, scope and
+    bucket name.
+    """
+
+    scope = None
+
+    def get_buckets(self, request, view):
+        raise NotImplementedError
+
+    def allow_request(self, request, view):
+        self.wait_seconds = None
+        for name, key, (capacity, period) in self.get_buckets(request, view):
+            wait = take_token(f"throttle:{self.scope}:{key}", capacity, period)
+            if wait:
+                self.wait_seconds = wait
+                throttled_requests.inc(connection.schema_name, self.scope, name)
+                return False
+        return True
+
+    def wait(self):
+        return self.wait_seconds
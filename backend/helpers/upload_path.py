@@ -55,3 +55,4 @@ class TenantFilePath:
 employee_photo_upload_path = TenantFilePath(sub_path="employee-photos")
 student_photo_upload_path = TenantFilePath(sub_path="student-photos")
 institute_logo_upload_path = TenantFilePath(sub_path="institute-logos")
+student_import_upload_path = TenantFilePath(sub_path="student-imports")
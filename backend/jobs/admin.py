@@ -0,0 +1,11 @@
+from django.contrib import admin
+
+from .models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ("name", "schema_name", "status", "attempts", "run_after", "created_on")
+    list_filter = ("status", "name")
+    search_fields = ("name", "schema_name", "idx")
+    readonly_fields = ("last_error", "attempts", "locked_on", "finished_on")
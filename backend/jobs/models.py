@@ -0,0 +1,51 @@
+# jobs/models.py
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.utils import timezone
+
+from helpers.models import BaseModel
+from .choices import JobStatus
+
+
+class Job(BaseModel):
+    """
+    A unit of background work stored in the public schema.
+    `schema_name` is the tenant schema the handler runs in.
+    """
+
+    name = models.CharField(
+        max_length=100, help_text="Registered name of the job handler."
+    )
+    payload = models.JSONField(
+        default=dict,
+        blank=True,
+        encoder=DjangoJSONEncoder,
+        help_text="Keyword arguments passed to the handler.",
+    )
+    schema_name = models.CharField(
+        max_length=63, help_text="Tenant schema the job runs in."
+    )
+    status = models.CharField(
+        max_length=20,
+        choices=JobStatus.choices,
+        default=JobStatus.QUEUED,
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=3)
+    run_after = models.DateTimeField(
+        default=timezone.now, help_text="The job is not picked up before this time."
+    )
+    locked_on = models.DateTimeField(null=True, blank=True)
+    finished_on = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+
+    class Meta:
+        verbose_name = "Job"
+        verbose_name_plural = "Jobs"
+        ordering = ["-created_on"]
+        indexes = [
+            models.Index(fields=["status", "run_after"]),
+        ]
+
+    def __str__(self):
+        return f"{self.name} [{self.schema_name}] — {self.get_status_display()}"
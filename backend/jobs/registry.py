@@ -0,0 +1,27 @@
+# jobs/registry.py
+_handlers = {}
+
+
+def register_job(name, atomic=True):
+    """
+    Registers the decorated function as the handler for jobs called `name`.
+    Handlers receive the job payload as keyword arguments and run inside
+    the job's tenant schema, in one transaction unless atomic=False (for
+    long jobs that commit their own progress as they go).
+    """
+
+    def decorator(func):
+        if name in _handlers and _handlers[name] is not func:
+            raise ValueError(f"A job handler named '{name}' is already registered.")
+        func.atomic = atomic
+        _handlers[name] = func
+        return func
+
+    return decorator
+
+
+def get_handler(name):
+    try:
+        return _handlers[name]
+    except KeyError:
+        raise LookupError(f"No job handler registered for '{name}'.")
@@ -0,0 +1,147 @@
+# jobs/services.py
+import datetime
+import logging
+import threading
+import traceback
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+from django_tenants.utils import schema_context, get_public_schema_name
+
+from .choices import JobStatus
+from .models import Job
+from .registry import get_handler
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue(name: str, payload: dict = None, *, schema_name: str = None, delay=None, max_attempts: int = None) -> Job:
+    """
+    Queues job `name` to run in `schema_name` (default: the current schema).
+    The row is written in the caller's transaction, so the job only becomes
+    visible to workers once that transaction commits.
+    """
+    get_handler(name)  # fail fast on typos
+
+    now = timezone.now()
+    job = Job(
+        name=name,
+        payload=payload or {},
+        schema_name=schema_name or connection.schema_name,
+        run_after=now + (delay or datetime.timedelta()),
+        max_attempts=max_attempts or settings.JOB_MAX_ATTEMPTS,
+    )
+    with schema_context(get_public_schema_name()):
+        job.save()
+    return job
+
+
+def requeue_stale_jobs() -> int:
+    """
+    Puts back jobs whose worker died while running them, i.e. whose
+    heartbeat stopped refreshing locked_on JOB_LOCK_TIMEOUT seconds ago.
+    """
+    cutoff = timezone.now() - datetime.timedelta(seconds=settings.JOB_LOCK_TIMEOUT)
+    return Job.objects.filter(status=JobStatus.RUNNING, locked_on__lt=cutoff).update(
+        status=JobStatus.QUEUED, locked_on=None
+    )
+
+
+def claim_next_job():
+    """
+    Locks and returns the oldest runnable job, skipping rows other workers
+    hold, or None when the queue is empty.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        job = (
+            Job.objects.select_for_update(skip_locked=True)
+            .filter(status=JobStatus.QUEUED, run_after__lte=now)
+            .order_by("run_after", "id")
+            .first()
+        )
+        if job is None:
+            return None
+
+        job.status = JobStatus.RUNNING
+        job.attempts += 1
+        job.locked_on = now
+        job.save(update_fields=["status", "attempts", "locked_on", "modified_on"])
+    return job
+
+
+class Heartbeat(threading.Thread):
+    """
+    Refreshes a running job's locked_on every JOB_HEARTBEAT_INTERVAL
+    seconds, so long jobs are never mistaken for ones whose worker died.
+    Uses its own database connection, outside the handler's transaction.
+    """
+
+    def __init__(self, job_id, interval=None):
+        super().__init__(name=f"job-heartbeat-{job_id}", daemon=True)
+        self.job_id = job_id
+        self.interval = interval or settings.JOB_HEARTBEAT_INTERVAL
+        self._stopped = threading.Event()
+
+    def run(self):
+        try:
+            while not self._stopped.wait(self.interval):
+                with schema_context(get_public_schema_name()):
+                    Job.objects.filter(pk=self.job_id, status=JobStatus.RUNNING).update(
+                        locked_on=timezone.now()
+                    )
+        except Exception:
+            logger.exception("Heartbeat of job %s failed", self.job_id)
+        finally:
+            connection.close()
+
+    def stop(self):
+        self._stopped.set()
+        self.join()
+
+
+def run_job(job: Job) -> Job:
+    """
+    Runs a claimed job in its tenant schema and records the outcome.
+    Failures are retried with exponential backoff until max_attempts.
+    """
+    heartbeat = Heartbeat(job.pk)
+    heartbeat.start()
+    try:
+        handler = get_handler(job.name)
+        with schema_context(job.schema_name):
+            if handler.atomic:
+                with transaction.atomic():
+                    handler(**job.payload)
+            else:
+                handler(**job.payload)
+    except Exception:
+        job.last_error = traceback.format_exc()
+        if job.attempts < job.max_attempts:
+            backoff = settings.JOB_RETRY_DELAY * 2 ** (job.attempts - 1)
+            job.status = JobStatus.QUEUED
+            job.run_after = timezone.now() + datetime.timedelta(seconds=backoff)
+        else:
+            job.status = JobStatus.FAILED
+            job.finished_on = timezone.now()
+        logger.exception("Job %s (%s) failed on attempt %s", job.idx, job.name, job.attempts)
+    else:
+        job.status = JobStatus.DONE
+        job.finished_on = timezone.now()
+        job.last_error = ""
+    finally:
+        heartbeat.stop()
+
+    job.locked_on = None
+    job.save(
+        update_fields=[
+            "status",
+            "run_after",
+            "locked_on",
+            "finished_on",
+            "last_error",
+            "modified_on",
+        ]
+    )
+    return job
@@ -0,0 +1,136 @@
+import datetime
+import threading
+import time
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+
+from jobs.choices import JobStatus
+from jobs.models import Job
+from jobs.registry import register_job
+from jobs.services import Heartbeat, claim_next_job, enqueue, requeue_stale_jobs, run_job
+
+calls = []
+
+
+@register_job("tests.record")
+def record(**payload):
+    calls.append(payload)
+
+
+@register_job("tests.fail")
+def fail(**payload):
+    raise RuntimeError("boom")
+
+
+def _make_stale(job):
+    stale = timezone.now() - datetime.timedelta(seconds=settings.JOB_LOCK_TIMEOUT + 1)
+    Job.objects.filter(pk=job.pk).update(locked_on=stale)
+
+
+class JobQueueTests(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_claims_oldest_runnable_job_first(self):
+        first = enqueue("tests.record", {"n": 1})
+        second = enqueue("tests.record", {"n": 2})
+        enqueue("tests.record", {"n": 3}, delay=datetime.timedelta(hours=1))
+
+        job = claim_next_job()
+        self.assertEqual(job.pk, first.pk)
+        self.assertEqual(job.status, JobStatus.RUNNING)
+        self.assertEqual(job.attempts, 1)
+        self.assertIsNotNone(job.locked_on)
+
+        self.assertEqual(claim_next_job().pk, second.pk)
+        # The third job is not due yet.
+        self.assertIsNone(claim_next_job())
+
+    def test_requeues_only_stale_running_jobs(self):
+        stale = enqueue("tests.record")
+        fresh = enqueue("tests.record")
+        claim_next_job()
+        claim_next_job()
+        _make_stale(stale)
+
+        self.assertEqual(requeue_stale_jobs(), 1)
+        stale.refresh_from_db()
+        fresh.refresh_from_db()
+        self.assertEqual(stale.status, JobStatus.QUEUED)
+        self.assertIsNone(stale.locked_on)
+        self.assertEqual(fresh.status, JobStatus.RUNNING)
+
+    def test_run_job_passes_payload_and_records_success(self):
+        enqueue("tests.record", {"n": 1})
+
+        job = run_job(claim_next_job())
+
+        self.assertEqual(calls, [{"n": 1}])
+        job.refresh_from_db()
+        self.assertEqual(job.status, JobStatus.DONE)
+        self.assertIsNone(job.locked_on)
+        self.assertIsNotNone(job.finished_on)
+
+    def test_failed_job_is_retried_with_backoff_then_failed(self):
+        enqueue("tests.fail", max_attempts=2)
+
+        before = timezone.now()
+        job = run_job(claim_next_job())
+        self.assertEqual(job.status, JobStatus.QUEUED)
+        self.assertIn("boom", job.last_error)
+        self.assertGreaterEqual(
+            job.run_after, before + datetime.timedelta(seconds=settings.JOB_RETRY_DELAY)
+        )
+        self.assertIsNone(claim_next_job())
+
+        Job.objects.filter(pk=job.pk).update(run_after=timezone.now())
+        job = run_job(claim_next_job())
+        self.assertEqual(job.status, JobStatus.FAILED)
+        self.assertEqual(job.attempts, 2)
+
+
+class JobQueueConcurrencyTests(TransactionTestCase):
+    """Needs committed rows and a second connection, hence TransactionTestCase."""
+
+    def test_claim_skips_rows_locked_by_another_worker(self):
+        locked_job = enqueue("tests.record")
+        free_job = enqueue("tests.record")
+        locked = threading.Event()
+        release = threading.Event()
+
+        def hold_lock():
+            try:
+                with transaction.atomic():
+                    Job.objects.select_for_update().get(pk=locked_job.pk)
+                    locked.set()
+                    release.wait(5)
+            finally:
+                connection.close()
+
+        worker = threading.Thread(target=hold_lock)
+        worker.start()
+        try:
+            self.assertTrue(locked.wait(5))
+            self.assertEqual(claim_next_job().pk, free_job.pk)
+        finally:
+            release.set()
+            worker.join()
+
+        self.assertEqual(claim_next_job().pk, locked_job.pk)
+
+    def test_heartbeat_keeps_a_long_job_from_being_requeued(self):
+        job = enqueue("tests.record")
+        claim_next_job()
+        _make_stale(job)
+
+        heartbeat = Heartbeat(job.pk, interval=0.05)
+        heartbeat.start()
+        time.sleep(0.3)
+        heartbeat.stop()
+
+        self.assertEqual(requeue_stale_jobs(), 0)
+        job.refresh_from_db()
+        self.assertEqual(job.status, JobStatus.RUNNING)
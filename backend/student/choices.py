@@ -5,3 +5,10 @@ class EnrollmentStatus(models.TextChoices):
     ENQUIRED = "enquired", "Enquired"
     ACTIVE = "active", "Active"
     CLOSED = "closed", "Closed"
+
+
+class ImportStatus(models.TextChoices):
+    QUEUED = "queued", "Queued"
+    RUNNING = "running", "Running"
+    DONE = "done", "Done"
+    FAILED = "failed", "Failed"
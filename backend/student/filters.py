@@ -0,0 +1,58 @@
+# student/filters.py
+from django.contrib.postgres.search import TrigramSimilarity
+from django.db.models import Case, FloatField, Q, Value, When
+from django.db.models.functions import Greatest
+from rest_framework import filters
+
+
+class StudentSearchFilter(filters.SearchFilter):
+    """
+    Ranked student search backed by the trigram indexes on Student.
+
+    Every search term must match one of the columns: names, email and phone
+    by prefix, and names and email anywhere once a term is long enough for
+    trigrams to be selective. Results are ordered by trigram similarity to
+    the whole search string, with exact name prefixes first.
+    """
+
+    min_substring_length = 3
+
+    def term_filter(self, term):
+        match = (
+            Q(first_name__istartswith=term)
+            | Q(family_name__istartswith=term)
+            | Q(email__istartswith=term)
+            | Q(phone__startswith=term)
+        )
+        if len(term) >= self.min_substring_length:
+            match |= (
+                Q(first_name__icontains=term)
+                | Q(family_name__icontains=term)
+                | Q(email__icontains=term)
+            )
+        return match
+
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        if not terms:
+            return queryset
+
+        for term in terms:
+            queryset = queryset.filter(self.term_filter(term))
+
+        search = " ".join(terms)
+        prefix_match = Q(first_name__istartswith=terms[0]) | Q(
+            family_name__istartswith=terms[0]
+        )
+        return queryset.annotate(
+            search_rank=Greatest(
+                TrigramSimilarity("first_name", search),
+                TrigramSimilarity("family_name", search),
+                TrigramSimilarity("email", search),
+            )
+            + Case(
+                When(prefix_match, then=Value(1.0)),
+                default=Value(0.0),
+                output_field=FloatField(),
+            )
+        ).order_by("-search_rank", "family_name", "first_name")
@@ -0,0 +1,270 @@
+# student/imports.py
+"""
+Bulk student import from CSV or XLSX files.
+
+The file is streamed row by row and processed in chunks of CHUNK_SIZE rows.
+Each chunk is validated with StudentImportRowSerializer, checked against
+Student's unique email and (family_name, first_name, dob) with one query
+per constraint, and loaded with bulk_create_with_idx. Each chunk commits
+together with the StudentImport progress counters, so pollers see progress
+and a retried job resumes after the last committed chunk.
+"""
+import codecs
+import csv
+import datetime
+import os
+import zipfile
+
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from helpers.exceptions import VimsException
+from student.choices import ImportStatus
+from student.models import Custodian, Student, StudentImport
+from student.serializers import StudentImportRowSerializer
+
+CHUNK_SIZE = 500
+# Rejected rows kept on the StudentImport; error_count still counts them all.
+MAX_REPORTED_ERRORS = 1000
+
+STUDENT_FIELDS = ["family_name", "first_name", "dob", "email", "phone", "gender"]
+CUSTODIAN_FIELDS = {
+    "custodian_name": "name",
+    "custodian_relation": "relation",
+    "custodian_phone": "phone",
+    "custodian_email": "email",
+}
+
+
+def _header(value):
+    return str(value or "").strip().lower().replace(" ", "_")
+
+
+def _cell(value):
+    if isinstance(value, datetime.datetime):
+        return value.date()
+    if isinstance(value, datetime.date):
+        return value
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    if value is None:
+        return None
+    return str(value).strip() or None
+
+
+def _csv_lines(fileobj):
+    reader = csv.reader(codecs.iterdecode(fileobj, "utf-8-sig"))
+    start = 1
+    for values in reader:
+        # Quoted values can span lines; report where the record starts.
+        yield start, values
+        start = reader.line_num + 1
+
+
+def _xlsx_lines(fileobj):
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(fileobj, read_only=True, data_only=True)
+    try:
+        yield from enumerate(workbook.active.iter_rows(values_only=True), start=1)
+    finally:
+        workbook.close()
+
+
+def iter_rows(fileobj, filename):
+    """
+    Yields (line number, {column: value}) for every non-empty data row.
+    The first row holds the column names.
+    """
+    extension = os.path.splitext(filename)[1].lower()
+    if extension == ".csv":
+        lines = _csv_lines(fileobj)
+    elif extension == ".xlsx":
+        lines = _xlsx_lines(fileobj)
+    else:
+        raise VimsException("Upload a .csv or .xlsx file.")
+
+    header = None
+    for line, values in lines:
+        if header is None:
+            header = [_header(value) for value in values]
+            continue
+        row = {}
+        for column, value in zip(header, values):
+            value = _cell(value)
+            if column and value is not None:
+                row[column] = value
+        if row:
+            yield line, row
+
+
+def _record_error(student_import, line, errors):
+    student_import.error_count += 1
+    if len(student_import.errors) < MAX_REPORTED_ERRORS:
+        student_import.errors.append({"line": line, "errors": errors})
+
+
+def _validate_chunk(student_import, rows, seen_emails, seen_keys):
+    """
+    Returns the rows of `rows` that can be inserted, recording the rest as
+    errors. `seen_*` carry the keys of earlier rows in the same file.
+    """
+    valid = []
+    for line, row in rows:
+        serializer = StudentImportRowSerializer(data=row)
+        if serializer.is_valid():
+            valid.append((line, serializer.validated_data))
+        else:
+            _record_error(student_import, line, serializer.errors)
+
+    if not valid:
+        return []
+
+    existing_emails = set(
+        Student.objects.filter(
+            email__in=[data["email"] for _, data in valid]
+        ).values_list("email", flat=True)
+    )
+    names = Q()
+    for _, data in valid:
+        names |= Q(
+            family_name=data["family_name"],
+            first_name=data["first_name"],
+            dob=data["dob"],
+        )
+    existing_keys = set(
+        Student.objects.filter(names).values_list("family_name", "first_name", "dob")
+    )
+
+    accepted = []
+    for line, data in valid:
+        email = data["email"]
+        key = (data["family_name"], data["first_name"], data["dob"])
+        if email in existing_emails or email in seen_emails:
+            _record_error(
+                student_import, line, {"email": ["A student with this email already exists."]}
+            )
+        elif key in existing_keys or key in seen_keys:
+            _record_error(
+                student_import,
+                line,
+                {"non_field_errors": ["A student with this name and date of birth already exists."]},
+            )
+        else:
+            seen_emails.add(email)
+            seen_keys.add(key)
+            accepted.append((line, data))
+    return accepted
+
+
+def _build(data):
+    student = Student(**{field: data[field] for field in STUDENT_FIELDS if field in data})
+    custodian = None
+    if data.get("custodian_name"):
+        custodian = Custodian(
+            **{
+                target: data[source]
+                for source, target in CUSTODIAN_FIELDS.items()
+                if source in data
+            }
+        )
+    return student, custodian
+
+
+def _insert(rows):
+    students, custodians = [], []
+    for _, data in rows:
+        student, custodian = _build(data)
+        students.append(student)
+        if custodian is not None:
+            custodian.student = student
+            custodians.append(custodian)
+    Student.objects.bulk_create_with_idx(students)
+    for custodian in custodians:
+        custodian.student_id = custodian.student.pk
+    Custodian.objects.bulk_create_with_idx(custodians)
+    return len(students)
+
+
+def _load_chunk(student_import, rows, seen_emails, seen_keys):
+    with transaction.atomic():
+        accepted = _validate_chunk(student_import, rows, seen_emails, seen_keys)
+        try:
+            with transaction.atomic():
+                created = _insert(accepted)
+        except IntegrityError:
+            # A concurrent write took one of the keys; insert row by row
+            # so only the clashing rows are rejected.
+            created = 0
+            for line, data in accepted:
+                try:
+                    with transaction.atomic():
+                        created += _insert([(line, data)])
+                except IntegrityError:
+                    _record_error(
+                        student_import, line, {"non_field_errors": ["Duplicate student."]}
+                    )
+
+        student_import.created_count += created
+        student_import.processed_rows += len(rows)
+        student_import.save(
+            update_fields=[
+                "created_count",
+                "processed_rows",
+                "error_count",
+                "errors",
+                "modified_on",
+            ]
+        )
+
+
+def run_import(student_import: StudentImport, progress=None) -> StudentImport:
+    """
+    Loads every row of `student_import.file`. Rows already processed by an
+    earlier attempt are skipped. `progress`, if given, is called with the
+    StudentImport after every chunk.
+    """
+    name = student_import.file.name
+    try:
+        with student_import.file.open("rb") as fileobj:
+            student_import.total_rows = sum(1 for _ in iter_rows(fileobj, name))
+    except VimsException as exc:
+        return fail_import(student_import, exc.message)
+    except (csv.Error, UnicodeDecodeError, zipfile.BadZipFile):
+        return fail_import(student_import, "The file could not be read.")
+
+    student_import.status = ImportStatus.RUNNING
+    student_import.save(update_fields=["status", "total_rows", "modified_on"])
+
+    # Keys of rows committed by an earlier attempt are already in the table.
+    seen_emails, seen_keys = set(), set()
+    skip = student_import.processed_rows
+    chunk = []
+    with student_import.file.open("rb") as fileobj:
+        for index, (line, row) in enumerate(iter_rows(fileobj, name)):
+            if index < skip:
+                continue
+            chunk.append((line, row))
+            if len(chunk) >= CHUNK_SIZE:
+                _load_chunk(student_import, chunk, seen_emails, seen_keys)
+                chunk = []
+                if progress:
+                    progress(student_import)
+        if chunk:
+            _load_chunk(student_import, chunk, seen_emails, seen_keys)
+            if progress:
+                progress(student_import)
+
+    student_import.status = ImportStatus.DONE
+    student_import.finished_on = timezone.now()
+    student_import.save(update_fields=["status", "finished_on", "modified_on"])
+    return student_import
+
+
+def fail_import(student_import: StudentImport, message: str) -> StudentImport:
+    student_import.status = ImportStatus.FAILED
+    student_import.finished_on = timezone.now()
+    student_import.errors.append({"line": None, "errors": {"file": [message]}})
+    student_import.save(update_fields=["status", "finished_on", "errors", "modified_on"])
+    return student_import
@@ -0,0 +1,48 @@
+# student/management/commands/import_students.py
+import os
+
+from django.core.files import File
+from django.core.management.base import BaseCommand, CommandError
+from django_tenants.utils import schema_context
+
+from student.choices import ImportStatus
+from student.imports import run_import
+from student.models import StudentImport
+
+
+class Command(BaseCommand):
+    help = "Imports students from a CSV/XLSX file into one tenant schema."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV or XLSX file with a header row.")
+        parser.add_argument(
+            "-s", "--schema", required=True, help="Tenant schema to import into."
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        if not os.path.isfile(path):
+            raise CommandError(f"{path} does not exist.")
+
+        with schema_context(options["schema"]):
+            with open(path, "rb") as fh:
+                student_import = StudentImport.objects.create(
+                    file=File(fh, name=os.path.basename(path))
+                )
+            run_import(student_import, progress=self.report_progress)
+
+        for error in student_import.errors:
+            self.stderr.write(f"line {error['line']}: {error['errors']}")
+        if student_import.status == ImportStatus.FAILED:
+            raise CommandError(f"Import {student_import.idx} failed.")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Import {student_import.idx}: {student_import.created_count} created, "
+                f"{student_import.error_count} rejected."
+            )
+        )
+
+    def report_progress(self, student_import):
+        self.stdout.write(
+            f"{student_import.processed_rows}/{student_import.total_rows} rows processed"
+        )
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.5 on 2026-10-18 15:13
+
+import django.db.models.deletion
+import helpers.fields
+import helpers.storage
+import helpers.upload_path
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('student', '0011_student_search_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StudentImport',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('idx', helpers.fields.IDXField(blank=True, editable=False, length=8, max_length=16, unique=True)),
+                ('created_on', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('modified_on', models.DateTimeField(auto_now=True, db_index=True)),
+                ('is_obsolete', models.BooleanField(default=False)),
+                ('meta', models.JSONField(blank=True, default=dict)),
+                ('file', helpers.storage.CustomFileField(upload_to=helpers.upload_path.TenantFilePath(sub_path='student-imports'))),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], default='queued', max_length=10)),
+                ('total_rows', models.PositiveIntegerField(default=0)),
+                ('processed_rows', models.PositiveIntegerField(default=0)),
+                ('created_count', models.PositiveIntegerField(default=0)),
+                ('error_count', models.PositiveIntegerField(default=0)),
+                ('errors', models.JSONField(blank=True, default=list, help_text="Rejected rows as [{'line': <file line>, 'errors': {...}}].")),
+                ('finished_on', models.DateTimeField(blank=True, null=True)),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Student Import',
+                'verbose_name_plural': 'Student Imports',
+                'ordering': ['-created_on'],
+            },
+        ),
+    ]
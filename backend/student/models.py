@@ -2,14 +2,16 @@
 import datetime
 import os
 
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.db import models
 from django.db.models import Q, UniqueConstraint
+from django.db.models.functions import Upper
 from django_tenants.utils import connection
 
 from helpers.models import BaseModel
-from .choices import EnrollmentStatus
-from helpers.storage import CustomImageField
-from helpers.upload_path import student_photo_upload_path
+from .choices import EnrollmentStatus, ImportStatus
+from helpers.storage import CustomFileField, CustomImageField
+from helpers.upload_path import student_import_upload_path, student_photo_upload_path
 from helpers.models import Gender
 
 
@@ -46,6 +48,26 @@ class Student(BaseModel):
         verbose_name_plural = "Students"
         ordering = ["family_name", "first_name"]
         unique_together = ["family_name", "first_name", "dob"]
+        # Trigram indexes backing StudentSearchFilter. The UPPER() expressions
+        # match what istartswith/icontains compile to on Postgres.
+        indexes = [
+            GinIndex(
+                OpClass(Upper("first_name"), name="gin_trgm_ops"),
+                name="student_first_name_trgm",
+            ),
+            GinIndex(
+                OpClass(Upper("family_name"), name="gin_trgm_ops"),
+                name="student_family_name_trgm",
+            ),
+            GinIndex(
+                OpClass(Upper("email"), name="gin_trgm_ops"),
+                name="student_email_trgm",
+            ),
+            GinIndex(
+                OpClass("phone", name="gin_trgm_ops"),
+                name="student_phone_trgm",
+            ),
+        ]
 
     @property
     def full_name(self):
@@ -151,3 +173,33 @@ class StudentStatus(BaseModel):
 
     def __str__(self):
         return f"{self.student} — {self.get_status_display()} — {self.course_class or self.course}"
+
+
+class StudentImport(BaseModel):
+    """An uploaded CSV/XLSX file of students, loaded in the background."""
+
+    file = CustomFileField(upload_to=student_import_upload_path, private=True)
+    status = models.CharField(
+        max_length=10, choices=ImportStatus.choices, default=ImportStatus.QUEUED
+    )
+    total_rows = models.PositiveIntegerField(default=0)
+    processed_rows = models.PositiveIntegerField(default=0)
+    created_count = models.PositiveIntegerField(default=0)
+    error_count = models.PositiveIntegerField(default=0)
+    errors = models.JSONField(
+        default=list,
+        blank=True,
+        help_text="Rejected rows as [{'line': <file line>, 'errors': {...}}].",
+    )
+    created_by = models.ForeignKey(
+        "user.User", null=True, blank=True, on_delete=models.SET_NULL
+    )
+    finished_on = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Student Import"
+        verbose_name_plural = "Student Imports"
+        ordering = ["-created_on"]
+
+    def __str__(self):
+        return f"{self.idx} ({self.get_status_display()})"
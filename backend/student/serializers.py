@@ -1,9 +1,11 @@
 # student/serializers.py
+from django.core.validators import FileExtensionValidator
 from django.db import transaction
 from rest_framework import serializers
-from student.models import Student, Custodian, StudentStatus
+from student.models import Student, Custodian, StudentStatus, StudentImport
 from course.models import CourseClass
 from course.serializers import CourseClassSerializer
+from helpers.models import Gender
 from helpers.serializers import BaseModelSerializer
 
 
@@ -117,6 +119,20 @@ class StudentCreateUpdateSerializer(BaseModelSerializer):
         read_only_fields = ["idx", "created_on"]
 
 
+class EnrolledStudentSerializer(serializers.ModelSerializer):
+    """
+    A class roster entry. Expects the student and its custodians to be
+    loaded up front (see CourseClassViewSet.enrolled_students).
+    """
+
+    student = StudentSerializer(read_only=True)
+
+    class Meta:
+        model = StudentStatus
+        fields = ["idx", "student", "status", "comment"]
+        read_only_fields = fields
+
+
 class StudentStatusSerializer(BaseModelSerializer):
     course_class = CourseClassSerializer()
     status = serializers.CharField(source="get_status_display")
@@ -160,3 +176,59 @@ class StudentUnenrollmentSerializer(serializers.Serializer):
                 "Course class with the given idx does not exist."
             )
         return value
+
+
+class StudentImportRowSerializer(serializers.Serializer):
+    """Validates one row of a student import file (see student/imports.py)."""
+
+    family_name = serializers.CharField(max_length=150)
+    first_name = serializers.CharField(max_length=150)
+    dob = serializers.DateField()
+    email = serializers.EmailField()
+    phone = serializers.CharField(max_length=64, required=False)
+    gender = serializers.ChoiceField(choices=Gender.choices, required=False)
+    custodian_name = serializers.CharField(max_length=255, required=False)
+    custodian_relation = serializers.CharField(max_length=64, required=False)
+    custodian_phone = serializers.CharField(max_length=64, required=False)
+    custodian_email = serializers.EmailField(required=False)
+
+    def to_internal_value(self, data):
+        if isinstance(data.get("gender"), str):
+            data = {**data, "gender": data["gender"].lower()}
+        return super().to_internal_value(data)
+
+    def validate(self, attrs):
+        if attrs.get("custodian_name") and not attrs.get("custodian_relation"):
+            raise serializers.ValidationError(
+                {"custodian_relation": "Required when custodian_name is given."}
+            )
+        return attrs
+
+
+class StudentImportSerializer(BaseModelSerializer):
+    status = serializers.CharField(source="get_status_display", read_only=True)
+
+    class Meta:
+        model = StudentImport
+        fields = [
+            "idx",
+            "status",
+            "total_rows",
+            "processed_rows",
+            "created_count",
+            "error_count",
+            "errors",
+            "created_on",
+            "finished_on",
+        ]
+        read_only_fields = fields
+
+
+class StudentImportCreateSerializer(BaseModelSerializer):
+    file = serializers.FileField(
+        validators=[FileExtensionValidator(allowed_extensions=["csv", "xlsx"])]
+    )
+
+    class Meta:
+        model = StudentImport
+        fields = ["file"]
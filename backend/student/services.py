@@ -1,10 +1,12 @@
 # student/services.py
+from django.db import IntegrityError, transaction
 from django.shortcuts import get_object_or_404
 
-from .models import Student, StudentStatus
+from .models import Student, StudentImport, StudentStatus
 from course.models import CourseClass
 from .choices import EnrollmentStatus
 from helpers.exceptions import VimsException
+from jobs.services import enqueue
 
 
 def assign_student_to_course_class(
@@ -67,3 +69,130 @@ def unassign_student_from_course_class(
     enrollment.save()
 
     return enrollment
+
+
+class EnrollOutcome:
+    ENROLLED = "enrolled"
+    UPDATED = "updated"
+    ALREADY_ENROLLED = "already_enrolled"
+    NOT_FOUND = "not_found"
+    DUPLICATE = "duplicate"
+
+
+# Which enrollment of a student in a class the batch updates when there
+# are several: the open one, else the latest closed one.
+_STATUS_RANK = {
+    EnrollmentStatus.CLOSED: 0,
+    EnrollmentStatus.ENQUIRED: 1,
+    EnrollmentStatus.ACTIVE: 2,
+}
+
+
+def enroll_students_in_course_class(
+    *,
+    course_class: CourseClass,
+    student_idxs: list,
+    status: str = EnrollmentStatus.ACTIVE,
+    comment: str = "",
+) -> list:
+    """
+    Enrolls many students in one CourseClass with a fixed number of queries.
+
+    Same semantics as assign_student_to_course_class per student: the
+    student's enrollment in the class is set to `status` whatever its
+    current status (a closed one is reopened, an active one can be set back
+    to enquired) and only created when there is none. Returns one
+    {"student_idx", "outcome", "enrollment_idx"} dict per requested idx.
+    """
+    if status not in [EnrollmentStatus.ACTIVE, EnrollmentStatus.ENQUIRED]:
+        raise VimsException("Status must be either ACTIVE or ENQUIRED.")
+
+    with transaction.atomic():
+        # Serializes batch enrollments into the same class so the lookup
+        # below cannot race another batch.
+        CourseClass.objects.select_for_update().filter(pk=course_class.pk).first()
+
+        students = {
+            idx: pk
+            for pk, idx in Student.objects.filter(
+                idx__in=set(student_idxs), is_obsolete=False
+            ).values_list("id", "idx")
+        }
+        existing = StudentStatus.objects.filter(
+            course_class=course_class, student_id__in=students.values()
+        )
+        current = {
+            enrollment.student_id: enrollment
+            for enrollment in sorted(
+                existing,
+                key=lambda e: (_STATUS_RANK.get(e.status, 0), e.created_on),
+            )
+        }
+
+        results, to_create, to_update, seen = [], [], [], set()
+        for idx in student_idxs:
+            result = {"student_idx": idx, "outcome": None, "enrollment_idx": None}
+            results.append(result)
+            student_id = students.get(idx)
+            if idx in seen:
+                result["outcome"] = EnrollOutcome.DUPLICATE
+                continue
+            seen.add(idx)
+            if student_id is None:
+                result["outcome"] = EnrollOutcome.NOT_FOUND
+                continue
+
+            enrollment = current.get(student_id)
+            if enrollment is None:
+                enrollment = StudentStatus(
+                    student_id=student_id,
+                    course_class=course_class,
+                    course_id=course_class.course_id,
+                    term_id=course_class.term_id,
+                    status=status,
+                    comment=comment,
+                )
+                to_create.append((result, enrollment))
+                continue
+
+            result["enrollment_idx"] = enrollment.idx
+            if enrollment.status == status:
+                result["outcome"] = EnrollOutcome.ALREADY_ENROLLED
+                if not comment:
+                    continue
+            else:
+                result["outcome"] = EnrollOutcome.UPDATED
+            enrollment.status = status
+            enrollment.course_id = course_class.course_id
+            enrollment.term_id = course_class.term_id
+            enrollment.comment = comment or enrollment.comment
+            to_update.append(enrollment)
+
+        try:
+            StudentStatus.objects.bulk_create_with_idx(
+                [enrollment for _, enrollment in to_create]
+            )
+            StudentStatus.objects.bulk_update(
+                to_update, ["status", "course", "term", "comment"]
+            )
+        except IntegrityError:
+            raise VimsException(
+                "Enrollments for this class changed while enrolling; please retry."
+            )
+
+    for result, enrollment in to_create:
+        result["outcome"] = EnrollOutcome.ENROLLED
+        result["enrollment_idx"] = enrollment.idx
+    return results
+
+
+def start_student_import(*, file, created_by=None) -> StudentImport:
+    """
+    Stores an uploaded student file and queues it for loading by the job
+    worker (see student/imports.py). Poll the returned StudentImport for
+    progress.
+    """
+    with transaction.atomic():
+        student_import = StudentImport.objects.create(file=file, created_by=created_by)
+        enqueue("student.import_students", {"import_idx": student_import.idx})
+    return student_import
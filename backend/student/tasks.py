@@ -0,0 +1,11 @@
+# student/tasks.py
+from jobs.registry import register_job
+from student.imports import run_import
+from student.models import StudentImport
+
+
+# Not atomic: run_import commits after every chunk so progress is visible
+# while it runs and a retry resumes where the last attempt stopped.
+@register_job("student.import_students", atomic=False)
+def import_students_job(*, import_idx):
+    run_import(StudentImport.objects.get(idx=import_idx))
@@ -1,3 +1,117 @@
-from django.test import TestCase
+import datetime
 
-# Create your tests here.
+from django_tenants.test.cases import TenantTestCase
+
+from course.models import Course, CourseClass, Term
+from helpers.tests.query_budgets import QueryBudgetMixin
+from student.choices import EnrollmentStatus
+from student.models import Student, StudentStatus
+from student.services import (
+    EnrollOutcome,
+    assign_student_to_course_class,
+    enroll_students_in_course_class,
+)
+
+
+class StudentQueryBudgetTests(QueryBudgetMixin, TenantTestCase):
+    def test_queries_do_not_grow_with_rows(self):
+        self.assert_query_budgets("student")
+
+
+class EnrollStudentsInCourseClassTests(TenantTestCase):
+    """
+    The batch enroll must treat each student exactly like
+    assign_student_to_course_class does.
+    """
+
+    def setUp(self):
+        term = Term.objects.create(
+            name="Term 1",
+            start_date=datetime.date(2025, 1, 1),
+            end_date=datetime.date(2025, 6, 30),
+        )
+        course = Course.objects.create(name="Course 1", code="C001")
+        self.course_class = CourseClass.objects.create(course=course, term=term, code="C001-01")
+        self.students = [
+            Student.objects.create(
+                family_name=f"Student {n}",
+                first_name="Test",
+                dob=datetime.date(2010, 1, 1),
+                email=f"student{n}@example.com",
+            )
+            for n in range(2)
+        ]
+
+    def _enroll_one(self, student, status):
+        return assign_student_to_course_class(
+            student=student, course_class_idx=self.course_class.idx, status=status
+        )
+
+    def _enroll_batch(self, student, status):
+        [result] = enroll_students_in_course_class(
+            course_class=self.course_class, student_idxs=[student.idx], status=status
+        )
+        return result
+
+    def _enrollment(self, student, status):
+        return StudentStatus.objects.create(
+            student=student,
+            course_class=self.course_class,
+            course=self.course_class.course,
+            term=self.course_class.term,
+            status=status,
+        )
+
+    def _statuses(self, student):
+        return list(
+            StudentStatus.objects.filter(
+                student=student, course_class=self.course_class
+            ).values_list("status", flat=True)
+        )
+
+    def test_creates_missing_enrollments(self):
+        student = self.students[0]
+        results = enroll_students_in_course_class(
+            course_class=self.course_class,
+            student_idxs=[student.idx, "missing", student.idx],
+        )
+
+        self.assertEqual(
+            [result["outcome"] for result in results],
+            [EnrollOutcome.ENROLLED, EnrollOutcome.NOT_FOUND, EnrollOutcome.DUPLICATE],
+        )
+        self.assertEqual(self._statuses(student), [EnrollmentStatus.ACTIVE])
+
+    def test_closed_enrollment_is_reopened(self):
+        single, batch = self.students
+        for student in self.students:
+            self._enrollment(student, EnrollmentStatus.CLOSED)
+
+        self._enroll_one(single, EnrollmentStatus.ACTIVE)
+        result = self._enroll_batch(batch, EnrollmentStatus.ACTIVE)
+
+        self.assertEqual(result["outcome"], EnrollOutcome.UPDATED)
+        self.assertEqual(self._statuses(single), [EnrollmentStatus.ACTIVE])
+        self.assertEqual(self._statuses(batch), self._statuses(single))
+
+    def test_active_enrollment_can_be_set_back_to_enquired(self):
+        single, batch = self.students
+        for student in self.students:
+            self._enrollment(student, EnrollmentStatus.ACTIVE)
+
+        self._enroll_one(single, EnrollmentStatus.ENQUIRED)
+        result = self._enroll_batch(batch, EnrollmentStatus.ENQUIRED)
+
+        self.assertEqual(result["outcome"], EnrollOutcome.UPDATED)
+        self.assertEqual(self._statuses(single), [EnrollmentStatus.ENQUIRED])
+        self.assertEqual(self._statuses(batch), self._statuses(single))
+
+    def test_same_status_is_left_alone(self):
+        student = self.students[0]
+        enrollment = self._enrollment(student, EnrollmentStatus.ACTIVE)
+
+        result = self._enroll_batch(student, EnrollmentStatus.ACTIVE)
+
+        self.assertEqual(result["outcome"], EnrollOutcome.ALREADY_ENROLLED)
+        self.assertEqual(result["enrollment_idx"], enrollment.idx)
+        self.assertEqual(self._statuses(student), [EnrollmentStatus.ACTIVE])
@@ -6,6 +6,7 @@ from . import views
 router = DefaultRouter()
 router.register(r"students", views.StudentViewSet, basename="student")
 router.register(r"custodians", views.CustodianViewSet, basename="custodian")
+router.register(r"student-imports", views.StudentImportViewSet, basename="student-import")
 
 urlpatterns = [
     path("", include(router.urls)),
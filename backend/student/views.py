@@ -3,16 +3,23 @@ from django.utils import timezone
 from django.db.models import Q
 
 from django.db.models import Prefetch
-from rest_framework import status, filters
+from rest_framework import status
 from rest_framework.decorators import action
-from rest_framework.viewsets import ModelViewSet
+from rest_framework.mixins import CreateModelMixin, ListModelMixin, RetrieveModelMixin
+from rest_framework.parsers import FormParser, MultiPartParser
+from rest_framework.viewsets import GenericViewSet, ModelViewSet
 
 from helpers.api import BaseAPIMixin
+from helpers.exports import export_response
+from helpers.policy import PolicyPermission
 from course.models import CourseInstructor
-from student.models import Student, Custodian, StudentStatus
+from student.filters import StudentSearchFilter
+from user.authentication import get_user_instance
+from student.models import Student, Custodian, StudentStatus, StudentImport
 from student.services import (
     assign_student_to_course_class,
     unassign_student_from_course_class,
+    start_student_import,
 )
 from student.serializers import (
     StudentListSerializer,
@@ -24,36 +31,38 @@ from student.serializers import (
     StudentEnrollmentSerializer,
     StudentUnenrollmentSerializer,
     EnrollmentResponseSerializer,
+    StudentImportSerializer,
+    StudentImportCreateSerializer,
 )
 
 
+STUDENT_EXPORT_COLUMNS = [
+    ("IDX", "idx"),
+    ("Family Name", "family_name"),
+    ("First Name", "first_name"),
+    ("Date of Birth", "dob"),
+    ("Email", "email"),
+    ("Phone", "phone"),
+    ("Gender", "gender"),
+    ("Created On", "created_on"),
+]
+
+
 class StudentViewSet(BaseAPIMixin, ModelViewSet):
     """
     Student CRUD plus enroll/unenroll actions.
     Views are thin: all business logic lives in services/serializers.
     """
 
-    filter_backends = [filters.SearchFilter]
-    search_fields = [
-        "first_name",
-        "family_name",
-        "email",
-        "phone",
-        "gender",
-    ]
+    permission_classes = [PolicyPermission("student")]
+    filter_backends = [StudentSearchFilter]
 
     def get_queryset(self):
-        # Prefetch the student's latest status and all custodians
-        return Student.objects.filter(is_obsolete=False).prefetch_related(
-            # Prefetch(
-            #     "statuses",
-            #     queryset=StudentStatus.objects.filter(
-            #         status=EnrollmentStatus.ACTIVE
-            #     ).order_by("-created_on"),
-            #     to_attr="active_statuses",
-            # ),
-            "custodians",  # Prefetch all custodians for the StudentSerializer
-        )
+        queryset = Student.objects.filter(is_obsolete=False)
+        if self.action == "retrieve":
+            # Only StudentSerializer (the detail view) renders custodians
+            queryset = queryset.prefetch_related("custodians")
+        return queryset
 
     def get_serializer_class(self):
         if self.action in ["create", "update", "partial_update"]:
@@ -124,6 +133,19 @@ class StudentViewSet(BaseAPIMixin, ModelViewSet):
         serializer = StudentStatusSerializer(queryset, many=True)
         return self.api_success_response(serializer.data, status=status.HTTP_200_OK)
 
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path="export",
+        permission_classes=[PolicyPermission("student", "export")],
+    )
+    def export(self, request, *args, **kwargs):
+        """
+        Streams every student (honouring ?search=) as ?file_format=csv|xlsx.
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        return export_response(request, queryset, STUDENT_EXPORT_COLUMNS, "students")
+
     @action(detail=True, methods=["get"], url_path="custodians")
     def custodians(self, request, *args, **kwargs):
         """
@@ -136,6 +158,8 @@ class StudentViewSet(BaseAPIMixin, ModelViewSet):
 
 
 class CustodianViewSet(BaseAPIMixin, ModelViewSet):
+    permission_classes = [PolicyPermission("custodian")]
+
     def get_queryset(self):
         return Custodian.objects.filter(is_obsolete=False).select_related("student")
 
@@ -143,3 +167,31 @@ class CustodianViewSet(BaseAPIMixin, ModelViewSet):
         if self.action in ["create", "update", "partial_update"]:
             return CustodianCreateUpdateSerializer
         return CustodianSerializer
+
+
+class StudentImportViewSet(
+    BaseAPIMixin, CreateModelMixin, RetrieveModelMixin, ListModelMixin, GenericViewSet
+):
+    """
+    Upload a CSV/XLSX file of students (POST) and poll its progress and
+    rejected rows (GET /<idx>/). Rows are loaded by the job worker.
+    """
+
+    permission_classes = [PolicyPermission("student")]
+    queryset = StudentImport.objects.filter(is_obsolete=False)
+    parser_classes = [MultiPartParser, FormParser]
+
+    def get_serializer_class(self):
+        if self.action == "create":
+            return StudentImportCreateSerializer
+        return StudentImportSerializer
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        student_import = start_student_import(
+            file=serializer.validated_data["file"],
+            created_by=get_user_instance(request.user),
+        )
+        response = StudentImportSerializer(student_import).data
+        return self.api_success_response(response, status=status.HTTP_202_ACCEPTED)
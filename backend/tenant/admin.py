@@ -4,17 +4,14 @@ from django import forms
 
 from tenant.models import Client, Domain
 from django.core.exceptions import PermissionDenied, ValidationError
-from user.models import User
-from institute.models import Institute
-from django_tenants.utils import schema_context
+from django.core.files.storage import default_storage
+from django_tenants.utils import get_public_schema_name
 from django.db import transaction, IntegrityError
 from django.core.validators import RegexValidator
 
-from django.utils.http import urlsafe_base64_encode
-from django.utils.encoding import force_bytes
-from user.tokens import invite_token_generator  # your token generator
 from django.conf import settings
-from user.mailers import send_director_invite  # new mailer
+from jobs.services import enqueue
+from tenant.directory import email_exists_across_tenants
 
 
 # Custom form to collect minimal data for tenant creation, including a user-defined domain.
@@ -75,6 +72,7 @@ class ClientAdmin(TenantAdminMixin, admin.ModelAdmin):
         "is_active",
         "paid_until",
         "on_trial",
+        "is_provisioned",
         "created_on",
         "modified_on",
     )
@@ -90,28 +88,6 @@ class ClientAdmin(TenantAdminMixin, admin.ModelAdmin):
     def has_delete_permission(self, request, obj=None):
         return request.user.role == "global_admin"
 
-    def _email_exists_across_tenants(email):
-        """
-        Optional helper — queries user.email across all tenant schemas.
-        WARNING: this loops tenant-by-tenant and can be slow for many tenants.
-        """
-        from tenant.models import Client  # local import
-        from django.db import connection
-
-        for client in Client.objects.all():
-            try:
-                with schema_context(client.schema_name):
-                    # Import User from tenant schema
-                    from user.models import User as TenantUser
-
-                    if TenantUser.objects.filter(email__iexact=email).exists():
-                        return True
-            except Exception:
-                # If a tenant schema is broken or migrations incomplete, skip and raise later
-                # Optionally log the exception
-                continue
-        return False
-
     def save_model(self, request, obj, form, change):
         if request.user.role != "global_admin":
             raise PermissionDenied("Only global admins can manage tenants.")
@@ -126,6 +102,8 @@ class ClientAdmin(TenantAdminMixin, admin.ModelAdmin):
         # 1) short_name/schema_name uniqueness (public schema)
         if Client.objects.filter(short_name__iexact=short_name).exists():
             raise ValidationError("Short name/schema already exists.")
+        if short_name == settings.TENANT_TEMPLATE_SCHEMA:
+            raise ValidationError("Short name is reserved.")
 
         # 2) tenant name uniqueness (public Client.name is unique)
         if Client.objects.filter(name__iexact=tenant_name).exists():
@@ -135,19 +113,20 @@ class ClientAdmin(TenantAdminMixin, admin.ModelAdmin):
         if Domain.objects.filter(domain__iexact=domain_url).exists():
             raise ValidationError("Domain already exists.")
 
-        # 4) OPTIONAL: director email uniqueness across tenants (costly)
-        # Enable this if you need email unique across all tenant users.
-        # if _email_exists_across_tenants(director_email):
-        #       raise ValidationError( "Director email already exists in another tenant.")
-        #
+        # 4) director email uniqueness across tenants (one indexed query
+        # against the public email directory)
+        if not change and email_exists_across_tenants(director_email):
+            raise ValidationError("Director email already exists in another tenant.")
 
         if not change:
             try:
                 with transaction.atomic():
                     # IMPROVEMENT: Set schema_name on the object directly for saving.
                     # The unique validation is handled by the model field.
-                    # assign schema_name and save -> this is the point migrations WILL start
+                    # The schema itself is created by the provisioning job, so the
+                    # admin request does not wait for migrations.
                     obj.schema_name = short_name
+                    obj.auto_create_schema = False
                     obj.save()
 
                     # Step 2: Create a domain for the tenant using the provided URL.
@@ -155,83 +134,76 @@ class ClientAdmin(TenantAdminMixin, admin.ModelAdmin):
                         domain=domain_url, tenant=obj, is_primary=True
                     )
 
-                    # Step 3: Switch to the new tenant's schema and set up initial data.
-                    with schema_context(obj.schema_name):
-                        # Create the detailed Institute profile with a minimal set of fields.
-                        institute = Institute.objects.create(
-                            institution_name=tenant_name,
-                            shortname=short_name,
-                            email=director_email,
-                            phone=form.cleaned_data.get("phone", ""),
-                            logo=form.cleaned_data.get("logo"),
-                            post_office_box=form.cleaned_data.get(
-                                "post_office_box", ""
-                            ),
-                            district=form.cleaned_data.get("district", ""),
-                            county=form.cleaned_data.get("county", ""),
-                            sub_county=form.cleaned_data.get("sub_county", ""),
-                            parish=form.cleaned_data.get("parish", ""),
-                            cell_village=form.cleaned_data.get("cell_village", ""),
-                            registration_number=form.cleaned_data.get(
-                                "registration_number", ""
-                            ),
-                            inst_nssf_nr=form.cleaned_data.get("inst_nssf_nr", ""),
-                            inst_paye_number=form.cleaned_data.get(
-                                "inst_paye_number", ""
-                            ),
-                            tax_flag=form.cleaned_data.get("tax_flag", False),
-                            comments=form.cleaned_data.get("comments", ""),
-                            business_year_start_date=form.cleaned_data.get(
-                                "business_year_start_date"
-                            )
-                            or "1900-01-01",
-                            business_year_end_date=form.cleaned_data.get(
-                                "business_year_end_date"
-                            ),
-                            last_year_closure_date=form.cleaned_data.get(
-                                "last_year_closure_date"
-                            )
-                            or "1900-01-01",
+                    # Step 3: Build the frontend base URL for the activation link.
+                    scheme = request.scheme if request else "https"
+                    host = request.get_host() if request else "localhost"
+                    tenant_prefix = domain_url.split(".")[0]
+
+                    if "localhost" in host:
+                        frontend_port = getattr(settings, "FRONTEND_PORT", 3000)
+                        full_host = f"{tenant_prefix}.localhost:{frontend_port}"
+                    else:
+                        full_host = f"{tenant_prefix}.{host}"
+
+                    # Step 4: Stash the uploaded logo until the schema exists.
+                    logo = form.cleaned_data.get("logo")
+                    logo_path = None
+                    if logo:
+                        logo_path = default_storage.save(
+                            f"tenants/pending/{short_name}/{logo.name}", logo
                         )
 
-                        # Step 2: Create director user with unusable password
-                        user = User.objects.create_user(
-                            email=director_email,
-                            role="director",
-                        )
-                        user.set_unusable_password()
-                        user.save()
-
-                        # Step 3: Build activation link
-                        token = invite_token_generator.make_token(user)
-                        uidb64 = urlsafe_base64_encode(force_bytes(user.idx))
-                        scheme = request.scheme if request else "https"
-                        host = request.get_host() if request else "localhost"
-
-                        if "localhost" in host:
-                            tenant_prefix = domain_url.split(".")[0]
-                            frontend_port = getattr(settings, "FRONTEND_PORT", 3000)
-                            full_host = f"{tenant_prefix}.localhost:{frontend_port}"
-                        else:
-                            tenant_prefix = domain_url.split(".")[0]
-                            full_host = f"{tenant_prefix}.{host}"
-
-                        activation_url = f"{scheme}://{full_host}/activate?uid={uidb64}&token={token}"
-
-                        # Step 4: Send invite email
-                        send_director_invite(user, institute, activation_url)
-                        # # TODO: Generate a secure, random password for the new user.
-                        # # for now we are giving a temporary password hardcoded
-                        # temp_password = "temp_password"
-
-                        # # Create the director user directly in the new tenant's schema.
-                        # User.objects.create_user(
-                        #     email=form.cleaned_data["director_email"],
-                        #     password=temp_password,
-                        #     role="director",
-                        # )
-
-                        # # TODO: Trigger email invitation to director here with temp_password.
+                    # Step 5: Queue schema creation, the Institute profile, the
+                    # director user and the invite email for the job worker.
+                    enqueue(
+                        "tenant.provision",
+                        {
+                            "client_id": obj.pk,
+                            "director_email": director_email,
+                            "logo_path": logo_path,
+                            "activation_base": f"{scheme}://{full_host}",
+                            "institute": {
+                                "institution_name": tenant_name,
+                                "shortname": short_name,
+                                "email": director_email,
+                                "phone": form.cleaned_data.get("phone", ""),
+                                "post_office_box": form.cleaned_data.get(
+                                    "post_office_box", ""
+                                ),
+                                "district": form.cleaned_data.get("district", ""),
+                                "county": form.cleaned_data.get("county", ""),
+                                "sub_county": form.cleaned_data.get("sub_county", ""),
+                                "parish": form.cleaned_data.get("parish", ""),
+                                "cell_village": form.cleaned_data.get("cell_village", ""),
+                                "registration_number": form.cleaned_data.get(
+                                    "registration_number", ""
+                                ),
+                                "inst_nssf_nr": form.cleaned_data.get("inst_nssf_nr", ""),
+                                "inst_paye_number": form.cleaned_data.get(
+                                    "inst_paye_number", ""
+                                ),
+                                "tax_flag": form.cleaned_data.get("tax_flag", False),
+                                "comments": form.cleaned_data.get("comments", ""),
+                                "business_year_start_date": form.cleaned_data.get(
+                                    "business_year_start_date"
+                                )
+                                or "1900-01-01",
+                                "business_year_end_date": form.cleaned_data.get(
+                                    "business_year_end_date"
+                                ),
+                                "last_year_closure_date": form.cleaned_data.get(
+                                    "last_year_closure_date"
+                                )
+                                or "1900-01-01",
+                            },
+                        },
+                        schema_name=get_public_schema_name(),
+                    )
+
+                self.message_user(
+                    request,
+                    "Tenant saved. Its schema, director account and invite are being set up in the background.",
+                )
 
             except IntegrityError:
                 self.message_user(
@@ -0,0 +1,49 @@
+# tenant/directory.py
+from django.db import connection
+from django_tenants.utils import get_public_schema_name
+
+from tenant.models import Client, TenantUserEmail
+from tenant.resolver import tenant_resolver
+
+
+def normalize_email(email):
+    return (email or "").strip().lower()
+
+
+def email_exists_across_tenants(email, exclude_client=None) -> bool:
+    """
+    True if any tenant already has a user with this email.
+    """
+    qs = TenantUserEmail.objects.filter(email=normalize_email(email))
+    if exclude_client is not None:
+        qs = qs.exclude(client=exclude_client)
+    return qs.exists()
+
+
+def tenants_for_email(email):
+    """
+    Returns the Clients (institutes) that have a user with this email.
+    """
+    return Client.objects.filter(user_emails__email=normalize_email(email)).distinct()
+
+
+def sync_user_email(user):
+    """
+    Records `user`'s email for the tenant the connection is set to.
+    Users of the public schema (global admins) are not indexed.
+    """
+    if connection.schema_name == get_public_schema_name():
+        return
+    TenantUserEmail.objects.update_or_create(
+        client_id=tenant_resolver.tenant_id_for(connection),
+        user_idx=user.idx,
+        defaults={"email": normalize_email(user.email)},
+    )
+
+
+def remove_user_email(user):
+    if connection.schema_name == get_public_schema_name():
+        return
+    TenantUserEmail.objects.filter(
+        client_id=tenant_resolver.tenant_id_for(connection), user_idx=user.idx
+    ).delete()
@@ -0,0 +1,152 @@
+# tenant/management/commands/migrate_tenants.py
+import json
+import multiprocessing
+import time
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from tenant.models import Client
+from tenant.provisioning import refresh_template_schema
+
+
+def _migrate_schema(schema_name):
+    """
+    Applies tenant migrations to one schema inside a pool worker.
+    Failures are reported back instead of raised so that one broken
+    tenant does not stop the rest of the rollout.
+    """
+    started = time.monotonic()
+    error = None
+    try:
+        call_command(
+            "migrate_schemas",
+            tenant=True,
+            schema_name=schema_name,
+            interactive=False,
+            verbosity=0,
+        )
+    except Exception as exc:
+        error = f"{type(exc).__name__}: {exc}"
+    finally:
+        connections.close_all()
+    return schema_name, error, time.monotonic() - started
+
+
+class Command(BaseCommand):
+    help = (
+        "Migrates tenant schemas with a pool of worker processes, retrying "
+        "failed schemas and printing per-schema timing and a summary."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=getattr(settings, "TENANT_MIGRATION_WORKERS", 4),
+            help="Number of worker processes (default: TENANT_MIGRATION_WORKERS).",
+        )
+        parser.add_argument(
+            "--retries",
+            type=int,
+            default=1,
+            help="How many times to retry schemas that failed.",
+        )
+        parser.add_argument(
+            "-s",
+            "--schema",
+            action="append",
+            dest="schemas",
+            help="Only migrate this schema. Can be given more than once.",
+        )
+        parser.add_argument(
+            "--summary-file",
+            help="Write the per-schema results as JSON to this path.",
+        )
+        # Accepted for parity with `migrate`; workers never prompt.
+        parser.add_argument("--noinput", "--no-input", action="store_true")
+
+    def get_schemas(self, options):
+        if options["schemas"]:
+            return options["schemas"]
+        return list(
+            Client.objects.provisioned()
+            .order_by("schema_name")
+            .values_list("schema_name", flat=True)
+        )
+
+    def handle(self, *args, **options):
+        if not options["schemas"]:
+            # Keep the schema new tenants are cloned from in step with the rest.
+            template = refresh_template_schema()
+            if template:
+                self.stdout.write(f"Template schema '{template}' is up to date.")
+
+        schemas = self.get_schemas(options)
+        if not schemas:
+            self.stdout.write("No tenant schemas to migrate.")
+            return
+
+        workers = max(1, options["workers"])
+        self.stdout.write(
+            f"Migrating {len(schemas)} tenant schema(s) with {workers} worker(s)..."
+        )
+
+        # Workers are forked from this process and must not share its socket.
+        connections.close_all()
+        context = multiprocessing.get_context("fork")
+
+        results = {}
+        pending = schemas
+        started = time.monotonic()
+
+        for attempt in range(1, options["retries"] + 2):
+            if not pending:
+                break
+            if attempt > 1:
+                self.stdout.write(
+                    self.style.WARNING(
+                        f"Retrying {len(pending)} failed schema(s) (attempt {attempt})..."
+                    )
+                )
+
+            failed = []
+            with context.Pool(processes=min(workers, len(pending))) as pool:
+                outcomes = pool.imap_unordered(_migrate_schema, pending)
+                for done, (schema_name, error, elapsed) in enumerate(outcomes, 1):
+                    results[schema_name] = {
+                        "status": "failed" if error else "ok",
+                        "seconds": round(elapsed, 2),
+                        "attempts": attempt,
+                        "error": error,
+                    }
+                    progress = f"[{done}/{len(pending)}] {schema_name} ({elapsed:.1f}s)"
+                    if error:
+                        failed.append(schema_name)
+                        self.stdout.write(self.style.ERROR(f"{progress} failed: {error}"))
+                    else:
+                        self.stdout.write(self.style.SUCCESS(f"{progress} ok"))
+            pending = failed
+
+        total = time.monotonic() - started
+        succeeded = len(schemas) - len(pending)
+        self.stdout.write(
+            f"Migrated {succeeded}/{len(schemas)} schema(s) in {total:.1f}s."
+        )
+
+        if options["summary_file"]:
+            summary = {
+                "total_seconds": round(total, 2),
+                "succeeded": succeeded,
+                "failed": pending,
+                "schemas": results,
+            }
+            with open(options["summary_file"], "w") as fh:
+                json.dump(summary, fh, indent=2)
+
+        if pending:
+            raise CommandError(
+                f"{len(pending)} schema(s) failed to migrate: {', '.join(pending)}"
+            )
@@ -0,0 +1,26 @@
+# tenant/management/commands/rebuild_email_directory.py
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django_tenants.utils import schema_context
+
+from tenant.directory import normalize_email
+from tenant.models import Client, TenantUserEmail
+from user.models import User
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the public-schema email directory from every tenant's users."
+
+    def handle(self, *args, **options):
+        clients = Client.objects.provisioned()
+        for client in clients:
+            with schema_context(client.schema_name):
+                users = list(User.objects.values_list("idx", "email"))
+
+            with transaction.atomic():
+                TenantUserEmail.objects.filter(client=client).delete()
+                TenantUserEmail.objects.bulk_create_with_idx(
+                    TenantUserEmail(client=client, user_idx=idx, email=normalize_email(email))
+                    for idx, email in users
+                )
+            self.stdout.write(f"{client.schema_name}: {len(users)} email(s)")
@@ -0,0 +1,18 @@
+# tenant/management/commands/refresh_tenant_template.py
+from django.core.management.base import BaseCommand
+
+from tenant.provisioning import refresh_template_schema
+
+
+class Command(BaseCommand):
+    help = (
+        "Creates or migrates the template schema that new tenants are cloned "
+        "from (TENANT_TEMPLATE_SCHEMA)."
+    )
+
+    def handle(self, *args, **options):
+        template = refresh_template_schema(verbosity=options["verbosity"])
+        if template is None:
+            self.stdout.write("TENANT_TEMPLATE_SCHEMA is empty; nothing to do.")
+            return
+        self.stdout.write(self.style.SUCCESS(f"Template schema '{template}' is up to date."))
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.5 on 2026-10-18 15:06
+
+import django.db.models.deletion
+import helpers.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tenant', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TenantUserEmail',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('idx', helpers.fields.IDXField(blank=True, editable=False, length=8, max_length=16, unique=True)),
+                ('created_on', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('modified_on', models.DateTimeField(auto_now=True, db_index=True)),
+                ('is_obsolete', models.BooleanField(default=False)),
+                ('meta', models.JSONField(blank=True, default=dict)),
+                ('user_idx', models.CharField(max_length=16)),
+                ('email', models.CharField(db_index=True, max_length=254)),
+                ('client', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='user_emails', to='tenant.client')),
+            ],
+            options={
+                'verbose_name': 'Tenant User Email',
+                'verbose_name_plural': 'Tenant User Emails',
+                'constraints': [models.UniqueConstraint(fields=('client', 'user_idx'), name='unique_user_per_client')],
+            },
+        ),
+    ]
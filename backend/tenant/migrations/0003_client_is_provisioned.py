@@ -0,0 +1,29 @@
+# Generated by Django 5.2.5 on 2026-10-18 15:39
+
+from django.db import migrations, models
+
+
+def mark_existing_schemas(apps, schema_editor):
+    # Tenants created before the flag existed are provisioned if their
+    # schema is there.
+    Client = apps.get_model("tenant", "Client")
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT nspname FROM pg_namespace")
+        existing = [row[0] for row in cursor.fetchall()]
+    Client.objects.filter(schema_name__in=existing).update(is_provisioned=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tenant', '0002_tenantuseremail'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='client',
+            name='is_provisioned',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.RunPython(mark_existing_schemas, migrations.RunPython.noop),
+    ]
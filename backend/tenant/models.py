@@ -1,6 +1,23 @@
 from django.db import models
 from django_tenants.models import TenantMixin, DomainMixin
-from helpers.models import BaseModel
+from django_tenants.postgresql_backend.base import _check_schema_name
+from django_tenants.utils import get_public_schema_name, schema_exists
+from helpers.models import BaseModel, BaseModelQuerySet
+from tenant.provisioning import clone_template_schema, template_is_ready
+
+
+class ClientQuerySet(BaseModelQuerySet):
+    def provisioned(self):
+        """
+        Tenants whose schema has been created and migrated, the public
+        schema excluded. Loops over tenant schemas should start here.
+        """
+        return self.filter(is_provisioned=True).exclude(
+            schema_name=get_public_schema_name()
+        )
+
+
+ClientManager = models.Manager.from_queryset(ClientQuerySet)
 
 
 class Client(TenantMixin, BaseModel):
@@ -15,12 +32,63 @@ class Client(TenantMixin, BaseModel):
     # Subscription fields
     paid_until = models.DateField(null=True, blank=True)
     on_trial = models.BooleanField(default=False)
+    # False until the schema exists and is migrated (see mark_provisioned).
+    is_provisioned = models.BooleanField(default=False)
 
     auto_create_schema = True
 
+    objects = ClientManager()
+
     def __str__(self):
         return self.name
 
+    def mark_provisioned(self):
+        Client.objects.filter(pk=self.pk).update(is_provisioned=True)
+        self.is_provisioned = True
+
+    def create_schema(self, check_if_exists=False, sync_schema=True, verbosity=1):
+        """
+        Clones the pre-migrated template schema when it is available so that
+        onboarding only runs migrations newer than the template. Falls back
+        to django-tenants' migrate-from-scratch otherwise.
+        """
+        if not (sync_schema and template_is_ready()):
+            return super().create_schema(check_if_exists, sync_schema, verbosity)
+
+        # Same validation as TenantMixin.create_schema before any SQL runs.
+        _check_schema_name(self.schema_name)
+        if check_if_exists and schema_exists(self.schema_name):
+            return False
+
+        clone_template_schema(self.schema_name, verbosity=verbosity)
+        return True
+
 
 class Domain(DomainMixin, BaseModel):
     pass
+
+
+class TenantUserEmail(BaseModel):
+    """
+    Public-schema directory of every tenant user's normalized email.
+    Kept in sync by user/signals.py so cross-tenant lookups are one
+    indexed query instead of a loop over every schema.
+    """
+
+    client = models.ForeignKey(
+        Client, on_delete=models.CASCADE, related_name="user_emails"
+    )
+    user_idx = models.CharField(max_length=16)
+    email = models.CharField(max_length=254, db_index=True)
+
+    class Meta:
+        verbose_name = "Tenant User Email"
+        verbose_name_plural = "Tenant User Emails"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["client", "user_idx"], name="unique_user_per_client"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.email} ({self.client_id})"
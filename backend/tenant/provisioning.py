@@ -0,0 +1,93 @@
+# tenant/provisioning.py
+from django.conf import settings
+from django.core.management import call_command
+from django.db import connection
+from django_tenants.clone import CloneSchema
+from django_tenants.utils import schema_exists
+
+
+def get_template_schema_name():
+    """
+    Name of the pre-migrated schema new tenants are cloned from.
+    An empty TENANT_TEMPLATE_SCHEMA disables cloning.
+    """
+    return getattr(settings, "TENANT_TEMPLATE_SCHEMA", "")
+
+
+def template_is_ready():
+    """
+    True when the template schema and django-tenants' clone_schema() SQL
+    function both exist, i.e. `refresh_tenant_template` has been run at
+    least once. The function is matched on its schema and signature
+    (source text, dest text, VARIADIC public.cloneparms[]), so an unrelated
+    clone_schema() elsewhere does not count.
+    """
+    template = get_template_schema_name()
+    if not template:
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT EXISTS (SELECT 1 FROM pg_namespace WHERE nspname = %s)"
+            " AND EXISTS ("
+            "  SELECT 1 FROM pg_proc p"
+            "  JOIN pg_namespace n ON n.oid = p.pronamespace"
+            "  JOIN pg_type t ON t.oid = p.proargtypes[2]"
+            "  WHERE n.nspname = 'public' AND p.proname = 'clone_schema'"
+            "  AND p.pronargs = 3 AND p.provariadic <> 0"
+            "  AND p.proargtypes[0] = 'text'::regtype"
+            "  AND p.proargtypes[1] = 'text'::regtype"
+            "  AND t.typname = '_cloneparms'"
+            ")",
+            [template],
+        )
+        return cursor.fetchone()[0]
+
+
+def refresh_template_schema(verbosity=0):
+    """
+    Creates the template schema if needed, installs the clone_schema()
+    function and applies any pending tenant migrations to the template.
+    Must run outside of a transaction (e.g. from a management command).
+    """
+    template = get_template_schema_name()
+    if not template:
+        return None
+
+    connection.set_schema_to_public()
+    if not schema_exists(template):
+        with connection.cursor() as cursor:
+            cursor.execute(f"CREATE SCHEMA {connection.ops.quote_name(template)}")
+    CloneSchema()._create_clone_schema_function()
+
+    call_command(
+        "migrate_schemas",
+        tenant=True,
+        schema_name=template,
+        interactive=False,
+        verbosity=verbosity,
+    )
+    connection.set_schema_to_public()
+    return template
+
+
+def clone_template_schema(schema_name, verbosity=1):
+    """
+    Creates `schema_name` as a copy of the template schema (tables, indexes
+    and the django_migrations rows), then applies only the migrations that
+    are newer than the template. Safe to call inside an atomic block.
+    """
+    connection.set_schema_to_public()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT public.clone_schema(%s, %s, %s)",
+            [get_template_schema_name(), schema_name, "DATA"],
+        )
+
+    call_command(
+        "migrate_schemas",
+        tenant=True,
+        schema_name=schema_name,
+        interactive=False,
+        verbosity=verbosity,
+    )
+    connection.set_schema_to_public()
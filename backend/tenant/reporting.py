@@ -0,0 +1,174 @@
+# tenant/reporting.py
+"""
+Platform-wide reports for global admins.
+
+A report is a SQL template run against many tenant schemas. `{schema}` is
+replaced by the quoted schema name and `{<app_model>}` by that model's table,
+so every table reference is schema-qualified and no search_path switching is
+needed. Schemas are combined either as one UNION ALL per chunk of schemas
+("union") or queried concurrently by a bounded thread pool ("pool").
+
+A report missing any schema's rows is never cached: in "union" mode the
+failing query aborts the report, in "pool" mode the other schemas' rows are
+streamed and IncompleteReportError is raised after them.
+"""
+import hashlib
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, connections
+
+from helpers.exceptions import VimsException
+from tenant.models import Client
+
+logger = logging.getLogger(__name__)
+
+
+REPORTS = {
+    "students_per_institute": {
+        "columns": ["students"],
+        "sql": "SELECT COUNT(*) AS students FROM {schema}.{student_student}"
+        " WHERE NOT is_obsolete",
+    },
+    "active_enrollments_per_term": {
+        "columns": ["term", "active_enrollments"],
+        "sql": "SELECT t.name AS term, COUNT(*) AS active_enrollments"
+        " FROM {schema}.{student_studentstatus} s"
+        " JOIN {schema}.{course_term} t ON t.id = s.term_id"
+        " WHERE s.status = 'active'"
+        " GROUP BY t.name",
+    },
+    "employees_per_role": {
+        "columns": ["role", "employees"],
+        "sql": "SELECT u.role, COUNT(*) AS employees"
+        " FROM {schema}.{employee_employee} e"
+        " JOIN {schema}.{user_user} u ON u.id = e.user_id"
+        " WHERE NOT e.is_obsolete"
+        " GROUP BY u.role",
+    },
+}
+
+
+class IncompleteReportError(VimsException):
+    """Raised after the last row of a report some schemas failed to answer."""
+
+    error_key = "report_incomplete"
+
+    def __init__(self, failed_schemas):
+        self.failed_schemas = failed_schemas
+        super().__init__(f"Report queries failed for: {', '.join(failed_schemas)}")
+
+
+def _table_names():
+    return {
+        f"{model._meta.app_label}_{model._meta.model_name}": connection.ops.quote_name(
+            model._meta.db_table
+        )
+        for model in apps.get_models()
+    }
+
+
+def _render(sql, schema_name, tables):
+    return sql.format(schema=connection.ops.quote_name(schema_name), **tables)
+
+
+def _tenant_schemas(schemas=None):
+    qs = Client.objects.provisioned()
+    if schemas:
+        qs = qs.filter(schema_name__in=schemas)
+    return list(qs.order_by("schema_name").values_list("schema_name", flat=True))
+
+
+def _iter_union(report, schemas):
+    """
+    One UNION ALL query per chunk of REPORT_UNION_CHUNK schemas, read
+    through a server-side cursor so rows stream instead of being buffered.
+    """
+    tables = _table_names()
+    chunk = settings.REPORT_UNION_CHUNK
+    for start in range(0, len(schemas), chunk):
+        batch = schemas[start : start + chunk]
+        sql = " UNION ALL ".join(
+            f"SELECT %s::text AS schema_name, q.* FROM ({_render(report['sql'], schema, tables)}) q"
+            for schema in batch
+        )
+        with connection.chunked_cursor() as cursor:
+            cursor.execute(sql, batch)
+            while True:
+                rows = cursor.fetchmany(settings.REPORT_FETCH_SIZE)
+                if not rows:
+                    break
+                yield from rows
+
+
+def _query_schema(sql, schema_name):
+    # Runs in a pool thread, which gets its own database connection.
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(sql)
+            return schema_name, [(schema_name, *row) for row in cursor.fetchall()]
+    finally:
+        connections.close_all()
+
+
+def _iter_pool(report, schemas):
+    """
+    Queries each schema on its own connection, at most REPORT_WORKERS at a
+    time, yielding rows as schemas finish. A failing schema is logged and
+    does not stop the others; IncompleteReportError names the failed schemas
+    once every other row is out.
+    """
+    tables = _table_names()
+    failed = []
+    with ThreadPoolExecutor(max_workers=settings.REPORT_WORKERS) as pool:
+        futures = {
+            pool.submit(_query_schema, _render(report["sql"], schema, tables), schema): schema
+            for schema in schemas
+        }
+        for future in as_completed(futures):
+            try:
+                _schema, rows = future.result()
+            except Exception:
+                logger.exception("Report query failed for schema %s", futures[future])
+                failed.append(futures[future])
+                continue
+            yield from rows
+    if failed:
+        raise IncompleteReportError(sorted(failed))
+
+
+def report_columns(name):
+    return ["schema_name"] + REPORTS[name]["columns"]
+
+
+def run_report(name, schemas=None, mode="union", refresh=False):
+    """
+    Streams the rows of report `name` across tenant schemas as tuples of
+    (schema_name, *columns). Complete results are cached for
+    REPORT_CACHE_TTL seconds; pass refresh=True to bypass the cache. Raises
+    IncompleteReportError after the rows when some schemas failed.
+    """
+    if name not in REPORTS:
+        raise KeyError(f"Unknown report '{name}'.")
+    if mode not in ("union", "pool"):
+        raise ValueError("mode must be 'union' or 'pool'.")
+
+    schemas = _tenant_schemas(schemas)
+    digest = hashlib.sha1(",".join(schemas).encode()).hexdigest()
+    cache_key = f"report:{name}:{digest}"
+
+    if not refresh:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            yield from cached
+            return
+
+    iterator = _iter_union if mode == "union" else _iter_pool
+    rows = []
+    for row in iterator(REPORTS[name], schemas):
+        rows.append(tuple(row))
+        yield row
+    cache.set(cache_key, rows, settings.REPORT_CACHE_TTL)
@@ -0,0 +1,125 @@
+# tenant/resolver.py
+import copy
+import threading
+import time
+
+from django.conf import settings
+
+
+class TenantResolver:
+    """
+    Process-local cache of hostname -> (Client, schema_name).
+
+    Used by CachedTenantMainMiddleware so that mapping a request host to its
+    tenant does not cost a public-schema round trip on every request. Every
+    caller gets its own copy of the cached Client, because the middleware
+    sets attributes on it and attaches it to the thread's connection.
+    Entries expire after TENANT_CACHE_TTL seconds and are dropped explicitly
+    when a Client or Domain row changes (see tenant/signals.py). Other worker
+    processes only see such changes once their own entries expire.
+    """
+
+    def __init__(self, ttl=None):
+        self._ttl = ttl
+        self._entries = {}
+        self._tenant_ids = {}
+        self._lock = threading.Lock()
+        # Bumped on every invalidation so a lookup that raced with it
+        # does not put a stale tenant back into the cache.
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def ttl(self):
+        if self._ttl is not None:
+            return self._ttl
+        return getattr(settings, "TENANT_CACHE_TTL", 300)
+
+    def resolve(self, domain_model, hostname):
+        """
+        Returns the tenant for `hostname`, querying the Domain table only on
+        a cache miss. Raises domain_model.DoesNotExist like the stock lookup.
+        """
+        now = time.monotonic()
+        entry = self._entries.get(hostname)
+        if entry is not None and entry[2] > now:
+            with self._lock:
+                self.hits += 1
+            return copy.copy(entry[0])
+
+        generation = self._generation
+        domain = domain_model.objects.select_related("tenant").get(domain=hostname)
+        tenant = domain.tenant
+
+        with self._lock:
+            self.misses += 1
+            if generation == self._generation:
+                self._entries[hostname] = (tenant, tenant.schema_name, now + self.ttl)
+                self._tenant_ids[tenant.schema_name] = tenant.pk
+        return copy.copy(tenant)
+
+    def tenant_id_for(self, connection):
+        """
+        Returns the Client id of the schema `connection` is set to.
+
+        Uses the tenant attached by set_tenant() when it is a real Client,
+        otherwise (schema_context() only attaches a FakeTenant) looks the id
+        up once per schema and remembers it. Raises Client.DoesNotExist.
+        """
+        from tenant.models import Client
+
+        schema_name = connection.schema_name
+        tenant = getattr(connection, "tenant", None)
+        if isinstance(tenant, Client) and tenant.schema_name == schema_name:
+            return tenant.pk
+
+        tenant_id = self._tenant_ids.get(schema_name)
+        if tenant_id is not None:
+            return tenant_id
+
+        generation = self._generation
+        tenant_id = (
+            Client.objects.filter(schema_name=schema_name)
+            .values_list("id", flat=True)
+            .get()
+        )
+        with self._lock:
+            if generation == self._generation:
+                self._tenant_ids[schema_name] = tenant_id
+        return tenant_id
+
+    def invalidate(self, hostname=None, tenant_id=None):
+        """
+        Drops cached entries for a hostname and/or every hostname that maps
+        to the given tenant primary key.
+        """
+        with self._lock:
+            self._generation += 1
+            if hostname is not None:
+                self._entries.pop(hostname, None)
+            if tenant_id is not None:
+                for key, (tenant, _schema, _expires) in list(self._entries.items()):
+                    if tenant.pk == tenant_id:
+                        del self._entries[key]
+                for schema_name, cached_id in list(self._tenant_ids.items()):
+                    if cached_id == tenant_id:
+                        del self._tenant_ids[schema_name]
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._tenant_ids.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "ttl": self.ttl,
+            }
+
+
+tenant_resolver = TenantResolver()
@@ -0,0 +1,27 @@
+# tenant/signals.py
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from django_tenants.models import TenantMixin
+from django_tenants.signals import post_schema_sync
+
+from tenant.models import Client, Domain
+from tenant.resolver import tenant_resolver
+
+
+@receiver(post_save, sender=Client)
+@receiver(post_delete, sender=Client)
+def invalidate_client_cache(sender, instance, **kwargs):
+    tenant_resolver.invalidate(tenant_id=instance.pk)
+
+
+@receiver(post_save, sender=Domain)
+@receiver(post_delete, sender=Domain)
+def invalidate_domain_cache(sender, instance, **kwargs):
+    # Also drop by tenant so a renamed domain does not keep its old hostname.
+    tenant_resolver.invalidate(hostname=instance.domain, tenant_id=instance.tenant_id)
+
+
+@receiver(post_schema_sync, sender=TenantMixin)
+def mark_client_provisioned(sender, tenant, **kwargs):
+    # Sent when Client.save() created the schema itself (auto_create_schema).
+    tenant.mark_provisioned()
@@ -0,0 +1,63 @@
+# tenant/tasks.py
+import os
+
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.db import connection
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+from django_tenants.utils import schema_context
+
+from institute.models import Institute
+from jobs.registry import register_job
+from jobs.services import enqueue
+from tenant.models import Client
+from user.models import User
+from user.tokens import invite_token_generator
+
+
+@register_job("tenant.provision")
+def provision_tenant(*, client_id, director_email, institute, logo_path=None, activation_base):
+    """
+    Creates the tenant schema, the Institute profile and the director user,
+    then queues the director invite. Safe to retry: every step skips work
+    that a previous attempt already finished.
+    """
+    client = Client.objects.get(pk=client_id)
+    if client.create_schema(check_if_exists=True) is False:
+        # The schema exists from an earlier attempt; finish its migrations.
+        call_command(
+            "migrate_schemas",
+            tenant=True,
+            schema_name=client.schema_name,
+            interactive=False,
+            verbosity=0,
+        )
+    client.mark_provisioned()
+
+    with schema_context(client.schema_name):
+        profile = Institute.objects.first()
+        if profile is None:
+            profile = Institute(**institute)
+            if logo_path:
+                with default_storage.open(logo_path) as fh:
+                    profile.logo.save(os.path.basename(logo_path), File(fh), save=False)
+            profile.save()
+            if logo_path:
+                default_storage.delete(logo_path)
+
+        user = User.objects.filter(email__iexact=director_email).first()
+        if user is None:
+            user = User.objects.create_user(email=director_email, role="director")
+            user.set_unusable_password()
+            user.save()
+
+        token = invite_token_generator.make_token(user)
+        uidb64 = urlsafe_base64_encode(force_bytes(user.idx))
+        activation_url = f"{activation_base}/activate?uid={uidb64}&token={token}"
+        enqueue(
+            "user.send_director_invite",
+            {"user_idx": user.idx, "activation_url": activation_url},
+            schema_name=connection.schema_name,
+        )
@@ -1,3 +1,150 @@
-from django.test import TestCase
+from types import SimpleNamespace
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.exceptions import PermissionDenied
+from django.http import Http404
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from django_tenants.test.cases import TenantTestCase
+from django_tenants.utils import get_public_schema_name, schema_context
+
+from helpers.metrics import request_metrics
+from tenant.models import Client
+from tenant.reporting import IncompleteReportError, _tenant_schemas, run_report
+from tenant.resolver import TenantResolver
+from tenant.views import metrics
+
+
+class ProvisionedClientTests(TenantTestCase):
+    """
+    Clients saved by the admin only get their schema from the provisioning
+    job; loops over tenant schemas must not see them before that.
+    """
+
+    def setUp(self):
+        with schema_context(get_public_schema_name()):
+            self.pending = Client(
+                schema_name="pending", name="Pending", short_name="pending"
+            )
+            self.pending.auto_create_schema = False
+            self.pending.save()
+
+    def provisioned_schemas(self):
+        with schema_context(get_public_schema_name()):
+            return list(
+                Client.objects.provisioned().values_list("schema_name", flat=True)
+            )
+
+    def test_only_provisioned_schemas_are_listed(self):
+        schemas = self.provisioned_schemas()
+
+        self.assertIn(self.tenant.schema_name, schemas)
+        self.assertNotIn("pending", schemas)
+        self.assertNotIn(get_public_schema_name(), schemas)
+
+        self.pending.mark_provisioned()
+        self.assertIn("pending", self.provisioned_schemas())
+
+    def test_reports_cover_provisioned_schemas_only(self):
+        with schema_context(get_public_schema_name()):
+            self.assertEqual(_tenant_schemas(), [self.tenant.schema_name])
+
+
+class TenantResolverTests(SimpleTestCase):
+    def setUp(self):
+        self.lookups = 0
+        self.resolver = TenantResolver(ttl=60)
+
+        def get(domain):
+            self.lookups += 1
+            return SimpleNamespace(tenant=Client(id=1, schema_name="tenant1", name="Tenant 1"))
+
+        self.domain_model = SimpleNamespace(
+            objects=SimpleNamespace(select_related=lambda *fields: SimpleNamespace(get=get))
+        )
+
+    def test_every_request_gets_its_own_client(self):
+        first = self.resolver.resolve(self.domain_model, "tenant1.example.com")
+        # What TenantMainMiddleware does with the tenant it gets.
+        first.domain_url = "changed.example.com"
+        second = self.resolver.resolve(self.domain_model, "tenant1.example.com")
+
+        self.assertEqual(self.lookups, 1)
+        self.assertIsNot(first, second)
+        self.assertIsNot(first._state, second._state)
+        self.assertEqual(second.schema_name, "tenant1")
+        self.assertNotEqual(getattr(second, "domain_url", None), "changed.example.com")
+
+
+class IncompleteReportTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.failing = {"tenant2"}
+        patches = [
+            mock.patch(
+                "tenant.reporting._tenant_schemas", return_value=["tenant1", "tenant2"]
+            ),
+            mock.patch("tenant.reporting._query_schema", side_effect=self.query_schema),
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def query_schema(self, sql, schema_name):
+        if schema_name in self.failing:
+            raise RuntimeError("relation does not exist")
+        return schema_name, [(schema_name, 3)]
+
+    def test_failed_schemas_are_raised_after_the_other_rows(self):
+        rows = []
+        with self.assertLogs("tenant.reporting", "ERROR"):
+            with self.assertRaises(IncompleteReportError) as raised:
+                for row in run_report("students_per_institute", mode="pool"):
+                    rows.append(row)
+
+        self.assertEqual(rows, [("tenant1", 3)])
+        self.assertEqual(raised.exception.failed_schemas, ["tenant2"])
+
+    def test_incomplete_report_is_not_cached(self):
+        with self.assertLogs("tenant.reporting", "ERROR"):
+            with self.assertRaises(IncompleteReportError):
+                list(run_report("students_per_institute", mode="pool"))
+
+        self.failing.clear()
+        rows = list(run_report("students_per_institute", mode="pool"))
+        self.assertCountEqual(rows, [("tenant1", 3), ("tenant2", 3)])
+
+
+class MetricsViewTests(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        request_metrics.clear()
+        self.addCleanup(request_metrics.clear)
+
+    def get(self, token=None):
+        headers = {"Authorization": f"Bearer {token}"} if token else {}
+        return metrics(self.factory.get("/metrics/", headers=headers))
+
+    @override_settings(METRICS_TOKEN="")
+    def test_disabled_without_a_token(self):
+        with self.assertRaises(Http404):
+            self.get("anything")
+
+    @override_settings(METRICS_TOKEN="s3cret")
+    def test_requires_the_bearer_token(self):
+        with self.assertRaises(PermissionDenied):
+            self.get()
+        with self.assertRaises(PermissionDenied):
+            self.get("wrong")
+
+    @override_settings(METRICS_TOKEN="s3cret")
+    def test_serves_prometheus_text(self):
+        request_metrics.observe("t1", "courses-list", duration=0.1, db_duration=0.05, queries=2)
+
+        response = self.get("s3cret")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain; version=0.0.4"))
+        body = response.content.decode()
+        self.assertIn('vims_request_duration_seconds_count{schema="t1",view="courses-list"} 1', body)
+        self.assertIn("# TYPE vims_tenant_cache_hits_total counter", body)
@@ -1,3 +1,119 @@
-from django.shortcuts import render
+# tenant/views.py
+import csv
+import json
 
-# Create your views here.
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
+from django.core.exceptions import PermissionDenied
+from django.http import Http404, HttpResponse, JsonResponse, StreamingHttpResponse
+from django.utils.crypto import constant_time_compare
+
+from helpers.exports import Echo
+from helpers.metrics import render_metric, request_metrics, throttled_requests
+from tenant.reporting import REPORTS, IncompleteReportError, report_columns, run_report
+from tenant.resolver import tenant_resolver
+
+
+@staff_member_required
+def tenant_cache_stats(request):
+    """
+    Hit/miss counters of this process's tenant resolution cache.
+    Only reachable on the public schema by global admins.
+    """
+    if request.user.role != "global_admin":
+        raise PermissionDenied("Only global admins can view tenant cache stats.")
+    return JsonResponse(tenant_resolver.stats())
+
+
+def metrics(request):
+    """
+    This process's request histograms, throttle and tenant cache counters in the
+    Prometheus text format. Scrapers authenticate with METRICS_TOKEN.
+    """
+    token = settings.METRICS_TOKEN
+    if not token:
+        raise Http404("Metrics are disabled.")
+    scheme, _, credentials = request.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not constant_time_compare(credentials, token):
+        raise PermissionDenied("Invalid metrics token.")
+
+    stats = tenant_resolver.stats()
+    lines = request_metrics.render() + throttled_requests.render()
+    lines += render_metric(
+        "vims_tenant_cache_hits_total",
+        "Tenant lookups served from the resolver cache.",
+        "counter",
+        stats["hits"],
+    )
+    lines += render_metric(
+        "vims_tenant_cache_misses_total",
+        "Tenant lookups that queried the Domain table.",
+        "counter",
+        stats["misses"],
+    )
+    lines += render_metric(
+        "vims_tenant_cache_size",
+        "Hostnames currently in the resolver cache.",
+        "gauge",
+        stats["size"],
+    )
+    return HttpResponse(
+        "\n".join(lines) + "\n", content_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
+@staff_member_required
+def platform_report(request, name):
+    """
+    Streams a cross-tenant report as CSV or newline-delimited JSON.
+    Query params: format=csv|json, mode=union|pool, refresh=1,
+    schema=<name> (repeatable) to limit the tenants. When some schemas
+    failed, the stream ends with a failed_schemas record naming them.
+    """
+    if request.user.role != "global_admin":
+        raise PermissionDenied("Only global admins can run platform reports.")
+    if name not in REPORTS:
+        raise Http404("Unknown report.")
+
+    mode = request.GET.get("mode", "union")
+    if mode not in ("union", "pool"):
+        return JsonResponse({"detail": "mode must be 'union' or 'pool'."}, status=400)
+
+    rows = run_report(
+        name,
+        schemas=request.GET.getlist("schema") or None,
+        mode=mode,
+        refresh=request.GET.get("refresh") == "1",
+    )
+    columns = report_columns(name)
+
+    if request.GET.get("format") == "csv":
+        response = StreamingHttpResponse(
+            _csv_lines(columns, rows), content_type="text/csv"
+        )
+        response["Content-Disposition"] = f'attachment; filename="{name}.csv"'
+        return response
+
+    return StreamingHttpResponse(
+        _json_lines(columns, rows), content_type="application/x-ndjson"
+    )
+
+
+def _csv_lines(columns, rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow(columns)
+    try:
+        for row in rows:
+            yield writer.writerow(row)
+    except IncompleteReportError as exc:
+        # The 200 is long sent; end with a record that names the gaps rather
+        # than passing for a complete report.
+        yield writer.writerow(["failed_schemas", *exc.failed_schemas])
+
+
+def _json_lines(columns, rows):
+    try:
+        for row in rows:
+            yield json.dumps(dict(zip(columns, row)), default=str) + "\n"
+    except IncompleteReportError as exc:
+        yield json.dumps({"failed_schemas": exc.failed_schemas}) + "\n"
@@ -0,0 +1,130 @@
+# user/authentication.py
+"""
+Stateless JWT authentication.
+
+Access tokens issued by TenantTokenObtainPairSerializer carry the user's
+role, is_active and schema as claims, so StatelessJWTAuthentication can
+authorize a request without loading the User row. Tokens of a user whose
+role or is_active changes, or who is deleted, are rejected for as long as
+they can live through the revocation cache below; the next refresh
+re-reads the claims from the database.
+
+Revocations only reach other processes through a shared cache. With a
+per-process cache (no REDIS_URL) every request loads the User row instead.
+"""
+import time
+
+from django.core.cache import cache
+from django.db import connection
+from django.utils.functional import cached_property
+from rest_framework_simplejwt.authentication import (
+    JWTAuthentication,
+    JWTStatelessUserAuthentication,
+)
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+
+from helpers.cache import cache_is_shared
+from user.models import User
+
+ACCESS_CLAIMS = ("role", "is_active", "schema")
+
+
+def set_access_claims(token, user):
+    token["role"] = user.role
+    token["is_active"] = user.is_active
+    token["schema"] = connection.schema_name
+    return token
+
+
+def _revocation_key(user_idx):
+    # The cache key function already namespaces keys by tenant schema.
+    return f"revoked-user:{user_idx}"
+
+
+def revoke_user_tokens(*user_idxs):
+    """Rejects every access token issued to the users until now."""
+    timeout = int(api_settings.ACCESS_TOKEN_LIFETIME.total_seconds())
+    now = int(time.time())
+    cache.set_many({_revocation_key(idx): now for idx in user_idxs}, timeout=timeout)
+
+
+def is_revoked(user_idx, issued_at):
+    revoked_at = cache.get(_revocation_key(user_idx))
+    return revoked_at is not None and (issued_at is None or issued_at <= revoked_at)
+
+
+class TenantTokenUser(TokenUser):
+    """
+    request.user under StatelessJWTAuthentication. idx, role and is_active
+    come from the token, with the same role helpers as User; any other
+    attribute loads the User row on first use (see `instance`).
+    """
+
+    is_global_admin = User.is_global_admin
+    is_tenant_admin = User.is_tenant_admin
+    is_director = User.is_director
+    is_accountant = User.is_accountant
+    is_instructor = User.is_instructor
+    is_student = User.is_student
+    is_employee = User.is_employee
+
+    def __str__(self):
+        return self.idx
+
+    @cached_property
+    def idx(self):
+        return self.id
+
+    @cached_property
+    def role(self):
+        return self.token["role"]
+
+    @cached_property
+    def is_active(self):
+        return self.token["is_active"]
+
+    @cached_property
+    def instance(self):
+        """The User row, for views that need more than the claims."""
+        return User.objects.get(idx=self.idx)
+
+    def __getattr__(self, attr):
+        if attr.startswith("_") or "token" not in self.__dict__:
+            raise AttributeError(attr)
+        return getattr(self.instance, attr)
+
+
+def get_user_instance(user):
+    """The User row behind request.user, however the request was authenticated."""
+    if isinstance(user, TenantTokenUser):
+        return user.instance
+    return user
+
+
+class StatelessJWTAuthentication(JWTStatelessUserAuthentication):
+    """
+    Authenticates from the token claims alone. Tokens issued before the
+    claims existed, and every token while the cache is not shared between
+    processes, fall back to the usual User lookup.
+    """
+
+    def get_user(self, validated_token):
+        schema = validated_token.get("schema")
+        if schema is not None and schema != connection.schema_name:
+            raise InvalidToken("Token was not issued for this tenant.")
+        if not cache_is_shared() or any(
+            claim not in validated_token for claim in ACCESS_CLAIMS
+        ):
+            return JWTAuthentication.get_user(self, validated_token)
+
+        if not validated_token["is_active"]:
+            raise AuthenticationFailed("User is inactive.", code="user_inactive")
+
+        user = super().get_user(validated_token)
+        if is_revoked(user.idx, validated_token.get("iat")):
+            raise AuthenticationFailed(
+                "Token has been revoked, please log in again.", code="token_revoked"
+            )
+        return user
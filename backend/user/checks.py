@@ -0,0 +1,26 @@
+# user/checks.py
+from django.core.checks import Error, Tags, register
+
+from helpers.cache import cache_is_shared
+
+
+@register(Tags.caches, deploy=True)
+def check_throttle_cache(app_configs, **kwargs):
+    """
+    The login and activation throttles keep their buckets in the cache; a
+    per-process cache gives every worker its own buckets. Only run by
+    `check --deploy`, since tests and local runs use the local-memory cache.
+    """
+    if cache_is_shared():
+        return []
+    return [
+        Error(
+            "The login and activation throttles need a cache shared by all "
+            "processes, but the default cache is per-process.",
+            hint=(
+                "Set REDIS_URL. A deployment that really runs a single "
+                "process can silence this with SILENCED_SYSTEM_CHECKS."
+            ),
+            id="user.E001",
+        )
+    ]
@@ -0,0 +1,53 @@
+# user/management/commands/prune_tokens.py
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError
+from django_tenants.utils import schema_context
+
+from tenant.models import Client
+from user.tokens import prune_expired_tokens
+
+
+class Command(BaseCommand):
+    help = (
+        "Deletes expired refresh-token records (OutstandingToken, "
+        "BlacklistedToken, RevokedToken) in tenant schemas. Run it daily."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "-s",
+            "--schema",
+            dest="schemas",
+            action="append",
+            help="Only prune this schema (repeatable). Defaults to every tenant.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.TOKEN_PRUNE_BATCH_SIZE,
+            help="Rows deleted per transaction (default: TOKEN_PRUNE_BATCH_SIZE).",
+        )
+
+    def handle(self, *args, **options):
+        schemas = options["schemas"] or list(
+            Client.objects.provisioned()
+            .order_by("schema_name")
+            .values_list("schema_name", flat=True)
+        )
+        failed = []
+        for schema_name in schemas:
+            # One broken schema must not stop the others from being pruned.
+            try:
+                with schema_context(schema_name):
+                    deleted = prune_expired_tokens(options["batch_size"])
+            except DatabaseError as exc:
+                failed.append(schema_name)
+                self.stderr.write(f"{schema_name}: {exc}")
+                continue
+            self.stdout.write(
+                f"{schema_name}: {deleted['outstanding']} outstanding, "
+                f"{deleted['revoked']} revoked token(s) deleted"
+            )
+        if failed:
+            raise CommandError(f"Pruning failed for: {', '.join(failed)}")
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.5 on 2026-10-18 15:28
+
+from django.db import migrations, models
+from django.utils import timezone
+from django_tenants.utils import get_public_schema_name
+
+
+def copy_blacklisted_tokens(apps, schema_editor):
+    # token_blacklist only exists in tenant schemas.
+    if schema_editor.connection.schema_name == get_public_schema_name():
+        return
+    BlacklistedToken = apps.get_model("token_blacklist", "BlacklistedToken")
+    RevokedToken = apps.get_model("user", "RevokedToken")
+    tokens = BlacklistedToken.objects.filter(
+        token__expires_at__gt=timezone.now()
+    ).values_list("token__jti", "token__expires_at")
+    RevokedToken.objects.bulk_create(
+        [RevokedToken(jti=jti, expires_at=expires_at) for jti, expires_at in tokens],
+        batch_size=5000,
+        ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0002_alter_user_role'),
+        ('token_blacklist', '0013_alter_blacklistedtoken_options_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RevokedToken',
+            fields=[
+                ('jti', models.CharField(max_length=255, primary_key=True, serialize=False)),
+                ('expires_at', models.DateTimeField(db_index=True)),
+            ],
+        ),
+        migrations.RunPython(copy_blacklisted_tokens, migrations.RunPython.noop),
+    ]
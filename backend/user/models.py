@@ -12,7 +12,28 @@ from helpers.constants import Role as ROLE, TENANT_SCHEMA_EMPLOYEE_ROLES_VALUES
 from helpers.models import Gender
 
 
-class UserManager(BaseUserManager):
+# Fields copied into access token claims (see user/authentication.py)
+ACCESS_FIELDS = ("role", "is_active")
+
+
+class UserQuerySet(models.QuerySet):
+    def update(self, **kwargs):
+        """
+        update() sends no signals, so it revokes the access tokens of the
+        matched users itself when it touches a claim field.
+        """
+        if not set(ACCESS_FIELDS) & kwargs.keys():
+            return super().update(**kwargs)
+
+        from user.authentication import revoke_user_tokens
+
+        user_idxs = list(self.values_list("idx", flat=True))
+        rows = super().update(**kwargs)
+        revoke_user_tokens(*user_idxs)
+        return rows
+
+
+class UserManager(BaseUserManager.from_queryset(UserQuerySet)):
     """
     A custom user manager for our hybrid user model. It provides
     methods for creating both tenant-specific users and global admins.
@@ -102,3 +123,16 @@ class User(AbstractBaseUser, PermissionsMixin, BaseModel):
 
     def is_employee(self):
         return self.role in TENANT_SCHEMA_EMPLOYEE_ROLES_VALUES
+
+
+class RevokedToken(models.Model):
+    """
+    Compact refresh-token blacklist: one row per revoked jti until the token
+    expires. See user/tokens.py and TOKEN_BLACKLIST_STORE.
+    """
+
+    jti = models.CharField(max_length=255, primary_key=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return self.jti
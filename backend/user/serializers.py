@@ -1,9 +1,16 @@
 from django.contrib.auth import authenticate
 from rest_framework import serializers
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.serializers import (
+    TokenObtainPairSerializer,
+    TokenRefreshSerializer,
+)
+from rest_framework_simplejwt.settings import api_settings
 from django_tenants.utils import get_public_schema_name
 from django.db import connection
+from .authentication import set_access_claims
 from .models import User
+from .tokens import TenantRefreshToken
 from helpers.constants import (
     TENANT_SCHEMA_ROLES_VALUES,
     TENANT_SCHEMA_ROLES,
@@ -12,6 +19,13 @@ from helpers.constants import (
 
 
 class TenantTokenObtainPairSerializer(TokenObtainPairSerializer):
+    token_class = TenantRefreshToken
+
+    @classmethod
+    def get_token(cls, user):
+        # Read by user.authentication.StatelessJWTAuthentication
+        return set_access_claims(super().get_token(user), user)
+
     def validate(self, attrs):
         # Disallow auth on public schema
         if connection.schema_name == get_public_schema_name():
@@ -39,6 +53,37 @@ class TenantTokenObtainPairSerializer(TokenObtainPairSerializer):
         return data
 
 
+class TenantTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Like TokenRefreshSerializer, but re-reads the access claims from the
+    User row, so a new access token never carries a stale role.
+    """
+
+    token_class = TenantRefreshToken
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs["refresh"])
+        user = User.objects.filter(
+            idx=refresh.payload.get(api_settings.USER_ID_CLAIM)
+        ).first()
+        if not api_settings.USER_AUTHENTICATION_RULE(user):
+            raise AuthenticationFailed(
+                self.error_messages["no_active_account"], "no_active_account"
+            )
+        set_access_claims(refresh, user)
+
+        data = {"access": str(refresh.access_token)}
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            if api_settings.BLACKLIST_AFTER_ROTATION:
+                refresh.blacklist()
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            refresh.outstand()
+            data["refresh"] = str(refresh)
+        return data
+
+
 class CreateTenantUserSerializer(serializers.ModelSerializer):
     password = serializers.CharField(write_only=True, min_length=8)
     role = serializers.ChoiceField(choices=TENANT_SCHEMA_ROLES)
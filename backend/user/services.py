@@ -0,0 +1,57 @@
+# user/services.py
+import hashlib
+
+from django.core.cache import cache
+from django.db import connection
+from django_tenants.utils import get_public_schema_name
+
+from helpers.cache import make_cache_key
+from helpers.policy import POLICY_VERSION, ui_permissions
+from institute.models import Institute
+from user.authentication import get_user_instance
+from user.models import User
+
+
+def _branding():
+    """The tenant's Institute name and logo, and its modified_on."""
+    if connection.schema_name == get_public_schema_name():
+        return None, None
+    institute = Institute.objects.order_by("pk").first()
+    if institute is None:
+        return None, None
+    branding = {
+        "name": institute.institution_name,
+        "shortname": institute.shortname,
+        "logo_url": institute.logo.url if institute.logo else None,
+    }
+    return branding, institute.modified_on
+
+
+def get_profile(user) -> tuple[dict, str]:
+    """
+    Returns the /me payload of `user` and its ETag.
+
+    The ETag is derived from the user's and the institute's modified_on and
+    POLICY_VERSION, which together determine the payload. Both are cached
+    until a User or Institute row of the tenant changes, so a request whose
+    If-None-Match still matches costs no query.
+    """
+    cache_key = make_cache_key("me", [User, Institute], user.idx, POLICY_VERSION)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    instance = get_user_instance(user)
+    branding, branding_modified_on = _branding()
+    data = {
+        "idx": instance.idx,
+        "email": instance.email,
+        "role": instance.role,
+        "gender": instance.gender,
+        "ui_permissions": ui_permissions((instance.role or "").lower()),
+        "institute": branding,
+    }
+    version = f"{instance.idx}|{instance.modified_on}|{branding_modified_on}|{POLICY_VERSION}"
+    etag = hashlib.md5(version.encode()).hexdigest()
+    cache.set(cache_key, (data, etag))
+    return data, etag
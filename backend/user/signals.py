@@ -0,0 +1,44 @@
+# user/signals.py
+from django.db.models.signals import post_save, post_delete, pre_save
+from django.dispatch import receiver
+
+from tenant.directory import sync_user_email, remove_user_email
+from user.authentication import revoke_user_tokens
+from user.models import ACCESS_FIELDS, User
+
+
+@receiver(post_save, sender=User)
+def sync_email_directory(sender, instance, created, update_fields=None, **kwargs):
+    # Saves such as update_last_login() do not touch the email.
+    if update_fields is not None and "email" not in update_fields:
+        return
+    sync_user_email(instance)
+
+
+@receiver(post_delete, sender=User)
+def remove_from_email_directory(sender, instance, **kwargs):
+    remove_user_email(instance)
+
+
+@receiver(pre_save, sender=User)
+def remember_access_fields(sender, instance, update_fields=None, **kwargs):
+    if instance.pk is None:
+        return
+    if update_fields is not None and not set(ACCESS_FIELDS) & set(update_fields):
+        return
+    instance._previous_access = (
+        User.objects.filter(pk=instance.pk).values_list(*ACCESS_FIELDS).first()
+    )
+
+
+@receiver(post_save, sender=User)
+def revoke_tokens_on_access_change(sender, instance, created, **kwargs):
+    previous = getattr(instance, "_previous_access", None)
+    instance._previous_access = None
+    if previous and previous != tuple(getattr(instance, f) for f in ACCESS_FIELDS):
+        revoke_user_tokens(instance.idx)
+
+
+@receiver(post_delete, sender=User)
+def revoke_tokens_on_delete(sender, instance, **kwargs):
+    revoke_user_tokens(instance.idx)
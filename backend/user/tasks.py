@@ -0,0 +1,19 @@
+# user/tasks.py
+from employee.models import Employee
+from institute.models import Institute
+from jobs.registry import register_job
+from user.mailers import send_director_invite, send_employee_invite
+from user.models import User
+
+
+@register_job("user.send_director_invite")
+def send_director_invite_job(*, user_idx, activation_url):
+    user = User.objects.get(idx=user_idx)
+    institute = Institute.objects.get()
+    send_director_invite(user, institute, activation_url)
+
+
+@register_job("user.send_employee_invite")
+def send_employee_invite_job(*, employee_idx, activation_url):
+    employee = Employee.objects.select_related("user").get(idx=employee_idx)
+    send_employee_invite(employee.user, employee, activation_url)
@@ -1,3 +1,285 @@
-from django.test import TestCase
+import datetime
+import io
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.checks import Tags, run_checks
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from django_tenants.test.cases import TenantTestCase
+from rest_framework.parsers import JSONParser
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.tokens import AccessToken
+
+from helpers.constants import Role as ROLE
+from helpers.metrics import throttled_requests
+from helpers.throttling import take_token
+from institute.models import Institute
+from user.authentication import StatelessJWTAuthentication, TenantTokenUser
+from user.models import RevokedToken, User
+from user.serializers import TenantTokenObtainPairSerializer, TenantTokenRefreshSerializer
+from user.throttling import LoginThrottle
+
+
+class StatelessJWTAuthenticationTests(TenantTestCase):
+    def setUp(self):
+        cache.clear()
+        # The revocation marks only count with a shared cache; the test
+        # process is the only one reading them.
+        patcher = mock.patch("user.authentication.cache_is_shared", return_value=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.auth = StatelessJWTAuthentication()
+        self.user = User.objects.create_user(
+            email="director@example.com", password="secret123", role=ROLE.DIRECTOR.value
+        )
+
+    def access_token(self, user=None):
+        return TenantTokenObtainPairSerializer.get_token(user or self.user).access_token
+
+    def authenticate(self, token):
+        return self.auth.get_user(self.auth.get_validated_token(str(token)))
+
+    def test_claims_authorize_without_a_user_query(self):
+        token = self.access_token()
+
+        with self.assertNumQueries(0):
+            user = self.authenticate(token)
+            self.assertIsInstance(user, TenantTokenUser)
+            self.assertEqual(user.idx, self.user.idx)
+            self.assertEqual(user.role, ROLE.DIRECTOR.value)
+            self.assertTrue(user.is_active)
+            self.assertTrue(user.is_director())
+
+    def test_other_attributes_load_the_user_once(self):
+        user = self.authenticate(self.access_token())
+
+        with self.assertNumQueries(1):
+            self.assertEqual(user.email, self.user.email)
+            self.assertEqual(user.gender, self.user.gender)
+        self.assertEqual(user.instance.pk, self.user.pk)
+
+    def test_token_of_another_tenant_is_rejected(self):
+        token = self.access_token()
+        token["schema"] = "another_tenant"
+
+        with self.assertRaises(InvalidToken):
+            self.authenticate(token)
+
+    def test_inactive_claim_is_rejected(self):
+        token = self.access_token()
+        token["is_active"] = False
+
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate(token)
+
+    def test_token_without_claims_falls_back_to_the_user_row(self):
+        token = AccessToken.for_user(self.user)
+
+        with self.assertNumQueries(1):
+            user = self.authenticate(token)
+        self.assertIsInstance(user, User)
+        self.assertEqual(user.pk, self.user.pk)
+
+    def test_without_a_shared_cache_every_token_loads_the_user_row(self):
+        token = self.access_token()
+
+        with mock.patch("user.authentication.cache_is_shared", return_value=False):
+            with self.assertNumQueries(1):
+                user = self.authenticate(token)
+        self.assertIsInstance(user, User)
+
+    def test_role_change_revokes_tokens(self):
+        token = self.access_token()
+        self.user.role = ROLE.ACCOUNTANT.value
+        self.user.save()
+
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate(token)
+
+    def test_queryset_update_revokes_tokens(self):
+        token = self.access_token()
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate(token)
+
+    def test_deleting_the_user_revokes_tokens(self):
+        token = self.access_token()
+        self.user.delete()
+
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate(token)
+
+    def test_unrelated_changes_keep_tokens_valid(self):
+        token = self.access_token()
+        self.user.gender = "female"
+        self.user.save()
+
+        self.assertEqual(self.authenticate(token).idx, self.user.idx)
+
+    def test_refresh_reads_the_claims_from_the_user_row(self):
+        refresh = TenantTokenObtainPairSerializer.get_token(self.user)
+        User.objects.filter(pk=self.user.pk).update(role=ROLE.ACCOUNTANT.value)
+
+        serializer = TenantTokenRefreshSerializer(data={"refresh": str(refresh)})
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+
+        access = AccessToken(serializer.validated_data["access"])
+        self.assertEqual(access["role"], ROLE.ACCOUNTANT.value)
+        self.assertTrue(access["is_active"])
+        self.assertEqual(access["schema"], self.tenant.schema_name)
+
+    def test_refresh_is_refused_for_an_inactive_user(self):
+        refresh = TenantTokenObtainPairSerializer.get_token(self.user)
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+
+        serializer = TenantTokenRefreshSerializer(data={"refresh": str(refresh)})
+        with self.assertRaises(AuthenticationFailed):
+            serializer.is_valid()
+
+
+class PruneTokensTests(TenantTestCase):
+    def setUp(self):
+        now = timezone.now()
+        RevokedToken.objects.create(jti="expired", expires_at=now - datetime.timedelta(hours=1))
+        RevokedToken.objects.create(jti="live", expires_at=now + datetime.timedelta(hours=1))
+
+    def test_deletes_only_expired_rows(self):
+        call_command("prune_tokens", "-s", self.tenant.schema_name, stdout=io.StringIO())
+
+        self.assertEqual(
+            list(RevokedToken.objects.values_list("jti", flat=True)), ["live"]
+        )
+
+    def test_a_failing_schema_does_not_stop_the_others(self):
+        stderr = io.StringIO()
+        with self.assertRaisesMessage(CommandError, "missing_schema"):
+            call_command(
+                "prune_tokens",
+                "-s",
+                "missing_schema",
+                "-s",
+                self.tenant.schema_name,
+                stdout=io.StringIO(),
+                stderr=stderr,
+            )
+
+        self.assertIn("missing_schema", stderr.getvalue())
+        self.assertFalse(RevokedToken.objects.filter(jti="expired").exists())
+
+
+@override_settings(
+    LOGIN_THROTTLE_RATES={"ip": (10, 60), "identity": (2, 60), "account": (4, 60)}
+)
+class LoginThrottleTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        throttled_requests.clear()
+        self.factory = APIRequestFactory()
+
+    def attempt(self, email, ip="10.0.0.1", forwarded_for=None):
+        headers = {"REMOTE_ADDR": ip}
+        if forwarded_for:
+            headers["HTTP_X_FORWARDED_FOR"] = forwarded_for
+        request = Request(
+            self.factory.post("/login/", {"email": email}, format="json", **headers),
+            parsers=[JSONParser()],
+        )
+        return LoginThrottle().allow_request(request, view=None)
+
+    def test_token_bucket_refills_over_time(self):
+        self.assertEqual([take_token("k", 2, 10, now=0) for _ in range(3)], [0, 0, 5])
+        self.assertEqual(take_token("k", 2, 10, now=5), 0)
+
+    def test_limits_attempts_per_email_and_ip(self):
+        self.assertTrue(self.attempt("Jane@Example.com"))
+        self.assertTrue(self.attempt("jane@example.com "))
+        self.assertFalse(self.attempt("jane@example.com"))
+        # Another account from the same IP still has its own bucket.
+        self.assertTrue(self.attempt("john@example.com"))
+        self.assertIn('bucket="identity"', "\n".join(throttled_requests.render()))
+
+    def test_forwarded_for_cannot_mint_fresh_buckets(self):
+        self.assertTrue(self.attempt("jane@example.com", forwarded_for="1.1.1.1"))
+        self.assertTrue(self.attempt("jane@example.com", forwarded_for="2.2.2.2"))
+        self.assertFalse(self.attempt("jane@example.com", forwarded_for="3.3.3.3"))
+
+    def test_limits_one_account_across_many_ips(self):
+        results = [
+            self.attempt("jane@example.com", ip=f"10.0.0.{n}") for n in range(1, 6)
+        ]
+        self.assertEqual(results, [True, True, True, True, False])
+        self.assertIn('bucket="account"', "\n".join(throttled_requests.render()))
+
+
+class ThrottleCacheCheckTests(SimpleTestCase):
+    def error_ids(self, **kwargs):
+        return [error.id for error in run_checks(tags=[Tags.caches], **kwargs)]
+
+    def test_local_cache_only_fails_the_deploy_checks(self):
+        with mock.patch("user.checks.cache_is_shared", return_value=False):
+            self.assertNotIn("user.E001", self.error_ids())
+            self.assertIn("user.E001", self.error_ids(include_deployment_checks=True))
+
+    def test_shared_cache_passes(self):
+        with mock.patch("user.checks.cache_is_shared", return_value=True):
+            self.assertNotIn(
+                "user.E001", self.error_ids(include_deployment_checks=True)
+            )
+
+
+class MyAPIViewTests(TenantTestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            email="director@example.com", password="secret123", role=ROLE.DIRECTOR.value
+        )
+        self.institute = Institute.objects.create(
+            institution_name="Test Institute", shortname="ti"
+        )
+        self.api_client = APIClient(HTTP_HOST=self.domain.domain)
+        self.api_client.force_authenticate(self.user)
+        self.url = reverse("my")
+
+    def test_returns_profile_branding_and_etag(self):
+        response = self.api_client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["idx"], self.user.idx)
+        self.assertIn("ui_permissions", response.data)
+        self.assertEqual(response.data["institute"]["name"], "Test Institute")
+        self.assertTrue(response["ETag"])
+        self.assertEqual(response["Cache-Control"], "private, no-cache")
+        self.assertIn("Authorization", response["Vary"])
+
+    def test_matching_etag_gets_a_bodyless_304_without_queries(self):
+        etag = self.api_client.get(self.url)["ETag"]
+
+        with self.assertNumQueries(0):
+            response = self.api_client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertFalse(response.content)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_etag_changes_with_the_user_and_the_institute(self):
+        first = self.api_client.get(self.url)["ETag"]
+
+        self.user.gender = "female"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.save()
+        second = self.api_client.get(self.url, HTTP_IF_NONE_MATCH=first)
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.data["gender"], "female")
+
+        self.institute.institution_name = "Renamed Institute"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.institute.save()
+        third = self.api_client.get(self.url, HTTP_IF_NONE_MATCH=second["ETag"])
+        self.assertEqual(third.status_code, 200)
+        self.assertEqual(third.data["institute"]["name"], "Renamed Institute")
@@ -0,0 +1,43 @@
+# user/throttling.py
+from django.conf import settings
+
+from helpers.throttling import TokenBucketThrottle
+from tenant.directory import normalize_email
+
+
+class LoginThrottle(TokenBucketThrottle):
+    """
+    Limits login attempts within the tenant per IP, per email and IP, and
+    per email from any IP (so one account cannot be sprayed from many
+    addresses). Runs before the view, so throttled attempts never reach the
+    password hasher. The IP honours X-Forwarded-For only as far as
+    NUM_PROXIES trusts it.
+    """
+
+    scope = "login"
+
+    def get_identity(self, request, view):
+        data = request.data
+        email = data.get("email") if hasattr(data, "get") else None
+        return normalize_email(email if isinstance(email, str) else None)
+
+    def get_buckets(self, request, view):
+        ip = self.get_ident(request)
+        identity = self.get_identity(request, view)
+        rates = settings.LOGIN_THROTTLE_RATES
+        buckets = [
+            ("ip", f"ip:{ip}", rates["ip"]),
+            ("identity", f"id:{identity}:{ip}", rates["identity"]),
+        ]
+        if identity:
+            buckets.append(("account", f"account:{identity}", rates["account"]))
+        return buckets
+
+
+class ActivationThrottle(LoginThrottle):
+    """LoginThrottle for account activation, keyed on the activation link's uid."""
+
+    scope = "activation"
+
+    def get_identity(self, request, view):
+        return view.kwargs.get("uidb64", "")
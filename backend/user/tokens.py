@@ -1,4 +1,91 @@
 # user/tokens.py
+from django.conf import settings
 from django.contrib.auth.tokens import PasswordResetTokenGenerator
+from django.db import transaction
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+from rest_framework_simplejwt.tokens import BlacklistMixin, RefreshToken
+from rest_framework_simplejwt.utils import datetime_from_epoch
+
+from user.models import RevokedToken
 
 invite_token_generator = PasswordResetTokenGenerator()
+
+
+def compact_blacklist():
+    return settings.TOKEN_BLACKLIST_STORE == "compact"
+
+
+class TenantRefreshToken(RefreshToken):
+    """
+    RefreshToken that can keep its blacklist in RevokedToken.
+
+    With TOKEN_BLACKLIST_STORE = "compact", issued tokens are not written
+    to OutstandingToken and the blacklist check is a primary key lookup on
+    RevokedToken. Otherwise simplejwt's OutstandingToken/BlacklistedToken
+    tables are used as before. Blacklisting writes to RevokedToken either
+    way (and its migration copied the older entries), so switching to
+    "compact" never lets a rotated token back in. Switching back does not
+    see tokens blacklisted in compact mode until they expire.
+    """
+
+    def check_blacklist(self):
+        if not compact_blacklist():
+            return super().check_blacklist()
+        if RevokedToken.objects.filter(jti=self.payload[api_settings.JTI_CLAIM]).exists():
+            raise TokenError(_("Token is blacklisted"))
+
+    def blacklist(self):
+        RevokedToken.objects.bulk_create(
+            [
+                RevokedToken(
+                    jti=self.payload[api_settings.JTI_CLAIM],
+                    expires_at=datetime_from_epoch(self.payload["exp"]),
+                )
+            ],
+            ignore_conflicts=True,
+        )
+        if not compact_blacklist():
+            return super().blacklist()
+
+    def outstand(self):
+        if not compact_blacklist():
+            return super().outstand()
+
+    @classmethod
+    def for_user(cls, user):
+        if not compact_blacklist():
+            return super().for_user(user)
+        # Skip BlacklistMixin, which records the token in OutstandingToken.
+        return super(BlacklistMixin, cls).for_user(user)
+
+
+def _delete_in_batches(queryset, batch_size):
+    deleted = 0
+    while True:
+        with transaction.atomic():
+            pks = list(queryset.values_list("pk", flat=True)[:batch_size])
+            if not pks:
+                return deleted
+            queryset.model.objects.filter(pk__in=pks).delete()
+        deleted += len(pks)
+
+
+def prune_expired_tokens(batch_size, now=None):
+    """
+    Deletes refresh-token records that expired before `now` in the current
+    schema, `batch_size` rows per transaction. Returns the rows deleted per
+    table (blacklist entries go with their OutstandingToken).
+    """
+    now = now or timezone.now()
+    return {
+        "outstanding": _delete_in_batches(
+            OutstandingToken.objects.filter(expires_at__lt=now), batch_size
+        ),
+        "revoked": _delete_in_batches(
+            RevokedToken.objects.filter(expires_at__lt=now), batch_size
+        ),
+    }
@@ -3,23 +3,30 @@ from rest_framework import generics
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
-from user.serializers import TenantTokenObtainPairSerializer, CreateTenantUserSerializer
-from helpers.permissions import IsDirector, IsTenantAdmin, OrPermission
-from django.utils.http import urlsafe_base64_decode
+from user.serializers import (
+    TenantTokenObtainPairSerializer,
+    TenantTokenRefreshSerializer,
+    CreateTenantUserSerializer,
+)
+from helpers.policy import PolicyPermission
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags, quote_etag, urlsafe_base64_decode
+from user.services import get_profile
+from user.throttling import ActivationThrottle, LoginThrottle
 from user.tokens import invite_token_generator
 from django.contrib.auth import get_user_model
 from django.contrib.auth.password_validation import validate_password
 from django.core.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated
-from .ui_permissions import UI_ROLE_PERMISSIONS
 
 
 class TenantTokenObtainPairView(TokenObtainPairView):
     serializer_class = TenantTokenObtainPairSerializer
+    throttle_classes = [LoginThrottle]
 
 
 class TenantTokenRefreshView(TokenRefreshView):
-    pass
+    serializer_class = TenantTokenRefreshSerializer
 
 
 class TenantCreateUserView(generics.CreateAPIView):
@@ -28,13 +35,14 @@ class TenantCreateUserView(generics.CreateAPIView):
     """
 
     serializer_class = CreateTenantUserSerializer
-    # permission_classes = [OrPermission(IsDirector, IsTenantAdmin)] # Danger: May not want to give this type of permission to the employees
-    permission_classes = [IsDirector]
+    # Danger: may not want to give this to other roles (see helpers/policy.py)
+    permission_classes = [PolicyPermission("user", "create")]
 
 
 class ActivateUserView(APIView):
     authentication_classes = []
     permission_classes = []
+    throttle_classes = [ActivationThrottle]
 
     def post(self, request, uidb64, token, *args, **kwargs):
         password = request.data.get("password")
@@ -65,18 +73,24 @@ class ActivateUserView(APIView):
 
 
 class MyAPIView(APIView):
+    """
+    The current user, their ui_permissions and the tenant branding. Clients
+    revalidate with If-None-Match and get a bodyless 304 while nothing
+    changed.
+    """
+
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        user = request.user
-        role = (user.role or "").lower()
-        return Response(
-            {
-                "idx": user.idx,
-                "email": user.email,
-                "role": user.role,
-                "gender": user.gender,
-                "ui_permissions": UI_ROLE_PERMISSIONS.get(role, []),
-                # optional: tenant info, theme, etc.
-            }
-        )
+        data, etag = get_profile(request.user)
+        etag = quote_etag(etag)
+        if_none_match = request.headers.get("If-None-Match")
+        if if_none_match and etag in parse_etags(if_none_match):
+            response = Response(status=304)
+        else:
+            response = Response(data)
+        response["ETag"] = etag
+        # Cached by the browser only, and revalidated on every use.
+        response["Cache-Control"] = "private, no-cache"
+        patch_vary_headers(response, ["Authorization"])
+        return response
@@ -42,10 +42,12 @@ SHARED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "rest_framework",
     "corsheaders",
     "django_extensions",
     "drf_yasg",
+    "jobs",
 ]
 
 # Apps that will be installed in each tenant schema
@@ -70,6 +72,16 @@ TENANT_APPS = [
 TENANT_MODEL = "tenant.Client"
 TENANT_DOMAIN_MODEL = "tenant.Domain"
 
+# Seconds a hostname -> tenant mapping stays in the in-process resolver cache
+TENANT_CACHE_TTL = config("TENANT_CACHE_TTL", default=300, cast=int)
+
+# Pre-migrated schema new tenants are cloned from (empty disables cloning).
+# Kept current by `manage.py migrate_tenants` / `refresh_tenant_template`.
+TENANT_TEMPLATE_SCHEMA = config("TENANT_TEMPLATE_SCHEMA", default="tenant_template")
+
+# Worker processes used by `manage.py migrate_tenants`
+TENANT_MIGRATION_WORKERS = config("TENANT_MIGRATION_WORKERS", default=4, cast=int)
+
 INSTALLED_APPS = SHARED_APPS + [app for app in TENANT_APPS if app not in SHARED_APPS]
 
 # Database
@@ -89,7 +101,8 @@ DATABASE_ROUTERS = ("django_tenants.routers.TenantSyncRouter",)
 
 
 MIDDLEWARE = [
-    "django_tenants.middleware.main.TenantMainMiddleware",  # important, first in chain for tenant schema routing
+    "helpers.middleware.CachedTenantMainMiddleware",  # important, first in chain for tenant schema routing
+    "helpers.middleware.RequestMetricsMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -179,7 +192,8 @@ MEDIA_URL = f"https://{AWS_S3_CUSTOM_DOMAIN}/media/"
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        # Authorizes from token claims without loading the User row
+        "user.authentication.StatelessJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
@@ -187,6 +201,9 @@ REST_FRAMEWORK = {
     "EXCEPTION_HANDLER": "helpers.exception_handler.vims_exception_handler",
     "DEFAULT_PAGINATION_CLASS": "helpers.pagination.VIMSPagination",
     "PAGE_SIZE": 10,
+    # Proxies in front of Django whose X-Forwarded-For entries are trusted
+    # for the client IP (throttling). 0 uses the socket address only.
+    "NUM_PROXIES": config("NUM_PROXIES", default=0, cast=int),
 }
 
 SIMPLE_JWT = {
@@ -199,9 +216,72 @@ SIMPLE_JWT = {
     "AUTH_HEADER_TYPES": ("Bearer",),
     "USER_ID_FIELD": "idx",
     "USER_ID_CLAIM": "user_idx",
+    "TOKEN_USER_CLASS": "user.authentication.TenantTokenUser",
+}
+
+# Where rotated refresh tokens are blacklisted (user/tokens.py): "outstanding"
+# uses simplejwt's OutstandingToken/BlacklistedToken tables, "compact" only
+# the jti-keyed RevokedToken table. Expired rows are removed by
+# `manage.py prune_tokens`, which should run daily.
+TOKEN_BLACKLIST_STORE = config("TOKEN_BLACKLIST_STORE", default="outstanding")
+TOKEN_PRUNE_BATCH_SIZE = 5000
+
+# Login and activation throttles (user/throttling.py): (burst, seconds to
+# refill it) per tenant and IP, per tenant, email and IP, and per tenant and
+# email from any IP. The buckets need a shared cache (REDIS_URL).
+LOGIN_THROTTLE_RATES = {
+    "ip": (30, 300),
+    "identity": (5, 300),
+    "account": (20, 900),
+}
+
+
+# Cache
+# Keys are prefixed with connection.schema_name by django-tenants' make_key,
+# so one tenant can never read another tenant's entries (see helpers/cache.py).
+# Uses Redis when REDIS_URL is set, otherwise a per-process local-memory cache.
+# Redis is required when more than one process runs (web workers, the
+# run_jobs worker): model version bumps, token revocations and throttle
+# buckets only reach other processes through a shared cache.
+# `manage.py check --deploy` fails while it is unset (user.E001).
+REDIS_URL = config("REDIS_URL", default="")
+CACHES = {
+    "default": {
+        "BACKEND": (
+            "django.core.cache.backends.redis.RedisCache"
+            if REDIS_URL
+            else "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": REDIS_URL,
+        "TIMEOUT": 300,
+        "KEY_FUNCTION": "django_tenants.cache.make_key",
+        "REVERSE_KEY_FUNCTION": "django_tenants.cache.reverse_key",
+    }
 }
 
 
+# Background jobs (see jobs/ and `manage.py run_jobs`)
+JOB_POLL_INTERVAL = config("JOB_POLL_INTERVAL", default=2.0, cast=float)
+JOB_MAX_ATTEMPTS = 3
+JOB_RETRY_DELAY = 30  # seconds, doubled on every retry
+JOB_LOCK_TIMEOUT = 15 * 60  # running jobs not heard from for this long are requeued
+JOB_HEARTBEAT_INTERVAL = 60  # seconds between locked_on refreshes of a running job
+
+
+# Cross-tenant reports (tenant/reporting.py)
+REPORT_CACHE_TTL = 300  # seconds
+REPORT_WORKERS = 8  # concurrent schemas in "pool" mode
+REPORT_UNION_CHUNK = 50  # schemas per UNION ALL query
+REPORT_FETCH_SIZE = 2000
+
+
+# Request metrics (helpers/metrics.py), scraped from /metrics/ on the public
+# host with "Authorization: Bearer <METRICS_TOKEN>"; empty disables the endpoint.
+METRICS_TOKEN = config("METRICS_TOKEN", default="")
+# Requests slower than this are logged as warnings (0 disables the log)
+SLOW_REQUEST_THRESHOLD_MS = config("SLOW_REQUEST_THRESHOLD_MS", default=1000, cast=int)
+
+
 # Email Backend Settings
 EMAIL_BACKEND = "django.core.mail.backends.console.EmailBackend"
 DEFAULT_FROM_EMAIL = "no-reply@vims.com"
@@ -15,10 +15,6 @@ CORS_ALLOWED_ORIGINS = [
 
 CELERY_BROKER_URL = ""
 
-CACHES = {
-
-}
-
 EMAIL_HOST = ""
 EMAIL_HOST_USER = ""
 EMAIL_HOST_PASSWORD = ""
@@ -1,10 +1,15 @@
 from django.urls import path
 from django.contrib import admin
 
+from tenant.views import tenant_cache_stats, platform_report, metrics
+
 
 urlpatterns = [
     path("admin/", admin.site.urls),
+    path("tenant-cache/stats/", tenant_cache_stats, name="tenant-cache-stats"),
+    path("reports/<str:name>/", platform_report, name="platform-report"),
+    path("metrics/", metrics, name="metrics"),
 ]
 
 
-admin.site.site_header = 'VIMS Admin'
\ No newline at end of file
+admin.site.site_header = 'VIMS Admin'
@@ -2,14 +2,20 @@
 import Modal from "../../ui/Modal";
 import Table from "../../ui/Table";
 import Button from "../../ui/Button";
+import Pagination from "../../ui/Pagination";
 import { useEnrolledStudents } from "./useCourseClasses";
-import { useEffect } from "react";
+import { useEffect, useState } from "react";
 
 export default function EnrolledStudents({ classData, onClose }) {
   const classIdx = classData?.idx;
-  const { data, isFetching, error } = useEnrolledStudents(classIdx);
+  const [page, setPage] = useState(1);
+  const pageSize = 10;
+  const { data, isFetching, error } = useEnrolledStudents(classIdx, {
+    page,
+    page_size: pageSize,
+  });
 
-  console.log("Enrollments data:", data);
+  useEffect(() => setPage(1), [classIdx]);
 
   useEffect(() => {
     // handle errors if necessary
@@ -17,7 +23,8 @@ export default function EnrolledStudents({ classData, onClose }) {
 
   if (!classData) return null;
 
-  const enrollments = data || [];
+  const enrollments = data?.data || [];
+  const total_pages = data?.total_pages || 1;
 
   return (
     <Modal
@@ -42,6 +49,14 @@ export default function EnrolledStudents({ classData, onClose }) {
           data={enrollments}
           isLoading={isFetching}
         />
+
+        <div className="mt-4 flex justify-end">
+          <Pagination
+            page={page}
+            totalPages={total_pages}
+            onPageChange={setPage}
+          />
+        </div>
       </div>
     </Modal>
   );
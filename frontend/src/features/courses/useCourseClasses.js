@@ -91,10 +91,15 @@ export const useUnassignInstructor = () => {
   });
 };
 
-export const useEnrolledStudents = (classIdx) => {
+export const useEnrolledStudents = (
+  classIdx,
+  { page = 1, page_size = 10 } = {},
+) => {
   return useQuery({
-    queryKey: ["course-class-enrollments", classIdx],
-    queryFn: () => courseClassServices.getEnrolledStudents(classIdx),
+    queryKey: ["course-class-enrollments", classIdx, page, page_size],
+    queryFn: () =>
+      courseClassServices.getEnrolledStudents({ classIdx, page, page_size }),
     enabled: !!classIdx,
+    keepPreviousData: true,
   });
 };
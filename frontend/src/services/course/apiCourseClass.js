@@ -58,10 +58,14 @@ export const unassignInstructor = async ({ classIdx, instructor_idx }) => {
   return res.data;
 };
 
-export const getEnrolledStudents = async (classIdx) => {
-  console.log("Fetching enrolled students for classIdx:", classIdx);
+export const getEnrolledStudents = async ({
+  classIdx,
+  page = 1,
+  page_size = 10,
+}) => {
   const res = await apiClient.get(
     `/course-classes/${classIdx}/enrolled-students/`,
+    { params: { page, page_size } },
   );
-  return res.data; // your shape: array of enrollment objects
+  return res.data; // paginated: { data, total_pages, total_records, ... }
 };